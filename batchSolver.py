@@ -0,0 +1,106 @@
+import json
+import os
+import sys
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from mapSolver import MapSolver, METHODS
+from utils import parse_grid, MapFormatError
+
+# Number of parsed maps each worker keeps to reuse in later jobs
+CACHED_MAPS = 8
+
+solvers = OrderedDict()
+
+def list_maps(source: str) -> list:
+    """
+    Function that lists the map files of a batch
+
+    Args:
+        source: A directory, whose .txt files are solved, or a manifest file listing one map path per line.
+            Paths in a manifest are relative to the manifest, and empty lines or lines starting with # are skipped
+    Return:
+        files: A list of paths to map files
+    """
+    if os.path.isdir(source):
+        files = []
+        for directory, _, names in os.walk(source):
+            files.extend(os.path.join(directory, name) for name in names if name.endswith(".txt"))
+        return sorted(files)
+
+    base = os.path.dirname(source)
+    with open(source, "r") as manifest:
+        lines = [line.strip() for line in manifest]
+    return [os.path.join(base, line) for line in lines if line and not line.startswith("#")]
+
+def get_solver(filename: str) -> MapSolver:
+    """
+    Function that retrieves the solver of a map, parsing the map only the first time a worker sees it
+
+    Args:
+        filename: Path to the map file
+    Return:
+        solver: A MapSolver for the map
+    """
+    if filename in solvers:
+        solvers.move_to_end(filename)
+        return solvers[filename]
+
+    start, goals, map = parse_grid(filename)
+    solvers[filename] = MapSolver(map, start, goals)
+    while len(solvers) > CACHED_MAPS:
+        solvers.popitem(last=False)
+    return solvers[filename]
+
+def solve_job(filename: str, method: str) -> dict:
+    """
+    Function that solves one map with one method inside a worker
+
+    Args:
+        filename: Path to the map file
+        method: Name of the method, as used by search.py
+    Return:
+        result: A dictionary with the file, method, goal, nodes, path and wall time in seconds, or the error
+    """
+    result = {"file": filename, "method": method}
+    try:
+        solver = get_solver(filename)
+        started = time.perf_counter()
+        nodes, path = getattr(solver, METHODS[method])()
+        result["seconds"] = time.perf_counter() - started
+    except (OSError, MapFormatError, ValueError, RecursionError) as error:
+        result["error"] = str(error)
+        return result
+
+    result["goal"] = list(path[-1][0]) if path else None
+    result["nodes"] = nodes
+    result["path"] = [direction for _, direction in path[:-1]] if path else None
+    return result
+
+def run_batch(source: str, methods: list, workers: int = None, output=sys.stdout) -> int:
+    """
+    Function that solves every map of a batch with every method over a pool of processes
+    One JSON line is written per result as soon as its job finishes
+
+    Args:
+        source: A directory or a manifest file, see list_maps
+        methods: Names of the methods, as used by search.py
+        workers: Number of processes, the number of cores by default
+        output: Stream receiving the JSON lines
+    Return:
+        count: Number of results written
+    """
+    unknown = [method for method in methods if method not in METHODS]
+    if unknown:
+        raise ValueError(f"Unknown methods {', '.join(unknown)}; choose from {', '.join(METHODS)}")
+
+    files = list_maps(source)
+    count = 0
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        # Jobs of the same map are submitted together so that workers can reuse the parsed map
+        futures = [pool.submit(solve_job, filename, method) for filename in files for method in methods]
+        for future in as_completed(futures):
+            output.write(json.dumps(future.result()) + "\n")
+            output.flush()
+            count += 1
+    return count
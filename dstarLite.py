@@ -0,0 +1,216 @@
+from array import array
+from frontier import PriorityFrontier
+from gridGraph import GridGraph, DIRECTIONS, INFINITY, UP, LEFT, DOWN, RIGHT
+
+class DStarLite:
+    def __init__(self, map: list, start: tuple, goals: set):
+        """
+        Initializes a replanning solver with D* Lite.
+
+        The search runs backward from the goals towards the start and keeps its state between plans:
+        g[cell] is the last known cost from the cell to the nearest goal and rhs[cell] is that cost
+        computed from the neighbors. Changing a wall or moving the start only makes the affected cells
+        inconsistent (g != rhs), and the next plan expands only those cells instead of searching again.
+        Like the other searches, a start placed on a wall can move out of it, but no move can enter a wall.
+
+        Args:
+            map: A 2D array representing the map, 1 marks a wall
+            start: The starting point on the map
+            goals: A set of all possible goal points on the map
+        """
+        self.graph = GridGraph(map)
+        if not self.graph.in_map(start):
+            raise ValueError(f"Start {start} is outside the map")
+        graph = self.graph
+        self.walls = bytearray(graph.walls)
+        self.start = graph.cell_id(start)
+        self.last_start = self.start
+        self.goals = graph.cell_ids(goals)
+        # Key modifier, grows by the heuristic distance each time the start moves
+        self.km = 0
+        self.nodes = 0
+
+        self.g = array('i', [INFINITY]) * graph.size
+        self.rhs = array('i', [INFINITY]) * graph.size
+        self.frontier = PriorityFrontier()
+        for goal in self.goals:
+            self.rhs[goal] = 0
+            self.frontier[goal] = self.calculate_key(goal)
+
+    def heuristic(self, cell: int) -> int:
+        """
+        Function that computes the Manhattan distance from the start to a cell
+
+        Args:
+            cell: ID of the cell
+        Return:
+            distance: The Manhattan distance
+        """
+        width = self.graph.width
+        return abs(cell % width - self.start % width) + abs(cell // width - self.start // width)
+
+    def calculate_key(self, cell: int) -> tuple:
+        """
+        Function that computes the priority of a cell in the frontier
+
+        Args:
+            cell: ID of the cell
+        Return:
+            key: A (estimated total cost, cost to the goals) tuple
+        """
+        cost = min(self.g[cell], self.rhs[cell])
+        return (cost + self.heuristic(cell) + self.km, cost)
+
+    def neighbors(self, cell: int) -> list:
+        """
+        Function that lists the cells next to a cell within the map boundaries, walls included
+
+        Args:
+            cell: ID of the cell
+        Return:
+            neighbors: A list of (neighbor ID, direction code) tuples in the order "up", "left", "down", "right"
+        """
+        width, size = self.graph.width, self.graph.size
+        x = cell % width
+        neighbors = []
+        if cell >= width:
+            neighbors.append((cell - width, UP))
+        if x > 0:
+            neighbors.append((cell - 1, LEFT))
+        if cell + width < size:
+            neighbors.append((cell + width, DOWN))
+        if x < width - 1:
+            neighbors.append((cell + 1, RIGHT))
+        return neighbors
+
+    def best_neighbor(self, cell: int) -> tuple:
+        """
+        Function that finds the neighbor of a cell with the lowest cost to the goals
+
+        Args:
+            cell: ID of the cell
+        Return:
+            cost: The cost from the cell to the goals through that neighbor, INFINITY if no neighbor reaches a goal
+            neighbor: ID of that neighbor
+            move: Direction code of the move to that neighbor
+        """
+        g, walls = self.g, self.walls
+        best = (INFINITY, -1, -1)
+        for neighbor, move in self.neighbors(cell):
+            if walls[neighbor] != 1 and g[neighbor] != INFINITY and g[neighbor] + 1 < best[0]:
+                best = (g[neighbor] + 1, neighbor, move)
+        return best
+
+    def update_cell(self, cell: int):
+        """
+        Function that recomputes the rhs of a cell and puts it in the frontier if it became inconsistent
+
+        Args:
+            cell: ID of the cell
+        """
+        if cell not in self.goals:
+            self.rhs[cell] = self.best_neighbor(cell)[0]
+        if cell in self.frontier:
+            del self.frontier[cell]
+        if self.g[cell] != self.rhs[cell]:
+            self.frontier[cell] = self.calculate_key(cell)
+
+    def compute_shortest_path(self):
+        """
+        Function that expands inconsistent cells until the cost of the start is known
+        """
+        g, rhs, frontier = self.g, self.rhs, self.frontier
+        start = self.start
+        while frontier and (frontier.peek()[1] < self.calculate_key(start) or rhs[start] != g[start]):
+            cell, old_key = frontier.pop()
+            self.nodes += 1
+            new_key = self.calculate_key(cell)
+            if old_key < new_key:
+                # The key is outdated since the start moved
+                frontier[cell] = new_key
+            elif g[cell] > rhs[cell]:
+                g[cell] = rhs[cell]
+                for neighbor, _ in self.neighbors(cell):
+                    self.update_cell(neighbor)
+            else:
+                g[cell] = INFINITY
+                self.update_cell(cell)
+                for neighbor, _ in self.neighbors(cell):
+                    self.update_cell(neighbor)
+
+    def plan(self) -> tuple[int, list]:
+        """
+        Function that repairs the search after the last changes and returns the path from the start
+
+        Return:
+            nodes: Number of nodes expanded since the last plan
+            path: A list of (cell, direction) tuples ending with (goal, None). Return None if no goal is reachable
+        """
+        self.nodes = 0
+        self.compute_shortest_path()
+        nodes = self.nodes
+
+        cell = self.start
+        if cell in self.goals:
+            return nodes, [(self.graph.cell(cell), None)]
+        if self.rhs[cell] == INFINITY:
+            return nodes, None
+
+        path = []
+        while cell not in self.goals:
+            _, neighbor, move = self.best_neighbor(cell)
+            path.append((self.graph.cell(cell), DIRECTIONS[move]))
+            cell = neighbor
+        path.append((self.graph.cell(cell), None))
+        return nodes, path
+
+    def set_wall(self, cell: tuple):
+        """
+        Function that adds a wall, making the moves into it impossible
+
+        Args:
+            cell: Coordinate of the cell
+        """
+        self.change_wall(cell, 1)
+
+    def clear_wall(self, cell: tuple):
+        """
+        Function that removes a wall
+
+        Args:
+            cell: Coordinate of the cell
+        """
+        self.change_wall(cell, 0)
+
+    def change_wall(self, cell: tuple, wall: int):
+        """
+        Function that changes a cell and updates the cells whose moves into it changed cost
+
+        Args:
+            cell: Coordinate of the cell
+            wall: 1 to make the cell a wall, 0 to clear it
+        """
+        if not self.graph.in_map(cell):
+            raise ValueError(f"Cell {cell} is outside the map")
+        cell_id = self.graph.cell_id(cell)
+        if self.walls[cell_id] == wall:
+            return
+        self.walls[cell_id] = wall
+        for neighbor, _ in self.neighbors(cell_id):
+            self.update_cell(neighbor)
+
+    def move_start(self, cell: tuple):
+        """
+        Function that moves the start, keeping the search state valid for the next plan
+
+        Args:
+            cell: Coordinate of the new start
+        """
+        if not self.graph.in_map(cell):
+            raise ValueError(f"Start {cell} is outside the map")
+        self.start = self.graph.cell_id(cell)
+        # Keys already in the frontier were computed from the old start and stay valid lower bounds
+        # once km grows by the distance the start moved
+        width = self.graph.width
+        self.km += abs(self.start % width - self.last_start % width) + abs(self.start // width - self.last_start // width)
+        self.last_start = self.start
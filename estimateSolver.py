@@ -1,158 +1,200 @@
+import argparse
+import csv
+import inspect
+import json
 import os
-from utils import *
-from mapSolver import MapSolver
-import timeit
-import matplotlib.pyplot as plt
-import numpy as np
-
-# Initialize lists to store results for smaller files
-algorithms = ["DFS", "BFS", "GBFS", "A*", "Custom 1 (IDS)", "Custom 2 (IDA*)"]
-nodes_explored = {alg: [] for alg in algorithms}
-path_lengths = {alg: [] for alg in algorithms}
-execution_times = {alg: [] for alg in algorithms}
-files_processed = []
-
-txt_files = [f for f in os.listdir("Test\Performance") if f.endswith('.txt')]
-
-for file in txt_files:
-    if file == "extra_large.txt":
-        continue
-    
-    start, goals, map = parse_grid(filename=f"Test\Performance\{file}")
-    solver = MapSolver(map, start, goals)
-
-    # DFS
-    dfs_nodes, dfs_path = solver.depth_first_search()
-    execution_time = timeit.timeit(lambda: solver.depth_first_search(), number=1)
-    nodes_explored["DFS"].append(dfs_nodes)
-    path_lengths["DFS"].append(len(dfs_path) - 1)
-    execution_times["DFS"].append(execution_time)
-
-    # BFS
-    bfs_nodes, bfs_path = solver.breadth_first_search()
-    execution_time = timeit.timeit(lambda: solver.breadth_first_search(), number=1)
-    nodes_explored["BFS"].append(bfs_nodes)
-    path_lengths["BFS"].append(len(bfs_path) - 1)
-    execution_times["BFS"].append(execution_time)
-
-    # GBFS
-    gbfs_nodes, gbfs_path = solver.greedy_best_first_search()
-    execution_time = timeit.timeit(lambda: solver.greedy_best_first_search(), number=1)
-    nodes_explored["GBFS"].append(gbfs_nodes)
-    path_lengths["GBFS"].append(len(gbfs_path) - 1)
-    execution_times["GBFS"].append(execution_time)
-
-    # A*
-    astar_nodes, astar_path = solver.astar()
-    execution_time = timeit.timeit(lambda: solver.astar(), number=1)
-    nodes_explored["A*"].append(astar_nodes)
-    path_lengths["A*"].append(len(astar_path) - 1)
-    execution_times["A*"].append(execution_time)
-
-    # Custom 1 (Iterative Deepening Search)
-    cus1_nodes, cus1_path = solver.iterative_deepening_search()
-    execution_time = timeit.timeit(lambda: solver.iterative_deepening_search(), number=1)
-    nodes_explored["Custom 1 (IDS)"].append(cus1_nodes)
-    path_lengths["Custom 1 (IDS)"].append(len(cus1_path) - 1)
-    execution_times["Custom 1 (IDS)"].append(execution_time)
-
-    # Custom 2 (IDA*)
-    cus2_nodes, cus2_path = solver.ida_star()
-    execution_time = timeit.timeit(lambda: solver.ida_star(), number=1)
-    nodes_explored["Custom 2 (IDA*)"].append(cus2_nodes)
-    path_lengths["Custom 2 (IDA*)"].append(len(cus2_path) - 1)
-    execution_times["Custom 2 (IDA*)"].append(execution_time)
-    
-    files_processed.append(file)
-
-
-bar_width = 0.15
-index = np.arange(len(files_processed))
-
-# Plot Nodes Explored
-plt.figure(figsize=(12, 6))
-for i, alg in enumerate(algorithms):
-    plt.bar(index + i * bar_width, nodes_explored[alg], bar_width, label=alg)
-
-plt.xlabel('Files')
-plt.ylabel('Nodes Explored')
-plt.title('Nodes Explored by Different Algorithms (Smaller Files)')
-plt.xticks(index + bar_width * (len(algorithms) / 2), files_processed, rotation=45)
-plt.legend()
-plt.tight_layout()
-plt.show()
-
-# Plot Path Lengths
-plt.figure(figsize=(12, 6))
-for i, alg in enumerate(algorithms):
-    plt.bar(index + i * bar_width, path_lengths[alg], bar_width, label=alg)
-
-plt.xlabel('Files')
-plt.ylabel('Path Length')
-plt.title('Path Lengths by Different Algorithms (Smaller Files)')
-plt.xticks(index + bar_width * (len(algorithms) / 2), files_processed, rotation=45)
-plt.legend()
-plt.tight_layout()
-plt.show()
-
-# Plot Execution Times
-plt.figure(figsize=(12, 6))
-for i, alg in enumerate(algorithms):
-    plt.bar(index + i * bar_width, execution_times[alg], bar_width, label=alg)
-
-plt.xlabel('Files')
-plt.ylabel('Execution Time (seconds)')
-plt.title('Execution Time by Different Algorithms (Smaller Files)')
-plt.xticks(index + bar_width * (len(algorithms) / 2), files_processed, rotation=45)
-plt.legend()
-plt.tight_layout()
-plt.show()
-
-# Process and visualize extra_large.txt separately
-if "extra_large.txt" in txt_files:
-    start, goals, map = parse_grid(filename="extra_large.txt")
-    solver = MapSolver(map, start, goals)
-    
-    # Store results for extra_large.txt
-    large_results = {}
-    large_results["DFS"] = solver.depth_first_search()
-    large_results["BFS"] = solver.breadth_first_search()
-    large_results["GBFS"] = solver.greedy_best_first_search()
-    large_results["A*"] = solver.astar()
-    large_results["Custom 1 (IDS)"] = solver.iterative_deepening_search()
-    large_results["Custom 2 (IDA*)"] = solver.ida_star()
-
-    # Visualization for extra_large.txt (nodes explored)
-    plt.figure(figsize=(8, 6))
-    plt.bar(algorithms, [res[0] for res in large_results.values()], color='skyblue')
-    plt.xlabel('Algorithms')
-    plt.ylabel('Nodes Explored')
-    plt.title('Nodes Explored by Different Algorithms (extra_large.txt)')
-    plt.xticks(rotation=45)
-    plt.tight_layout()
+import statistics
+import sys
+import time
+import tracemalloc
+from mapSolver import MapSolver, METHODS
+from searchStats import SearchStats
+from utils import parse_grid, percentile
+
+# Fields written for each (map, method) result, in CSV column order
+FIELDS = ["map", "method", "cells", "runs", "median_ms", "p95_ms", "min_ms", "nodes", "expansions", "peak_frontier", "path_length", "peak_memory_kib"]
+
+def list_map_files(sources: list) -> list:
+    """
+    Function that lists the map files to benchmark
+
+    Args:
+        sources: Map files, or directories whose .txt files are all used
+    Return:
+        files: A sorted list of paths to map files
+    """
+    files = []
+    for source in sources:
+        if os.path.isdir(source):
+            files.extend(os.path.join(source, name) for name in os.listdir(source) if name.endswith(".txt"))
+        else:
+            files.append(source)
+    return sorted(files)
+
+def benchmark(solver: MapSolver, method: str, warmup: int = 1, repeat: int = 5) -> dict:
+    """
+    Function that measures one search method on one map
+    Warmup runs are not timed and leave the solver warm, with its heuristic fields already computed.
+    Statistics and memory are measured in separate runs, so that neither slows down the timed runs
+
+    Args:
+        solver: The MapSolver of the map, without a cache
+        method: Name of the method, as used by search.py
+        warmup: Number of runs before timing
+        repeat: Number of timed runs
+    Return:
+        result: Timings in milliseconds, nodes, expansions, peak frontier size, path length and peak memory in KiB
+    """
+    search = getattr(solver, METHODS[method])
+    for _ in range(warmup):
+        search()
+
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        nodes, path = search()
+        times.append((time.perf_counter() - started) * 1000)
+    times.sort()
+
+    stats = None
+    if "stats" in inspect.signature(search).parameters:
+        stats = SearchStats()
+        search(stats=stats)
+
+    tracemalloc.start()
+    search()
+    peak_memory = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        "cells": solver.graph.size,
+        "runs": repeat,
+        "median_ms": statistics.median(times),
+        "p95_ms": percentile(times, 0.95),
+        "min_ms": times[0],
+        "nodes": nodes,
+        "expansions": stats.expansions if stats else None,
+        "peak_frontier": stats.peak_frontier if stats else None,
+        "path_length": len(path) - 1 if path is not None else None,
+        "peak_memory_kib": peak_memory / 1024,
+    }
+
+def run_benchmarks(files: list, methods: list, warmup: int = 1, repeat: int = 5, output=sys.stdout) -> list:
+    """
+    Function that benchmarks every method on every map, printing one line per result
+
+    Args:
+        files: Paths to map files
+        methods: Names of the methods, as used by search.py
+        warmup: Number of runs before timing
+        repeat: Number of timed runs
+        output: Stream receiving the progress lines, None to stay silent
+    Return:
+        results: A list of dictionaries with the FIELDS of each result
+    """
+    results = []
+    for filename in files:
+        start, goals, map = parse_grid(filename)
+        for method in methods:
+            result = {"map": filename, "method": method, **benchmark(MapSolver(map, start, goals), method, warmup, repeat)}
+            results.append(result)
+            if output:
+                output.write(f"{filename:<40} {method:<6} {result['median_ms']:>10.3f} ms median {result['p95_ms']:>10.3f} ms p95 {result['nodes']:>8} nodes\n")
+    return results
+
+def write_results(results: list, filename: str):
+    """
+    Function that writes results as JSON or, if the file name ends with .csv, as CSV
+
+    Args:
+        results: The results of run_benchmarks
+        filename: Path of the output file
+    """
+    with open(filename, "w", newline="") as file:
+        if filename.endswith(".csv"):
+            writer = csv.DictWriter(file, fieldnames=FIELDS)
+            writer.writeheader()
+            writer.writerows(results)
+        else:
+            json.dump(results, file, indent=1)
+
+def compare(results: list, baseline: list, threshold: float) -> list:
+    """
+    Function that finds the results whose median time regressed against a baseline
+
+    Args:
+        results: The results of run_benchmarks
+        baseline: Earlier results of run_benchmarks, as read from a JSON file
+        threshold: Allowed slowdown, 0.2 allows medians up to 20% slower
+    Return:
+        regressions: A list of (map, method, baseline median, new median) tuples
+    """
+    baseline_medians = {(result["map"], result["method"]): result["median_ms"] for result in baseline}
+    regressions = []
+    for result in results:
+        old = baseline_medians.get((result["map"], result["method"]))
+        if old is not None and result["median_ms"] > old * (1 + threshold):
+            regressions.append((result["map"], result["method"], old, result["median_ms"]))
+    return regressions
+
+def plot(results: list, fields: tuple = ("median_ms", "nodes", "path_length")):
+    """
+    Function that draws a bar chart of each field per map and method, if matplotlib is installed
+
+    Args:
+        results: The results of run_benchmarks
+        fields: Names of the fields to draw
+    """
+    try:
+        import matplotlib.pyplot as plt
+    except ImportError:
+        print("matplotlib is not installed, skipping plots")
+        return
+
+    maps = list(dict.fromkeys(os.path.basename(result["map"]) for result in results))
+    methods = list(dict.fromkeys(result["method"] for result in results))
+    bar_width = 0.8 / len(methods)
+    for field in fields:
+        plt.figure(figsize=(12, 6))
+        for i, method in enumerate(methods):
+            values = {os.path.basename(result["map"]): result[field] or 0 for result in results if result["method"] == method}
+            plt.bar([index + i * bar_width for index in range(len(maps))], [values.get(name, 0) for name in maps], bar_width, label=method)
+        plt.xlabel("Map")
+        plt.ylabel(field)
+        plt.xticks([index + 0.4 - bar_width / 2 for index in range(len(maps))], maps, rotation=45)
+        plt.legend()
+        plt.tight_layout()
     plt.show()
 
-    # Visualization for extra_large.txt (path lengths)
-    plt.figure(figsize=(8, 6))
-    plt.bar(algorithms, [len(res[1]) - 1 for res in large_results.values()], color='orange')
-    plt.xlabel('Algorithms')
-    plt.ylabel('Path Length')
-    plt.title('Path Length by Different Algorithms (extra_large.txt)')
-    plt.xticks(rotation=45)
-    plt.tight_layout()
-    plt.show()
-
-    # Visualization for extra_large.txt (execution times)
-    execution_times_large = []
-    for alg, method in large_results.items():
-        execution_time = timeit.timeit(lambda: method, number=1)
-        execution_times_large.append(execution_time)
-    
-    plt.figure(figsize=(8, 6))
-    plt.bar(algorithms, execution_times_large, color='green')
-    plt.xlabel('Algorithms')
-    plt.ylabel('Execution Time (seconds)')
-    plt.title('Execution Time by Different Algorithms (extra_large.txt)')
-    plt.xticks(rotation=45)
-    plt.tight_layout()
-    plt.show()
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the search methods on map files")
+    parser.add_argument("maps", nargs="*", default=[os.path.join("Test", "Performance")], help="map files or directories of maps")
+    parser.add_argument("--methods", nargs="+", default=["DFS", "BFS", "GBFS", "AS", "CUS1", "CUS2"], help="names of the methods, as used by search.py")
+    parser.add_argument("--warmup", type=int, default=1, help="untimed runs before timing")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs")
+    parser.add_argument("--output", help="write the results to this .json or .csv file")
+    parser.add_argument("--baseline", help="JSON results to compare the median times against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown against the baseline, 0.2 for 20%%")
+    parser.add_argument("--plot", action="store_true", help="draw bar charts with matplotlib")
+    args = parser.parse_args()
+
+    unknown = [method for method in args.methods if method not in METHODS]
+    if unknown:
+        parser.error(f"Unknown methods {', '.join(unknown)}; choose from {', '.join(METHODS)}")
+
+    results = run_benchmarks(list_map_files(args.maps), args.methods, args.warmup, args.repeat)
+    if args.output:
+        write_results(results, args.output)
+    if args.plot:
+        plot(results)
+
+    if args.baseline:
+        with open(args.baseline, "r") as file:
+            regressions = compare(results, json.load(file), args.threshold)
+        for filename, method, old, new in regressions:
+            print(f"Regression: {filename} {method} {old:.3f} ms -> {new:.3f} ms ({(new / old - 1) * 100:+.1f}%)")
+        if regressions:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+import heapq
+from itertools import count
+
+class PriorityFrontier:
+    def __init__(self):
+        """
+        Initializes an empty priority frontier backed by a binary heap.
+
+        The frontier behaves like the dictionary previously used by the informed searches:
+        - frontier[cell] = cost adds a cell, or changes its cost while keeping its original insertion order
+        - del frontier[cell] removes a cell
+        - pop() returns the cell with the lowest cost, if similar then the first inserted cell
+        Outdated heap entries are skipped lazily when popped.
+        """
+        self.heap = []
+        self.entries = {}
+        self.counter = count()
+
+    def __setitem__(self, cell, cost):
+        entry = self.entries.get(cell)
+        order = entry[1] if entry else next(self.counter)
+        entry = (cost, order, cell)
+        self.entries[cell] = entry
+        heapq.heappush(self.heap, entry)
+
+    def __getitem__(self, cell):
+        return self.entries[cell][0]
+
+    def __delitem__(self, cell):
+        # The heap entry becomes outdated and is skipped when popped
+        del self.entries[cell]
+
+    def __contains__(self, cell) -> bool:
+        return cell in self.entries
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __bool__(self) -> bool:
+        return bool(self.entries)
+
+    def pop(self) -> tuple:
+        """
+        Function that removes the cell with the lowest cost from the frontier
+
+        Return:
+            cell: The cell with the lowest cost
+            cost: The cost of that cell
+        """
+        heap = self.heap
+        entries = self.entries
+        while True:
+            entry = heapq.heappop(heap)
+            if entries.get(entry[2]) is entry:
+                del entries[entry[2]]
+                return entry[2], entry[0]
+
+    def peek(self) -> tuple:
+        """
+        Function that retrieves the cell with the lowest cost without removing it from the frontier
+
+        Return:
+            cell: The cell with the lowest cost
+            cost: The cost of that cell
+        """
+        heap = self.heap
+        entries = self.entries
+        while entries.get(heap[0][2]) is not heap[0]:
+            heapq.heappop(heap)
+        return heap[0][2], heap[0][0]
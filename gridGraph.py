@@ -0,0 +1,303 @@
+from array import array
+from collections import deque
+from searchStats import CountingQueue, CountingView
+
+# Direction codes follow the neighbor order "up", "left", "down", "right"
+DIRECTIONS = ("up", "left", "down", "right")
+UP, LEFT, DOWN, RIGHT = range(4)
+# Distance used for cells that cannot reach any source
+INFINITY = 2 ** 31 - 1
+
+class GridGraph:
+    def __init__(self, map: list):
+        """
+        Initializes a flat, integer-indexed view of a map.
+
+        Every cell (x, y) gets the ID y * width + x. The walls are stored in a flat bytearray and the
+        neighbors of every cell are precomputed once in CSR form: the neighbors of a cell are
+        targets[offsets[cell]:offsets[cell + 1]] and the move to reach each of them is stored at the
+        same index in moves, following the order "up", "left", "down", "right".
+
+        Args:
+            map: A 2D array representing the map, 1 marks a wall
+        """
+        self.height = len(map)
+        self.width = len(map[0]) if self.height else 0
+        self.size = self.width * self.height
+        # Change of cell ID made by each move
+        self.steps = (-self.width, -1, self.width, 1)
+
+        width = self.width
+        walls = bytearray(self.size)
+        for y, row in enumerate(map):
+            walls[y * width:(y + 1) * width] = bytes(row)
+        self.walls = walls
+
+        self.offsets = array('i', [0]) * (self.size + 1)
+        self.targets = array('i')
+        self.moves = bytearray()
+        self.build_neighbors()
+
+    def build_neighbors(self):
+        """
+        Function that builds the CSR neighbor table of the map
+        A neighbor is valid if it is within the map boundaries and is not a wall
+        """
+        width, height = self.width, self.height
+        walls, offsets = self.walls, self.offsets
+        targets, moves = self.targets, self.moves
+
+        cell = 0
+        for y in range(height):
+            for x in range(width):
+                if y > 0 and walls[cell - width] != 1:
+                    targets.append(cell - width)
+                    moves.append(UP)
+                if x > 0 and walls[cell - 1] != 1:
+                    targets.append(cell - 1)
+                    moves.append(LEFT)
+                if y < height - 1 and walls[cell + width] != 1:
+                    targets.append(cell + width)
+                    moves.append(DOWN)
+                if x < width - 1 and walls[cell + 1] != 1:
+                    targets.append(cell + 1)
+                    moves.append(RIGHT)
+                cell += 1
+                offsets[cell] = len(targets)
+
+    def parent_store(self) -> tuple[array, bytearray]:
+        """
+        Function that creates the storage of parent links used by a search
+        parent[cell] is the ID of the cell it was reached from, or -1 if it was not reached yet,
+        and move[cell] is the direction code of the move made to reach it
+
+        Return:
+            parent: An array of parent IDs
+            move: A bytearray of direction codes
+        """
+        return array('i', [-1]) * self.size, bytearray(self.size)
+
+    def reached(self, parent: array) -> int:
+        """
+        Function that counts the cells that have been given a parent
+
+        Args:
+            parent: An array of parent IDs
+        Return:
+            count: Number of reached cells
+        """
+        return self.size - parent.count(-1)
+
+    def trace_moves(self, parent: array, move: bytearray, start: int, cell: int) -> bytearray:
+        """
+        Function that follows the parent links from a cell back to the start in one linear pass
+
+        Args:
+            parent: An array of parent IDs
+            move: A bytearray of direction codes
+            start: ID of the starting cell
+            cell: ID of the reached cell
+        Return:
+            moves: Direction codes of all moves from the start to the cell
+        """
+        moves = bytearray()
+        while cell != start:
+            moves.append(move[cell])
+            cell = parent[cell]
+        moves.reverse()
+        return moves
+
+    def in_map(self, cell: tuple) -> bool:
+        """
+        Function that checks if a (x, y) coordinate is within the map boundaries
+
+        Args:
+            cell: Coordinate of a cell
+        Return:
+            true: If the cell is within the map boundaries
+            false: If the cell is outside the map boundaries
+        """
+        return 0 <= cell[0] < self.width and 0 <= cell[1] < self.height
+
+    def cell_id(self, cell: tuple) -> int:
+        """
+        Function that converts a (x, y) coordinate to its cell ID
+
+        Args:
+            cell: Coordinate of a cell
+        Return:
+            id: The integer ID of the cell
+        """
+        return cell[1] * self.width + cell[0]
+
+    def cell(self, cell_id: int) -> tuple:
+        """
+        Function that converts a cell ID back to its (x, y) coordinate
+
+        Args:
+            cell_id: The integer ID of a cell
+        Return:
+            cell: Coordinate of the cell
+        """
+        y, x = divmod(cell_id, self.width)
+        return (x, y)
+
+    def cell_ids(self, cells) -> set:
+        """
+        Function that converts (x, y) coordinates to cell IDs, dropping the ones outside the map
+
+        Args:
+            cells: An iterable of coordinates
+        Return:
+            ids: A set of cell IDs
+        """
+        return {self.cell_id(cell) for cell in cells if self.in_map(cell)}
+
+    def distance_transform(self, goals) -> array:
+        """
+        Function that computes the Manhattan distance from every cell to its nearest goal
+        The field ignores walls and is computed in O(cells) with a two-pass L1 distance transform
+
+        Args:
+            goals: An iterable of goal coordinates, goals outside the map are allowed
+        Return:
+            field: A flat array where field[cell] is the minimum Manhattan distance from the cell to any goal
+        """
+        width, height = self.width, self.height
+        field = array('i', [INFINITY]) * self.size
+
+        for goal in goals:
+            # The nearest cell of the map to a goal outside it lies on its border,
+            # and every path from the map to the goal passes through that cell
+            x = min(max(goal[0], 0), width - 1)
+            y = min(max(goal[1], 0), height - 1)
+            cell = y * width + x
+            field[cell] = min(field[cell], abs(goal[0] - x) + abs(goal[1] - y))
+
+        # Forward pass: take distances coming from the cells above and to the left
+        cell = 0
+        for y in range(height):
+            for x in range(width):
+                distance = field[cell]
+                if y > 0 and field[cell - width] + 1 < distance:
+                    distance = field[cell - width] + 1
+                if x > 0 and field[cell - 1] + 1 < distance:
+                    distance = field[cell - 1] + 1
+                field[cell] = distance
+                cell += 1
+
+        # Backward pass: take distances coming from the cells below and to the right
+        for y in range(height - 1, -1, -1):
+            for x in range(width - 1, -1, -1):
+                cell -= 1
+                distance = field[cell]
+                if y < height - 1 and field[cell + width] + 1 < distance:
+                    distance = field[cell + width] + 1
+                if x < width - 1 and field[cell + 1] + 1 < distance:
+                    distance = field[cell + 1] + 1
+                field[cell] = distance
+
+        return field
+
+    def distance_field(self, sources, stats=None) -> tuple[array, bytearray, int]:
+        """
+        Function that runs a Breadth First Search backward from a set of cells
+        The search tells for every cell how far the nearest source is and which move leads towards it
+
+        Args:
+            sources: An iterable of source cell IDs, which should not be walls
+            stats: Optional SearchStats receiving the counters of the search
+        Return:
+            distance: A flat array of the number of moves from each cell to its nearest source, INFINITY if unreachable
+            toward: A bytearray of the direction code of the first move from each cell towards its nearest source
+            nodes: Number of cells reached by the search
+        """
+        offsets, targets, moves = self.offsets, self.targets, self.moves
+        distance = array('i', [INFINITY]) * self.size
+        toward = bytearray(self.size)
+
+        frontier = deque()
+        if stats is not None:
+            frontier = CountingQueue(stats)
+            targets = CountingView(targets, stats, "generated")
+        for source in sources:
+            if distance[source] != 0:
+                distance[source] = 0
+                frontier.append(source)
+
+        nodes = len(frontier)
+        while frontier:
+            cell = frontier.popleft()
+            if stats is not None:
+                stats.expand(cell, len(frontier))
+            next_distance = distance[cell] + 1
+            for k in range(offsets[cell], offsets[cell + 1]):
+                neighbor = targets[k]
+                if distance[neighbor] == INFINITY:
+                    distance[neighbor] = next_distance
+                    # Going back from the neighbor to the cell is the opposite move
+                    toward[neighbor] = (moves[k] + 2) % 4
+                    frontier.append(neighbor)
+                    nodes += 1
+
+        return distance, toward, nodes
+
+    def attach_to_field(self, cell: int, distance: array, toward: bytearray):
+        """
+        Function that adds a wall cell to a distance field through its best neighbor
+        A search can leave a start placed on a wall but never enter it, so the backward search misses it
+
+        Args:
+            cell: ID of the cell
+            distance: The distance array of the field
+            toward: The direction codes of the field
+        """
+        for k in range(self.offsets[cell], self.offsets[cell + 1]):
+            neighbor = self.targets[k]
+            if distance[neighbor] + 1 < distance[cell]:
+                distance[cell] = distance[neighbor] + 1
+                toward[cell] = self.moves[k]
+
+    def follow_field(self, cell: int, distance: array, toward: bytearray) -> bytearray:
+        """
+        Function that walks from a cell to its nearest source of a distance field
+
+        Args:
+            cell: ID of the first cell
+            distance: The distance array of the field
+            toward: The direction codes of the field
+        Return:
+            moves: Direction codes of all moves from the cell to the source, None if no source is reachable
+        """
+        if distance[cell] == INFINITY:
+            return None
+
+        steps = self.steps
+        moves = bytearray(distance[cell])
+        for i in range(len(moves)):
+            moves[i] = toward[cell]
+            cell += steps[moves[i]]
+        return moves
+
+class ManhattanDistance:
+    def __init__(self, graph: GridGraph, cell: tuple):
+        """
+        Initializes a read-only view of the Manhattan distance from every cell ID to a single cell.
+
+        Unlike GridGraph.distance_transform nothing is stored, each distance is computed when it is read,
+        so a view for a new cell costs nothing to make.
+
+        Args:
+            graph: The GridGraph of the map
+            cell: Coordinate of the cell the distances are measured to
+        """
+        self.width = graph.width
+        self.size = graph.size
+        self.x, self.y = cell
+
+    def __getitem__(self, cell_id: int) -> int:
+        y, x = divmod(cell_id, self.width)
+        return abs(x - self.x) + abs(y - self.y)
+
+    def __len__(self) -> int:
+        return self.size
@@ -0,0 +1,356 @@
+import random
+import sys
+import time
+from array import array
+from collections import deque
+from frontier import PriorityFrontier
+from gridGraph import GridGraph
+from searchStats import CountingFrontier, counted
+
+# Side of the square clusters the map is split into
+CLUSTER_SIZE = 16
+# Border openings at least this long get a transition at each end instead of one in the middle
+LONG_ENTRANCE = 6
+
+class HierarchicalSolver:
+    def __init__(self, graph: GridGraph, cluster_size: int = CLUSTER_SIZE):
+        """
+        Initializes the abstract graph used by Hierarchical Path-Finding A* (HPA*).
+
+        The map is split into square clusters. Every opening in the border between two clusters is an entrance,
+        crossed by one or two transitions: pairs of open cells facing each other on both sides of the border.
+        The cells of the transitions are the nodes of the abstract graph. They are linked by the move crossing
+        the border and, inside each cluster, by the distance between them found with a Breadth First Search
+        restricted to the cluster. The abstract graph is built once per map and answers any query.
+
+        Args:
+            graph: A GridGraph of the map
+            cluster_size: Side of the clusters
+        """
+        self.graph = graph
+        self.cluster_size = cluster_size
+        self.columns = -(-graph.width // cluster_size)
+        self.rows = -(-graph.height // cluster_size)
+        # Cluster of every cell
+        self.clusters = array('i', [0]) * graph.size
+        for y in range(graph.height):
+            row = array('i', [(y // cluster_size) * self.columns + x // cluster_size for x in range(graph.width)])
+            self.clusters[y * graph.width:(y + 1) * graph.width] = row
+        # Abstract nodes of each cluster, and the (neighbor, cost) edges of each abstract node
+        self.cluster_nodes = [set() for _ in range(self.columns * self.rows)]
+        self.edges = {}
+
+        started = time.perf_counter()
+        self.find_entrances()
+        self.connect_clusters()
+        self.build_seconds = time.perf_counter() - started
+
+    def cluster_of(self, cell: int) -> int:
+        """
+        Function that finds the cluster of a cell
+
+        Args:
+            cell: ID of the cell
+        Return:
+            cluster: Index of the cluster
+        """
+        return self.clusters[cell]
+
+    def find_entrances(self):
+        """
+        Function that adds the transitions of every opening in the borders between clusters
+        """
+        size = self.cluster_size
+        width, height = self.graph.width, self.graph.height
+
+        # Vertical borders, between the columns x - 1 and x
+        for x in range(size, width, size):
+            for y0 in range(0, height, size):
+                self.add_entrances([(y * width + x - 1, y * width + x) for y in range(y0, min(y0 + size, height))])
+        # Horizontal borders, between the rows y - 1 and y
+        for y in range(size, height, size):
+            for x0 in range(0, width, size):
+                self.add_entrances([((y - 1) * width + x, y * width + x) for x in range(x0, min(x0 + size, width))])
+
+    def add_entrances(self, border: list):
+        """
+        Function that splits a border into entrances and adds their transitions
+
+        Args:
+            border: (cell, facing cell) pairs along the border
+        """
+        walls = self.graph.walls
+        run = []
+        for pair in border + [None]:
+            if pair is not None and walls[pair[0]] != 1 and walls[pair[1]] != 1:
+                run.append(pair)
+                continue
+            if len(run) >= LONG_ENTRANCE:
+                self.add_transition(*run[0])
+                self.add_transition(*run[-1])
+            elif run:
+                self.add_transition(*run[len(run) // 2])
+            run = []
+
+    def add_transition(self, cell: int, facing: int):
+        """
+        Function that adds two facing cells as abstract nodes linked by one move
+
+        Args:
+            cell: ID of the cell on one side of the border
+            facing: ID of the cell on the other side
+        """
+        for node, other in ((cell, facing), (facing, cell)):
+            self.cluster_nodes[self.cluster_of(node)].add(node)
+            self.edges.setdefault(node, []).append((other, 1))
+
+    def connect_clusters(self):
+        """
+        Function that links the abstract nodes of each cluster by their distance inside the cluster
+        """
+        for cluster, nodes in enumerate(self.cluster_nodes):
+            for node in nodes:
+                distance, _ = self.cluster_search(node, cluster)
+                self.edges[node].extend((other, distance[other]) for other in nodes if other != node and other in distance)
+
+    def cluster_search(self, source: int, cluster: int) -> tuple[dict, dict]:
+        """
+        Function that runs a Breadth First Search without leaving a cluster
+
+        Args:
+            source: ID of the first cell
+            cluster: Index of the cluster
+        Return:
+            distance: A dictionary of the number of moves from the source to each reached cell
+            parent: A dictionary of the (previous cell, direction code) of each reached cell
+        """
+        graph = self.graph
+        offsets, targets, moves = graph.offsets, graph.targets, graph.moves
+        clusters = self.clusters
+
+        distance = {source: 0}
+        parent = {}
+        frontier = deque([source])
+        while frontier:
+            cell = frontier.popleft()
+            next_distance = distance[cell] + 1
+            for k in range(offsets[cell], offsets[cell + 1]):
+                neighbor = targets[k]
+                if clusters[neighbor] == cluster and neighbor not in distance:
+                    distance[neighbor] = next_distance
+                    parent[neighbor] = (cell, moves[k])
+                    frontier.append(neighbor)
+        return distance, parent
+
+    def search(self, start: int, goals: set, stats=None) -> tuple[int, bytearray]:
+        """
+        Function that finds a path by searching the abstract graph with A*, then refining it inside the clusters it crosses
+        The path can still be longer than the shortest one when that one leaves those clusters
+
+        Args:
+            start: ID of the starting cell
+            goals: A set of goal cell IDs
+            stats: Optional SearchStats receiving the counters of the abstract search
+        Return:
+            nodes: Number of abstract nodes expanded
+            moves: Direction codes of all moves from the start to a goal, None if no goal is reachable
+        """
+        if start in goals:
+            return 0, bytearray()
+        if not goals:
+            return 0, None
+        graph = self.graph
+        width = graph.width
+        goal_points = [divmod(goal, width) for goal in goals]
+
+        # Link the start and the goals to the abstract nodes of their clusters
+        extra_edges = {}
+        entries = [start]
+        if graph.walls[start] == 1:
+            # A start on a wall can only move out of it, maybe into another cluster
+            extra_edges[start] = [(graph.targets[k], 1) for k in range(graph.offsets[start], graph.offsets[start + 1])]
+            entries = [neighbor for neighbor, _ in extra_edges[start]]
+        for entry in entries:
+            cluster = self.cluster_of(entry)
+            distance, _ = self.cluster_search(entry, cluster)
+            edges = extra_edges.setdefault(entry, [])
+            edges.extend((node, distance[node]) for node in self.cluster_nodes[cluster] if node in distance)
+            edges.extend((goal, distance[goal]) for goal in goals if goal in distance)
+        goal_edges = {}
+        for goal in goals:
+            # A goal on a wall can never be entered
+            if graph.walls[goal] == 1:
+                continue
+            cluster = self.cluster_of(goal)
+            distance, _ = self.cluster_search(goal, cluster)
+            for node in self.cluster_nodes[cluster]:
+                if node in distance:
+                    goal_edges.setdefault(node, []).append((goal, distance[node]))
+
+        def heuristic(cell: int) -> int:
+            y, x = divmod(cell, width)
+            return min(abs(y - goal_y) + abs(x - goal_x) for goal_y, goal_x in goal_points)
+
+        frontier = PriorityFrontier()
+        if stats is not None:
+            frontier = CountingFrontier(stats)
+            heuristic = counted(heuristic, stats, "heuristic_evaluations")
+            stats.phase("search")
+        cost = {start: 0}
+        parent = {start: None}
+        frontier[start] = heuristic(start)
+        nodes = 0
+        while frontier:
+            cell, _ = frontier.pop()
+            nodes += 1
+            if stats is not None:
+                stats.expand(cell, len(frontier))
+            if cell in goals:
+                if stats is not None:
+                    stats.phase("path")
+                return nodes, self.refine(cell, parent)
+
+            edges = self.edges.get(cell, []) + goal_edges.get(cell, []) + extra_edges.get(cell, [])
+            if stats is not None:
+                stats.generated += len(edges)
+            for neighbor, edge_cost in edges:
+                new_cost = cost[cell] + edge_cost
+                if new_cost < cost.get(neighbor, new_cost + 1):
+                    cost[neighbor] = new_cost
+                    parent[neighbor] = cell
+                    frontier[neighbor] = new_cost + heuristic(neighbor)
+
+        return nodes, None
+
+    def refine(self, goal: int, parent: dict) -> bytearray:
+        """
+        Function that turns a path of abstract nodes into the moves between its cells
+        Instead of joining the transitions one leg at a time, A* runs once through the clusters crossed by the
+        abstract path, so the path may cross their borders anywhere and cut the corners left at the transitions
+
+        Args:
+            goal: ID of the reached goal
+            parent: A dictionary of the previous abstract node of each reached node
+        Return:
+            moves: Direction codes of all moves from the start to the goal
+        """
+        abstract_path = []
+        while goal is not None:
+            abstract_path.append(goal)
+            goal = parent[goal]
+        abstract_path.reverse()
+
+        corridor = {self.cluster_of(cell) for cell in abstract_path}
+        return self.corridor_search(abstract_path[0], abstract_path[-1], corridor)
+
+    def corridor_search(self, start: int, goal: int, corridor: set) -> bytearray:
+        """
+        Function that runs A* from a cell to a goal without leaving a set of clusters
+
+        Args:
+            start: ID of the starting cell
+            goal: ID of the goal, reachable from the start inside the clusters
+            corridor: Indexes of the clusters the path may go through
+        Return:
+            moves: Direction codes of all moves of a shortest path inside the clusters
+        """
+        graph = self.graph
+        offsets, targets, moves = graph.offsets, graph.targets, graph.moves
+        clusters, width = self.clusters, graph.width
+        goal_y, goal_x = divmod(goal, width)
+
+        cost = {start: 0}
+        parent = {}
+        frontier = PriorityFrontier()
+        frontier[start] = 0
+        while frontier:
+            cell, _ = frontier.pop()
+            if cell == goal:
+                break
+            next_cost = cost[cell] + 1
+            for k in range(offsets[cell], offsets[cell + 1]):
+                neighbor = targets[k]
+                if clusters[neighbor] in corridor and next_cost < cost.get(neighbor, next_cost + 1):
+                    cost[neighbor] = next_cost
+                    parent[neighbor] = (cell, moves[k])
+                    y, x = divmod(neighbor, width)
+                    frontier[neighbor] = next_cost + abs(y - goal_y) + abs(x - goal_x)
+
+        path = bytearray()
+        cell = goal
+        while cell != start:
+            cell, move = parent[cell]
+            path.append(move)
+        path.reverse()
+        return path
+
+    def report(self) -> dict:
+        """
+        Function that describes the size of the abstract graph
+
+        Return:
+            report: Numbers of clusters, abstract nodes and edges, the build time in seconds
+                and the memory used by the abstract graph in bytes
+        """
+        edges = sum(len(node_edges) for node_edges in self.edges.values())
+        memory = sys.getsizeof(self.clusters) + sys.getsizeof(self.edges) + sys.getsizeof(self.cluster_nodes)
+        memory += sum(sys.getsizeof(nodes) for nodes in self.cluster_nodes)
+        memory += sum(sys.getsizeof(node_edges) for node_edges in self.edges.values())
+        # Every edge is a (neighbor, cost) tuple
+        memory += edges * sys.getsizeof((0, 0))
+        return {
+            "clusters": len(self.cluster_nodes),
+            "nodes": len(self.edges),
+            "edges": edges,
+            "build_seconds": self.build_seconds,
+            "memory_bytes": memory,
+        }
+
+def main():
+    # python hierarchicalSolver.py <map> [cluster size] [queries]
+    from mapSolver import MapSolver
+    from utils import parse_grid
+
+    filename = sys.argv[1]
+    cluster_size = int(sys.argv[2]) if len(sys.argv) > 2 else CLUSTER_SIZE
+    queries = int(sys.argv[3]) if len(sys.argv) > 3 else 100
+    start, goals, map = parse_grid(filename)
+    solver = MapSolver(map, start, goals)
+
+    hierarchy = HierarchicalSolver(solver.graph, cluster_size)
+    report = hierarchy.report()
+    print(f"{filename}: {solver.graph.width}x{solver.graph.height}, clusters of {cluster_size}")
+    print(f"{report['clusters']} clusters, {report['nodes']} abstract nodes, {report['edges']} edges")
+    print(f"Built in {report['build_seconds']:.4f} s, using {report['memory_bytes'] / 1024:.1f} KiB")
+
+    # Compare queries from random open cells with plain A*
+    graph = solver.graph
+    goal_ids = graph.cell_ids(goals)
+    open_cells = [cell for cell in range(graph.size) if graph.walls[cell] != 1]
+    generator = random.Random(0)
+    hpa_seconds = astar_seconds = 0
+    hpa_length = astar_length = solved = 0
+    for _ in range(queries):
+        cell = generator.choice(open_cells)
+        started = time.perf_counter()
+        _, moves = hierarchy.search(cell, goal_ids)
+        hpa_seconds += time.perf_counter() - started
+
+        solver.start = graph.cell(cell)
+        started = time.perf_counter()
+        _, path = solver.astar()
+        astar_seconds += time.perf_counter() - started
+
+        if (moves is None) != (path is None):
+            print(f"Query from {graph.cell(cell)} disagrees on reachability")
+        elif path is not None:
+            solved += 1
+            hpa_length += len(moves)
+            astar_length += len(path) - 1
+
+    print(f"{queries} queries: HPA* {hpa_seconds / queries * 1000:.3f} ms, A* {astar_seconds / queries * 1000:.3f} ms per query")
+    if astar_length:
+        print(f"{solved} solved, paths {(hpa_length / astar_length - 1) * 100:.2f}% longer than A*")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+import argparse
+import asyncio
+import json
+import random
+import time
+from solverService import LINE_LIMIT
+from utils import parse_grid, percentile
+
+async def run_client(connect, requests: list, latencies: list) -> int:
+    """
+    Function that sends requests over one connection, waiting for each response before the next request
+
+    Args:
+        connect: Coroutine function opening a connection to the service
+        requests: The requests to send
+        latencies: List receiving the latency of each request in seconds
+    Return:
+        errors: Number of requests that failed
+    """
+    reader, writer = await connect()
+    errors = 0
+    for request in requests:
+        started = time.perf_counter()
+        writer.write(json.dumps(request).encode() + b"\n")
+        await writer.drain()
+        response = json.loads(await reader.readline())
+        latencies.append(time.perf_counter() - started)
+        errors += not response["ok"]
+    writer.close()
+    await writer.wait_closed()
+    return errors
+
+async def generate_load(connect, filename: str, methods: list, clients: int, total: int, seed: int = None) -> dict:
+    """
+    Function that loads a map into the service and solves it from random starts over many connections at once
+
+    Args:
+        connect: Coroutine function opening a connection to the service
+        filename: Path to the map file
+        methods: Names of the methods, used in turn
+        clients: Number of connections sending requests at the same time
+        total: Total number of solve requests
+        seed: Seed of the random starts
+    Return:
+        report: Throughput, latency percentiles in milliseconds and number of errors
+    """
+    with open(filename, "r") as file:
+        text = file.read()
+    _, _, map = parse_grid(filename)
+    open_cells = [(x, y) for y, row in enumerate(map) for x, cell in enumerate(row) if cell != 1]
+    generator = random.Random(seed)
+
+    reader, writer = await connect()
+    writer.write(json.dumps({"op": "load", "map_id": filename, "text": text}).encode() + b"\n")
+    await writer.drain()
+    response = json.loads(await reader.readline())
+    writer.close()
+    if not response["ok"]:
+        raise RuntimeError(response["error"])
+
+    requests = [[] for _ in range(clients)]
+    for index in range(total):
+        requests[index % clients].append({
+            "id": index,
+            "op": "solve",
+            "map_id": filename,
+            "method": methods[index % len(methods)],
+            "start": list(generator.choice(open_cells)),
+        })
+
+    latencies = []
+    started = time.perf_counter()
+    errors = await asyncio.gather(*(run_client(connect, batch, latencies) for batch in requests))
+    seconds = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": total,
+        "errors": sum(errors),
+        "seconds": seconds,
+        "throughput": total / seconds,
+        "p50_ms": percentile(latencies, 0.5) * 1000,
+        "p95_ms": percentile(latencies, 0.95) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Send concurrent solve requests to a running solver service")
+    parser.add_argument("--unix", help="path of the Unix socket of the service")
+    parser.add_argument("--host", default="127.0.0.1", help="host of the service with TCP")
+    parser.add_argument("--port", type=int, default=8765, help="port of the service with TCP")
+    parser.add_argument("--clients", type=int, default=8, help="number of connections sending requests at the same time")
+    parser.add_argument("--requests", type=int, default=1000, help="total number of solve requests")
+    parser.add_argument("--seed", type=int, help="seed of the random starts")
+    parser.add_argument("filename", help="map file to solve")
+    parser.add_argument("methods", nargs="+", help="names of the methods, used in turn")
+    args = parser.parse_args()
+
+    if args.unix:
+        connect = lambda: asyncio.open_unix_connection(args.unix, limit=LINE_LIMIT)
+    else:
+        connect = lambda: asyncio.open_connection(args.host, args.port, limit=LINE_LIMIT)
+    report = asyncio.run(generate_load(connect, args.filename, args.methods, args.clients, args.requests, args.seed))
+    print(json.dumps(report))
+
+if __name__ == "__main__":
+    main()
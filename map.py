@@ -1,12 +1,18 @@
 import customtkinter as ctk
+import math
+import queue
+import threading
+import time
 import tkinter as tk
-import copy
+from collections import deque
+from searchSteps import Expand, Enqueue, ThresholdRaise, PathFound, Finished
 
 START_COLOR = "#D00000"
 GOAL_COLOR = "#1DB954"
 OBSTACLE_COLOR = "#000000"
 EMPTY_COLOR = "#ffffff"
 PATH_COLOR = "#FFBA08"
+FRONTIER_COLOR = "#FFE29A"
 FINAL_PATH_COLOR = "#1DB954"
 FRAME_BG_COLOR = "#000000"
 WINDOW_BG_COLOR = "#000000"
@@ -24,91 +30,285 @@ FRAME_Y = 50
 BUTTON_START_X = 822
 BUTTON_Y = 252
 
+# Maps with more cells are drawn into a pixel buffer instead of one rectangle per cell
+PIXEL_MODE_CELLS = 40000
+# Largest side in pixels of the pixel buffer when zooming in
+MAX_IMAGE_SIDE = 4096
+# Zoom factor of each mouse wheel step
+ZOOM_STEP = 1.25
+
+# Milliseconds between two drains of the event queue, and number of events a search can queue ahead of the display
+FRAME_MS = 16
+EVENT_QUEUE_SIZE = 10000
+# Cells drawn per second at start, and the highest speed as a power of 10, which draws every queued event at once
+DEFAULT_SPEED = 20
+MAX_SPEED_EXPONENT = 5
+
+# Search methods of MapSolver by button
+SEARCHES = {
+    "dfs": "depth_first_search",
+    "bfs": "breadth_first_search",
+    "gbfs": "greedy_best_first_search",
+    "astar": "astar",
+    "cus1": "iterative_deepening_search",
+    "cus2": "ida_star",
+    "all": "held_karp_multi_goals",
+}
+
+class SearchCancelled(Exception):
+    """
+    Raised inside a search running off the UI thread when it is cancelled
+    """
+
+class SearchFeed:
+    def __init__(self, events: queue.Queue):
+        """
+        Initializes the link between a search running off the UI thread and the queue drawn by the UI thread.
+
+        The events of the search are queued for the UI thread to draw. A full queue blocks the search until
+        the display catches up, and once cancel() is called the next event raises SearchCancelled to stop the search.
+
+        Args:
+            events: The queue receiving the events
+        """
+        self.events = events
+        self.cancelled = threading.Event()
+
+    def put(self, event: tuple):
+        """
+        Function that queues an event, waiting while the queue is full
+
+        Args:
+            event: An event of searchSteps
+        Raise:
+            SearchCancelled: If the search was cancelled
+        """
+        while True:
+            if self.cancelled.is_set():
+                raise SearchCancelled()
+            try:
+                self.events.put(event, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+
+    def cancel(self):
+        self.cancelled.set()
+
 class GridFrame(ctk.CTkFrame):
     def __init__(self, master, solver, frame_size):
+        """
+        Initializes the view of a map, drawn on a single canvas.
+
+        Maps up to PIXEL_MODE_CELLS cells get one rectangle per cell, larger maps are drawn into a PhotoImage
+        with one block of pixels per cell. Only cells whose color changes are repainted, once per idle time.
+        The mouse wheel zooms around the pointer, dragging pans and a double click fits the map again.
+
+        Args:
+            master: The parent widget
+            solver: The MapSolver of the map
+            frame_size: Width and height of the view in pixels
+        """
         super().__init__(master)
         self.configure(fg_color=FRAME_BG_COLOR,
                        width=frame_size,
                        height=frame_size)
 
         self.solver = solver
-        self.map = copy.deepcopy(solver.map)
-        self.start = solver.start
-        self.goals = copy.deepcopy(solver.goals)
+        self.rows = len(solver.map)
+        self.columns = len(solver.map[0])
         self.frame_size = frame_size
-
-        self.transfer_map()
-        self.original_map = copy.deepcopy(self.map)
+        self.pixels = self.rows * self.columns > PIXEL_MODE_CELLS
+
+        # Colors of the cells by cell ID (y * columns + x), before and during a search
+        self.original_colors = self.cell_colors()
+        self.colors = list(self.original_colors)
+        # Cells whose color differs from the original one, and cells waiting to be repainted
+        self.changed = set()
+        self.dirty = set()
+        self.flush_pending = False
+
+        self.canvas = tk.Canvas(self,
+                                width=frame_size,
+                                height=frame_size,
+                                bg=FRAME_BG_COLOR,
+                                highlightthickness=0,
+                                confine=False)
+        self.canvas.place(x=0, y=0)
+        self.bind_view_controls()
 
         self.calculate_cell_size()
-        self.draw_background()
         self.draw_map()
 
-    def transfer_map(self):
-        for i in range(len(self.map)):
-            for j in range(len(self.map[0])):   
-                if self.map[i][j] == 0:
-                    if j == self.start[0] and i == self.start[1]:
-                        self.map[i][j] = START_COLOR
-                    elif tuple((j, i)) in self.goals:
-                        self.map[i][j] = GOAL_COLOR
-                    else:
-                        self.map[i][j] = EMPTY_COLOR
+    def cell_colors(self) -> list:
+        """
+        Function that finds the color of every cell before any search
 
-                elif self.map[i][j] == 1:
-                    self.map[i][j] = OBSTACLE_COLOR
-
-    def calculate_cell_size(self):
-        self.cell_size = None
-        self.start_x = None
-        self.start_y = None
-        self.map_width = None
-        self.map_height = None
+        Return:
+            colors: A list of colors by cell ID
+        """
+        colors = []
+        for row in self.solver.map:
+            colors.extend(OBSTACLE_COLOR if cell == 1 else EMPTY_COLOR for cell in row)
 
-        map_column = len(self.map[0])
-        map_row = len(self.map)
+        for (x, y), color in [(goal, GOAL_COLOR) for goal in self.solver.goals] + [(self.solver.start, START_COLOR)]:
+            if 0 <= x < self.columns and 0 <= y < self.rows and colors[y * self.columns + x] != OBSTACLE_COLOR:
+                colors[y * self.columns + x] = color
+        return colors
 
-        if (map_row < map_column):
+    def calculate_cell_size(self):
+        map_column = self.columns
+        map_row = self.rows
+
+        if self.pixels:
+            # Whole pixels per cell, the map can be larger than the view and is then panned
+            self.cell_size = max(1, self.frame_size // max(map_row, map_column))
+            self.map_width = self.cell_size * map_column
+            self.map_height = self.cell_size * map_row
+            self.start_x = max(0, (self.frame_size - self.map_width) // 2)
+            self.start_y = max(0, (self.frame_size - self.map_height) // 2)
+        elif (map_row < map_column):
             self.cell_size = self.frame_size / ((map_column + ((map_column+1) / 10)))
             self.map_width = self.frame_size
             self.map_height = self.cell_size * (map_row + (map_row + 1) / 10)
             self.start_x = 0
             self.start_y = (self.frame_size - self.map_height) / 2
-        elif (map_column <= map_row):
+        else:
             self.cell_size = self.frame_size / ((map_row + ((map_row+1) / 10)))
             self.map_height = self.frame_size
             self.map_width = self.cell_size * (map_column + (map_column + 1) / 10)
             self.start_x = (self.frame_size - self.map_width) / 2
             self.start_y = 0
 
-    def draw_background(self):
-        self.background = ctk.CTkFrame(self,
-                                  width=self.map_width,
-                                  height=self.map_height,
-                                  fg_color=MAZE_BG_COLOR)
-        self.background.place(x=self.start_x, y=self.start_y)
-
     def draw_map(self):
-        for row_index, row in enumerate(self.map):
-            for col_index, cell in enumerate(row):
-                x = (col_index + 1) * self.cell_size / 10 + col_index * self.cell_size
-                y = (row_index + 1) * self.cell_size / 10 + row_index * self.cell_size
-
-                node = ctk.CTkFrame(self.background,
-                                    width=self.cell_size,
-                                    height=self.cell_size,
-                                    corner_radius=0,
-                                    fg_color=cell)
-
-                node.place(x=x, y=y)
-
-    def clear_map(self):
-        for widget in self.background.winfo_children():
-            widget.destroy()
-        self.draw_map()
+        """
+        Function that draws the whole map, fitted into the view
+        """
+        canvas = self.canvas
+        canvas.delete("all")
+        canvas.xview_moveto(0)
+        canvas.yview_moveto(0)
+        self.dirty.clear()
+
+        if self.pixels:
+            self.image = tk.PhotoImage(width=self.map_width, height=self.map_height)
+            self.put_image()
+            self.image_item = canvas.create_image(self.start_x, self.start_y, image=self.image, anchor="nw")
+            return
+
+        canvas.create_rectangle(self.start_x, self.start_y,
+                                self.start_x + self.map_width, self.start_y + self.map_height,
+                                fill=MAZE_BG_COLOR, width=0)
+        # Cells are separated by a gap of a tenth of their size, showing the background
+        step = self.cell_size * 1.1
+        gap = self.cell_size / 10
+        self.items = []
+        for index, color in enumerate(self.colors):
+            row_index, col_index = divmod(index, self.columns)
+            x = self.start_x + gap + col_index * step
+            y = self.start_y + gap + row_index * step
+            self.items.append(canvas.create_rectangle(x, y, x + self.cell_size, y + self.cell_size, fill=color, width=0))
+
+    def put_image(self):
+        """
+        Function that writes the color of every cell into the pixel buffer
+        """
+        size = self.cell_size
+        for row_index in range(self.rows):
+            row = self.colors[row_index * self.columns:(row_index + 1) * self.columns]
+            line = "{" + " ".join(color for color in row for _ in range(size)) + "}"
+            self.image.put(" ".join([line] * size), to=(0, row_index * size))
+
+    def set_cell(self, cell: tuple, color: str):
+        """
+        Function that changes the color of a cell, repainting it when Tk is next idle
+
+        Args:
+            cell: Coordinate (x,y) of the cell
+            color: The new color
+        """
+        index = cell[1] * self.columns + cell[0]
+        if self.colors[index] == color:
+            return
+        self.colors[index] = color
+        self.changed.add(index)
+        self.dirty.add(index)
+        if not self.flush_pending:
+            self.flush_pending = True
+            self.after_idle(self.flush)
+
+    def flush(self):
+        """
+        Function that repaints the cells whose color changed since the last repaint
+        """
+        self.flush_pending = False
+        colors = self.colors
+        if self.pixels:
+            size = self.cell_size
+            for index in self.dirty:
+                row_index, col_index = divmod(index, self.columns)
+                x, y = col_index * size, row_index * size
+                self.image.put(colors[index], to=(x, y, x + size, y + size))
+        else:
+            for index in self.dirty:
+                self.canvas.itemconfigure(self.items[index], fill=colors[index])
+        self.dirty.clear()
 
     def refresh_map(self):
-        self.map = copy.deepcopy(self.original_map)
+        """
+        Function that brings back the colors of the map before any search, repainting only the changed cells
+        """
+        for index in self.changed:
+            self.colors[index] = self.original_colors[index]
+            self.dirty.add(index)
+        self.changed.clear()
+        if self.dirty and not self.flush_pending:
+            self.flush_pending = True
+            self.after_idle(self.flush)
+
+    def bind_view_controls(self):
+        canvas = self.canvas
+        canvas.bind("<ButtonPress-1>", lambda event: canvas.scan_mark(event.x, event.y))
+        canvas.bind("<B1-Motion>", lambda event: canvas.scan_dragto(event.x, event.y, gain=1))
+        canvas.bind("<Double-Button-1>", lambda event: self.reset_view())
+        canvas.bind("<MouseWheel>", lambda event: self.zoom(event, event.delta > 0))
+        canvas.bind("<Button-4>", lambda event: self.zoom(event, True))
+        canvas.bind("<Button-5>", lambda event: self.zoom(event, False))
+
+    def zoom(self, event, zoom_in: bool):
+        """
+        Function that zooms the view in or out, keeping the point under the mouse in place
+
+        Args:
+            event: The mouse event
+            zoom_in: Whether to zoom in rather than out
+        """
+        canvas = self.canvas
+        x, y = canvas.canvasx(event.x), canvas.canvasy(event.y)
+        if not self.pixels:
+            factor = ZOOM_STEP if zoom_in else 1 / ZOOM_STEP
+            canvas.scale("all", x, y, factor, factor)
+            return
+
+        # A pixel buffer is rebuilt with twice or half as many pixels per cell
+        largest = max(1, MAX_IMAGE_SIDE // max(self.rows, self.columns))
+        size = min(largest, self.cell_size * 2) if zoom_in else max(1, self.cell_size // 2)
+        if size == self.cell_size:
+            return
+        self.flush()
+        image_x, image_y = canvas.coords(self.image_item)
+        factor = size / self.cell_size
+        self.cell_size = size
+        self.image = tk.PhotoImage(width=size * self.columns, height=size * self.rows)
+        self.put_image()
+        canvas.itemconfigure(self.image_item, image=self.image)
+        canvas.coords(self.image_item, x - (x - image_x) * factor, y - (y - image_y) * factor)
+
+    def reset_view(self):
+        """
+        Function that fits the whole map into the view again
+        """
+        self.calculate_cell_size()
         self.draw_map()
 
 class Map(ctk.CTk):
@@ -118,12 +318,29 @@ class Map(ctk.CTk):
         self.title("Map Solver Visualization")
         self.configure(fg_color=WINDOW_BG_COLOR)  
         self.solver = mapSolver
+
+        # Searches run in a worker thread, queuing events that are drawn here by drain()
+        self.events = queue.Queue(maxsize=EVENT_QUEUE_SIZE)
+        self.feed = None
+        # Cells of a found path, drawn one at a time like the expansions
+        self.path_cells = deque()
+        self.paused = False
+        self.budget = 0.0
+        self.last_drain = time.perf_counter()
+
         self.create_widget()
+        self.protocol("WM_DELETE_WINDOW", self.close)
+        self.after(FRAME_MS, self.drain)
 
     def create_widget(self):                    
         self.map_visualization = GridFrame(self, self.solver, FRAME_SIZE)
         self.map_visualization.place(x=FRAME_X, y=FRAME_Y)
 
+        self.status = ctk.CTkLabel(self,
+                                   text="Choose a search",
+                                   text_color="#ffffff")
+        self.status.place(x=822, y=202)
+
         self.dfs_button = ctk.CTkButton(self,
                                         hover_color="#ffffff", 
                                         command=lambda: self.button_click("dfs"),
@@ -187,38 +404,158 @@ class Map(ctk.CTk):
                                   corner_radius=50)
         self.cus3.place(x=822, y=552)
 
+        self.pause_button = ctk.CTkButton(self,
+                                          hover_color="#ffffff",
+                                          fg_color=BUTTON_BG_COLOR,
+                                          text_color=BUTTON_TEXT_COLOR,
+                                          command=self.toggle_pause,
+                                          text="Pause",
+                                          corner_radius=50)
+        self.pause_button.place(x=822, y=622)
+
+        self.cancel_button = ctk.CTkButton(self,
+                                           hover_color="#ffffff",
+                                           fg_color=BUTTON_BG_COLOR,
+                                           text_color=BUTTON_TEXT_COLOR,
+                                           command=self.cancel_search,
+                                           text="Cancel",
+                                           corner_radius=50)
+        self.cancel_button.place(x=822, y=672)
+
+        self.speed_label = ctk.CTkLabel(self,
+                                        text=f"{DEFAULT_SPEED} cells/s",
+                                        text_color="#ffffff")
+        self.speed_label.place(x=822, y=722)
+
+        self.speed_slider = ctk.CTkSlider(self,
+                                          from_=0,
+                                          to=MAX_SPEED_EXPONENT,
+                                          command=self.change_speed,
+                                          button_color=BUTTON_BG_COLOR)
+        self.speed_slider.set(math.log10(DEFAULT_SPEED))
+        self.speed_slider.place(x=822, y=752)
+
     def button_click(self, search_type: str):
-        self.map_visualization.clear_map()
+        self.play_steps(self.solver.steps(SEARCHES[search_type]))
+
+    def play_steps(self, steps, status: str = "Searching..."):
+        """
+        Function that starts playing the events of a search, run or read in a worker thread
+
+        Args:
+            steps: A generator of search events, such as a step generator or the events of a trace
+            status: Text shown while the events are played
+        """
+        self.cancel_search()
         self.map_visualization.refresh_map()
 
-        if search_type == "dfs":
-            self.solver.depth_first_search(viz=self)
-        elif search_type == "bfs":
-            self.solver.breadth_first_search(viz=self)
-        elif search_type == "gbfs":
-            self.solver.greedy_best_first_search(viz=self)
-        elif search_type == "astar":
-            self.solver.astar(viz=self)
-        elif search_type == "cus1":
-            self.solver.iterative_deepening_search(viz=self)
-        elif search_type == "cus2":
-            self.solver.ida_star(viz=self)
-        elif search_type == "all":
-            self.solver.astar_multi_goals(viz=self)
+        # A new queue for every search, so that events of a cancelled search are never drawn
+        self.events = queue.Queue(maxsize=EVENT_QUEUE_SIZE)
+        self.feed = SearchFeed(self.events)
+        self.path_cells.clear()
+        self.paused = False
+        self.pause_button.configure(text="Pause")
+        self.status.configure(text=status)
+
+        threading.Thread(target=self.run_search, args=(steps, self.feed), daemon=True).start()
+
+    def run_search(self, steps, feed: SearchFeed):
+        """
+        Function that runs a search in the worker thread, queuing its events
+
+        Args:
+            steps: The step generator of the search
+            feed: The SearchFeed of the search
+        """
+        try:
+            for event in steps:
+                feed.put(event)
+        except SearchCancelled:
+            pass
+
+    def drain(self):
+        """
+        Function that draws the queued events at the playback speed, then schedules itself again
+        Events arriving faster than the display are drawn in batches, repainted once per frame
+        """
+        now = time.perf_counter()
+        elapsed, self.last_drain = now - self.last_drain, now
+
+        if (self.feed is not None or self.path_cells) and not self.paused:
+            exponent = self.speed_slider.get()
+            speed = math.inf if exponent >= MAX_SPEED_EXPONENT else 10 ** exponent
+            self.budget = min(self.budget + speed * elapsed, EVENT_QUEUE_SIZE)
+            while self.budget >= 1:
+                if self.path_cells:
+                    self.update_map(self.path_cells.popleft(), color=FINAL_PATH_COLOR)
+                    self.budget -= 1
+                    continue
+                try:
+                    event = self.events.get_nowait()
+                except queue.Empty:
+                    # Time spent waiting for the search is not saved up for a burst later
+                    self.budget = 0.0
+                    break
+                # Only expansions and path cells take playback time
+                if type(event) is Expand:
+                    self.budget -= 1
+                self.play(event)
+
+        self.after(FRAME_MS, self.drain)
+
+    def play(self, event):
+        """
+        Function that draws one event of a search
+
+        Args:
+            event: An event of searchSteps
+        """
+        kind = type(event)
+        if kind is Expand:
+            self.update_map(event.cell)
+        elif kind is Enqueue:
+            self.update_map(event.cell, color=FRONTIER_COLOR)
+        elif kind is ThresholdRaise:
+            if event.restart:
+                self.reset_map()
+        elif kind is PathFound:
+            self.path_cells.extend(cell for cell, _ in event.path[:-1])
+        elif kind is Finished:
+            if event.path is None:
+                self.status.configure(text=f"No path, {event.nodes} nodes")
+            else:
+                self.status.configure(text=f"{len(event.path) - 1} moves, {event.nodes} nodes")
+            self.feed = None
+
+    def toggle_pause(self):
+        self.paused = not self.paused
+        self.pause_button.configure(text="Resume" if self.paused else "Pause")
+
+    def cancel_search(self):
+        # The search stops at its next event, its queue is dropped with it
+        self.path_cells.clear()
+        if self.feed is not None:
+            self.feed.cancel()
+            self.feed = None
+            self.status.configure(text="Cancelled")
+
+    def change_speed(self, exponent: float):
+        if exponent >= MAX_SPEED_EXPONENT:
+            self.speed_label.configure(text="Unlimited")
+        else:
+            self.speed_label.configure(text=f"{10 ** exponent:.0f} cells/s")
+
+    def close(self):
+        self.cancel_search()
+        self.destroy()
 
     def update_map(self, cell, color=PATH_COLOR):
         if cell != self.solver.start and cell not in self.solver.goals:
-            self.map_visualization.clear_map()
-            self.map_visualization.map[cell[1]][cell[0]] = color
-            self.map_visualization.draw_map()
+            self.map_visualization.set_cell(cell, color)
 
     def show_path(self, path):
-        path_coordinates = [cell for cell, _ in path[:-1]]
-
-        for cell in path_coordinates:
+        for cell, _ in path[:-1]:
             self.update_map(cell, color=FINAL_PATH_COLOR)
-            self.update_idletasks()
-            self.after(300)
 
     def reset_map(self):
-        self.map_visualization.refresh_map()
\ No newline at end of file
+        self.map_visualization.refresh_map()
@@ -0,0 +1,296 @@
+import argparse
+import gzip
+import os
+import random
+
+# Number of cells of a room side, and of the rows between two corridor walls, when not given
+ROOM_SIZE = 8
+CORRIDOR_SPACING = 2
+
+# Rectangles tried per cell of the map before random_rectangles gives up on reaching its density
+ATTEMPTS_PER_CELL = 16
+
+def far_corner(rows: int, columns: int, even: bool = False) -> tuple:
+    """
+    Function that finds the corner opposite to (0,0)
+
+    Args:
+        rows: Number of rows of the map
+        columns: Number of columns of the map
+        even: Whether both coordinates must be even, as in the cells of a maze
+    Return:
+        corner: Coordinate (x,y) of the corner
+    """
+    x, y = columns - 1, rows - 1
+    if even:
+        x, y = x - x % 2, y - y % 2
+    return x, y
+
+def split_line(x: int, y: int, length: int, vertical: bool, gaps: set) -> list:
+    """
+    Function that cuts a wall line of width 1 into rectangles around its gaps
+
+    Args:
+        x: Column where the line starts
+        y: Row where the line starts
+        length: Number of cells of the line
+        vertical: Whether the line goes down instead of right
+        gaps: Offsets along the line left open
+    Return:
+        walls: A list of (x,y,width,height) rectangles
+    """
+    walls = []
+    begin = 0
+    for offset in sorted(gaps) + [length]:
+        if offset > begin:
+            walls.append((x, y + begin, 1, offset - begin) if vertical else (x + begin, y, offset - begin, 1))
+        begin = offset + 1
+    return walls
+
+def open_field(rows: int, columns: int, generator: random.Random) -> tuple[tuple, set, list]:
+    """
+    Function that creates a map without walls
+
+    Args:
+        rows: Number of rows of the map
+        columns: Number of columns of the map
+        generator: Source of randomness, unused
+    Return:
+        start: Coordinate of the starting point
+        goals: A set including the opposite corner
+        walls: An empty list
+    """
+    return (0, 0), {far_corner(rows, columns)}, []
+
+def random_rectangles(rows: int, columns: int, generator: random.Random, density: float = 0.2, max_side: int = 8) -> tuple[tuple, set, list]:
+    """
+    Function that scatters random rectangles until they cover a share of the map
+    Rectangles covering the start or the goal are skipped, but nothing keeps them connected.
+    The share is capped at every cell but the start and the goal, and at most ATTEMPTS_PER_CELL rectangles
+    per cell are tried, so a density close to 1 may be reached only approximately
+
+    Args:
+        rows: Number of rows of the map
+        columns: Number of columns of the map
+        generator: Source of randomness
+        density: Share of the cells to cover with walls, up to 1
+        max_side: Largest width and height of a rectangle
+    Return:
+        start: Coordinate of the starting point
+        goals: A set including the opposite corner
+        walls: A list of (x,y,width,height) rectangles
+    """
+    start, goal = (0, 0), far_corner(rows, columns)
+    covered = [bytearray(columns) for _ in range(rows)]
+    remaining = min(int(density * rows * columns), rows * columns - len({start, goal}))
+    walls = []
+    for _ in range(ATTEMPTS_PER_CELL * rows * columns):
+        if remaining <= 0:
+            break
+        width = generator.randint(1, min(max_side, columns))
+        height = generator.randint(1, min(max_side, rows))
+        x = generator.randrange(columns - width + 1)
+        y = generator.randrange(rows - height + 1)
+        if any(x <= point_x < x + width and y <= point_y < y + height for point_x, point_y in (start, goal)):
+            continue
+
+        walls.append((x, y, width, height))
+        wall = b"\x01" * width
+        for row in covered[y:y + height]:
+            remaining -= row.count(0, x, x + width)
+            row[x:x + width] = wall
+    return start, {goal}, walls
+
+def recursive_division(rows: int, columns: int, generator: random.Random) -> tuple[tuple, set, list]:
+    """
+    Function that creates a maze by recursive division, with corridors of width 1
+    Walls stand on odd coordinates and gaps on even ones, so every cell with even coordinates is reachable
+
+    Args:
+        rows: Number of rows of the map
+        columns: Number of columns of the map
+        generator: Source of randomness
+    Return:
+        start: Coordinate of the starting point
+        goals: A set including the farthest corner with even coordinates
+        walls: A list of (x,y,width,height) rectangles
+    """
+    walls = []
+    # Chambers to divide as (x, y, width, height), always starting on even coordinates
+    chambers = [(0, 0, columns, rows)]
+    while chambers:
+        x, y, width, height = chambers.pop()
+        if width < 3 and height < 3:
+            continue
+        vertical = height < 3 or (width >= 3 and (width > height or (width == height and generator.random() < 0.5)))
+        if vertical:
+            wall_x = x + 1 + 2 * generator.randrange((width - 1) // 2)
+            walls.extend(split_line(wall_x, y, height, True, {2 * generator.randrange((height + 1) // 2)}))
+            chambers.append((x, y, wall_x - x, height))
+            chambers.append((wall_x + 1, y, x + width - wall_x - 1, height))
+        else:
+            wall_y = y + 1 + 2 * generator.randrange((height - 1) // 2)
+            walls.extend(split_line(x, wall_y, width, False, {2 * generator.randrange((width + 1) // 2)}))
+            chambers.append((x, y, width, wall_y - y))
+            chambers.append((x, wall_y + 1, width, y + height - wall_y - 1))
+    return (0, 0), {far_corner(rows, columns, even=True)}, walls
+
+def rooms_and_doors(rows: int, columns: int, generator: random.Random, room_size: int = ROOM_SIZE) -> tuple[tuple, set, list]:
+    """
+    Function that splits the map into a grid of rooms, with one door between each pair of neighboring rooms
+
+    Args:
+        rows: Number of rows of the map
+        columns: Number of columns of the map
+        generator: Source of randomness
+        room_size: Number of cells between two walls
+    Return:
+        start: Coordinate of the starting point
+        goals: A set including the opposite corner
+        walls: A list of (x,y,width,height) rectangles
+    """
+    step = room_size + 1
+    # Walls never fall on the last row or column, so the opposite corner stays open
+    wall_columns = list(range(room_size, columns - 1, step))
+    wall_rows = list(range(room_size, rows - 1, step))
+
+    walls = []
+    for wall_x in wall_columns:
+        gaps = set()
+        for begin in range(0, rows, step):
+            end = min(begin + room_size, rows)
+            gaps.add(generator.randrange(begin, end))
+        walls.extend(split_line(wall_x, 0, rows, True, gaps))
+    for wall_y in wall_rows:
+        # Cells where a wall column crosses the row are already walls
+        gaps = set(wall_columns)
+        for begin in range(0, columns, step):
+            end = min(begin + room_size, columns)
+            gaps.add(generator.randrange(begin, end))
+        walls.extend(split_line(0, wall_y, columns, False, gaps))
+    return (0, 0), {far_corner(rows, columns)}, walls
+
+def corridors(rows: int, columns: int, generator: random.Random, spacing: int = CORRIDOR_SPACING, shortcuts: float = 0.1) -> tuple[tuple, set, list]:
+    """
+    Function that creates a winding corridor, with walls across the map opening at alternate ends
+    Some walls also get a shortcut at a random place, so that the searches have choices to make
+
+    Args:
+        rows: Number of rows of the map
+        columns: Number of columns of the map
+        generator: Source of randomness
+        spacing: Distance between two walls, the corridors are spacing - 1 rows wide
+        shortcuts: Chance of a wall to get a second opening
+    Return:
+        start: Coordinate of the starting point
+        goals: A set including the opposite corner
+        walls: A list of (x,y,width,height) rectangles
+    """
+    walls = []
+    for index, wall_y in enumerate(range(spacing - 1, rows - 1, spacing)):
+        gaps = {columns - 1 if index % 2 == 0 else 0}
+        if generator.random() < shortcuts:
+            gaps.add(generator.randrange(columns))
+        walls.extend(split_line(0, wall_y, columns, False, gaps))
+    return (0, 0), {far_corner(rows, columns)}, walls
+
+# Generators by name, as used on the command line
+GENERATORS = {
+    "open": open_field,
+    "rectangles": random_rectangles,
+    "maze": recursive_division,
+    "rooms": rooms_and_doors,
+    "corridors": corridors,
+}
+
+def generate_map(kind: str, rows: int, columns: int, seed: int = None, **options) -> tuple[tuple, set, list]:
+    """
+    Function that creates a map, always the same one for the same seed
+
+    Args:
+        kind: Name of the generator, one of GENERATORS
+        rows: Number of rows of the map
+        columns: Number of columns of the map
+        seed: Seed of the randomness
+        options: Keyword arguments of the generator, such as density or room_size
+    Return:
+        start: Coordinate of the starting point
+        goals: A set of goal points
+        walls: A list of (x,y,width,height) rectangles
+    """
+    return GENERATORS[kind](rows, columns, random.Random(seed), **options)
+
+def format_map(rows: int, columns: int, start: tuple, goals: set, walls: list) -> str:
+    """
+    Function that writes a map in the format read by parse_grid
+
+    Args:
+        rows: Number of rows of the map
+        columns: Number of columns of the map
+        start: Coordinate of the starting point
+        goals: A set of goal points
+        walls: A list of (x,y,width,height) rectangles
+    Return:
+        text: The content of the map file
+    """
+    lines = [f"[{rows},{columns}]", f"({start[0]},{start[1]})", " | ".join(f"({x},{y})" for x, y in sorted(goals))]
+    lines.extend(f"({x},{y},{width},{height})" for x, y, width, height in walls)
+    return "\n".join(lines) + "\n"
+
+def write_map(filename: str, rows: int, columns: int, start: tuple, goals: set, walls: list):
+    """
+    Function that saves a map file, gzip compressed if its name ends with .gz
+
+    Args:
+        filename: Path of the map file
+        rows: Number of rows of the map
+        columns: Number of columns of the map
+        start: Coordinate of the starting point
+        goals: A set of goal points
+        walls: A list of (x,y,width,height) rectangles
+    """
+    text = format_map(rows, columns, start, goals, walls)
+    opener = gzip.open if filename.endswith(".gz") else open
+    with opener(filename, "wt") as file:
+        file.write(text)
+
+def sweep_sizes(min_exponent: int = 2, max_exponent: int = 7) -> list:
+    """
+    Function that lists square map sizes growing by a factor of 10 in cells
+
+    Args:
+        min_exponent: The smallest map has about 10 ** min_exponent cells
+        max_exponent: The largest map has about 10 ** max_exponent cells
+    Return:
+        sizes: A list of (rows, columns) pairs
+    """
+    sides = [round(10 ** (exponent / 2)) for exponent in range(min_exponent, max_exponent + 1)]
+    return [(side, side) for side in sides]
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate map files for scaling benchmarks")
+    parser.add_argument("kind", choices=GENERATORS, help="layout of the map")
+    parser.add_argument("output", help="map file to write, gzip compressed if it ends with .gz, or a directory with --sweep")
+    parser.add_argument("--rows", type=int, default=100, help="number of rows")
+    parser.add_argument("--columns", type=int, default=100, help="number of columns")
+    parser.add_argument("--seed", type=int, help="seed of the randomness, the same seed gives the same map")
+    parser.add_argument("--density", type=float, help="share of the cells covered by walls, with rectangles")
+    parser.add_argument("--room-size", type=int, help="number of cells between two walls, with rooms")
+    parser.add_argument("--spacing", type=int, help="distance between two walls, with corridors")
+    parser.add_argument("--sweep", type=int, metavar="MAX_EXPONENT", help="write square maps from 10^2 to 10^MAX_EXPONENT cells into the output directory")
+    args = parser.parse_args()
+
+    options = {name: value for name, value in (("density", args.density), ("room_size", args.room_size), ("spacing", args.spacing)) if value is not None}
+    if args.sweep:
+        os.makedirs(args.output, exist_ok=True)
+        jobs = [(os.path.join(args.output, f"{args.kind}_{rows * columns}.txt.gz"), rows, columns) for rows, columns in sweep_sizes(2, args.sweep)]
+    else:
+        jobs = [(args.output, args.rows, args.columns)]
+
+    for filename, rows, columns in jobs:
+        start, goals, walls = generate_map(args.kind, rows, columns, args.seed, **options)
+        write_map(filename, rows, columns, start, goals, walls)
+        print(f"{filename}: {rows}x{columns}, {len(walls)} walls")
+
+if __name__ == "__main__":
+    main()
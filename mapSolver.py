@@ -1,393 +1,1398 @@
-from collections import deque
+import functools
+import inspect
+from array import array
+from collections import OrderedDict, deque
+from frontier import PriorityFrontier
+from gridGraph import GridGraph, ManhattanDistance, DIRECTIONS, INFINITY, UP, LEFT, DOWN, RIGHT
+from hierarchicalSolver import HierarchicalSolver
+from searchStats import CountingFrontier, CountingQueue, CountingStack, CountingView
+from searchSteps import Expand, Enqueue, ThresholdRaise, Finished, found, run_steps, visualize, result_steps
+from solverCache import map_fingerprint
+from searchTrace import record_trace
+
+# Search methods by the name used in the command line
+METHODS = {
+    "DFS": "depth_first_search",
+    "BFS": "breadth_first_search",
+    "GBFS": "greedy_best_first_search",
+    "AS": "astar",
+    "CUS1": "iterative_deepening_search",
+    "CUS2": "ida_star",
+    "BIBFS": "bidirectional_breadth_first_search",
+    "BIAS": "bidirectional_astar",
+    "JPS": "jump_point_search",
+    "HPA": "hierarchical_search",
+    "ALL": "held_karp_multi_goals",
+}
+
+# Step generator of each search method, the single implementation of the search: the method runs it
+# without events, and its per-node events and counters are only made behind one flag of the generator
+STEPS = {
+    "depth_first_search": "depth_first_steps",
+    "breadth_first_search": "breadth_first_steps",
+    "greedy_best_first_search": "greedy_best_first_steps",
+    "astar": "astar_steps",
+    "iterative_deepening_search": "iterative_deepening_steps",
+    "ida_star": "ida_star_steps",
+    "bidirectional_breadth_first_search": "bidirectional_breadth_first_steps",
+    "bidirectional_astar": "bidirectional_astar_steps",
+    "jump_point_search": "jump_point_steps",
+}
+
+# Largest number of goals whose visiting order is solved exactly in ALL mode
+HELD_KARP_LIMIT = 15
+
+# Number of heuristic fields a solver keeps, a service reusing one solver for many goal sets evicts the oldest
+HEURISTIC_FIELDS = 8
+
+# Arguments receiving output of a search besides its result, a search given any of them skips the cache
+OUTPUT_ARGUMENTS = ("viz", "iterations", "stats")
+
+def cached(search):
+    """
+    Decorator that looks the result of a search up in the solver's cache before running it
+    Searches shown in the visualizer or asked for iteration counts or statistics always run,
+    and a search given a SearchStats has the wall time of its phases measured
+
+    Args:
+        search: A search method of MapSolver
+    Return:
+        wrapper: The search method going through the cache
+    """
+    missing = object()
+    signature = inspect.signature(search)
+
+    @functools.wraps(search)
+    def wrapper(self, *args, **kwargs):
+        # Arguments are looked up by name whether they were passed by position, by keyword or left to their default
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        arguments = bound.arguments
+        del arguments["self"]
+        stats = arguments.get("stats")
+        if stats is not None:
+            stats.begin(self.graph.size)
+            try:
+                return search(self, *args, **kwargs)
+            finally:
+                stats.end()
+        if self.cache is None or any(arguments.get(name) is not None for name in OUTPUT_ARGUMENTS):
+            return search(self, *args, **kwargs)
+
+        if self.fingerprint is None:
+            self.fingerprint = map_fingerprint(self.graph)
+        key = self.cache.key(self.fingerprint, self.start, self.goals, search.__name__, self.directions_only, sorted(arguments.items()))
+        result = self.cache.get(key, missing)
+        if result is missing:
+            result = search(self, *args, **kwargs)
+            self.cache.put(key, result)
+        return result
+
+    return wrapper
 
 class MapSolver:
-    def __init__(self, map: list, start: tuple, goals: set):
+    def __init__(self, map: list, start: tuple, goals: set, directions_only: bool = False, cache=None,
+                 graph: GridGraph = None):
         """
         Initializes the MapSolver with a given map.
 
         Args:
-            map: A 2D array representing the map.
+            map: A 2D array representing the map, None if graph is given.
             start: The starting point on the map.
             goals: A set of all possible goal points on the map.
+            directions_only: Return paths as bytes of direction codes (0 up, 1 left, 2 down, 3 right)
+                instead of a list of (cell, direction) tuples.
+            cache: A SolverCache shared by solvers to reuse the results of earlier searches.
+            graph: A GridGraph of the map built elsewhere, such as one read from shared memory,
+                used instead of building one from map.
         """
         self.map = map
         self.start = start
         self.goals = goals
-
-    def depth_first_search(self, viz=None) -> tuple[int, list]:
+        self.directions_only = directions_only
+        self.cache = cache
+        self.fingerprint = None
+        self.graph = GridGraph(map) if graph is None else graph
+        self.heuristic_fields = OrderedDict()
+        self.hierarchy = None
+        if not self.graph.in_map(start):
+            raise ValueError(f"Start {start} is outside the map")
+
+    @cached
+    def depth_first_search(self, viz=None, stats=None) -> tuple[int, list]:
         """
         Function that solves the map with Depth First Search(DFS)
 
         Args:
             viz: an instance of Map class
+            stats: Optional SearchStats receiving the counters of the search
         Return:
             nodes: Number of nodes traversed
             path: A list including all moves to a goal. Return None if no goal is reachable
         """
-        visited = set()
-        frontier = [self.start]
-        parent = {}
-        parent[self.start] = (None, None)
+        if viz:
+            return visualize(self.depth_first_steps(), viz)
+        return run_steps(self.depth_first_steps(events=False, stats=stats))
+
+    def depth_first_steps(self, events: bool = True, stats=None):
+        """
+        Function that runs Depth First Search(DFS) step by step
+
+        Args:
+            events: Yield an Expand event for every cell expanded and an Enqueue event for every cell pushed
+            stats: Optional SearchStats receiving the counters of the search
+        Yield:
+            events: The events of the search, then PathFound if a goal is reached and Finished
+        """
+        graph = self.graph
+        offsets, targets, moves = graph.offsets, graph.targets, graph.moves
+        start = graph.cell_id(self.start)
+        goals = graph.cell_ids(self.goals)
+
+        visited = bytearray(graph.size)
+        frontier = [start]
+        parent, move = graph.parent_store()
+        parent[start] = start
+        observed = events or stats is not None
+        if stats is not None:
+            frontier = CountingStack(stats, frontier)
+            targets = CountingView(targets, stats, "generated")
+            stats.phase("search")
 
         while frontier:
             cell = frontier.pop()
-            if cell not in visited:
-                visited.add(cell)
-                if viz:
-                    viz.update_map(cell)
-                    viz.update_idletasks()
-                    viz.after(50)
-
-                if self.goal_meet(cell, self.goals):
-                    path = self.parse_path(self.start, cell, parent)
-                    if viz:
-                        viz.show_path(path)
-                    return len(parent), path
-                
-                neighbors = self.get_neighbors(cell)
-                # Reverse the order of neighbors to ensure the order of execution is up, left, down, right
-                for neighbor in reversed(neighbors):
-                    if neighbor[0] not in visited:
-                        frontier.append(neighbor[0])
-                        parent[neighbor[0]] = (cell, neighbor[1])
-
-        return len(parent), None
+            if not visited[cell]:
+                visited[cell] = 1
+                if observed:
+                    if stats is not None:
+                        stats.expand(cell, len(frontier))
+                    if events:
+                        yield Expand(graph.cell(cell))
+
+                if cell in goals:
+                    if stats is not None:
+                        stats.phase("path")
+                    yield from found(self, start, graph.trace_moves(parent, move, start, cell), graph.reached(parent))
+                    return
 
-    def breadth_first_search(self, viz=None) -> tuple[int, list]:
+                # Reverse the order of neighbors to ensure the order of execution is up, left, down, right
+                for k in range(offsets[cell + 1] - 1, offsets[cell] - 1, -1):
+                    neighbor = targets[k]
+                    if not visited[neighbor]:
+                        frontier.append(neighbor)
+                        parent[neighbor] = cell
+                        move[neighbor] = moves[k]
+                        if events:
+                            yield Enqueue(graph.cell(neighbor))
+
+        yield Finished(graph.reached(parent), None)
+
+    @cached
+    def breadth_first_search(self, viz=None, stats=None) -> tuple[int, list]:
         """
         Function that solves the map with Breath First Search(BFS)
 
         Args:
             viz: an instance of Map class
+            stats: Optional SearchStats receiving the counters of the search
         Return:
             nodes: Number of nodes traversed
             path: A list including all moves to a goal. Return None if no goal is reachable
         """
-        visited = set()             
-        frontier = deque([self.start]) 
-        parent = {}
+        if viz:
+            return visualize(self.breadth_first_steps(), viz)
+        return run_steps(self.breadth_first_steps(events=False, stats=stats))
 
-        parent[self.start] = (None, None)
+    def breadth_first_steps(self, events: bool = True, stats=None):
+        """
+        Function that runs Breath First Search(BFS) step by step
+
+        Args:
+            events: Yield an Expand event for every cell expanded and an Enqueue event for every cell discovered
+            stats: Optional SearchStats receiving the counters of the search
+        Yield:
+            events: The events of the search, then PathFound if a goal is reached and Finished
+        """
+        graph = self.graph
+        offsets, targets, moves = graph.offsets, graph.targets, graph.moves
+        start = graph.cell_id(self.start)
+        goals = graph.cell_ids(self.goals)
+
+        # Cells are marked as discovered when they are enqueued, so each cell enters the frontier once
+        discovered = bytearray(graph.size)
+        frontier = deque([start])
+        parent, move = graph.parent_store()
+
+        discovered[start] = 1
+        parent[start] = start
+        observed = events or stats is not None
+        if stats is not None:
+            frontier = CountingQueue(stats, frontier)
+            targets = CountingView(targets, stats, "generated")
+            stats.phase("search")
 
         while frontier:
             cell = frontier.popleft()
-            if cell not in visited: 
-                visited.add(cell)
-                if viz:
-                    viz.update_map(cell)
-                    viz.update_idletasks()
-                    viz.after(50)
-
-                if self.goal_meet(cell, self.goals):
-                    path = self.parse_path(self.start, cell, parent)
-                    if viz:
-                        viz.show_path(path)
-                    return len(parent), path
-                
-                neighbors = self.get_neighbors(cell)
-                for neighbor in neighbors:
-                    if neighbor[0] not in visited and neighbor[0] not in frontier:
-                        # Avoid duplicate to ensure shortest path found (main goal of BFS)
-                        parent[neighbor[0]] = (cell, neighbor[1])
-                        frontier.append(neighbor[0])
-        return len(parent), None
-
-    def greedy_best_first_search(self, viz=None) -> tuple[int, list]:
+            if observed:
+                if stats is not None:
+                    stats.expand(cell, len(frontier))
+                if events:
+                    yield Expand(graph.cell(cell))
+
+            if cell in goals:
+                if stats is not None:
+                    stats.phase("path")
+                yield from found(self, start, graph.trace_moves(parent, move, start, cell), graph.reached(parent))
+                return
+
+            for k in range(offsets[cell], offsets[cell + 1]):
+                neighbor = targets[k]
+                if not discovered[neighbor]:
+                    # Avoid duplicate to ensure shortest path found (main goal of BFS)
+                    discovered[neighbor] = 1
+                    parent[neighbor] = cell
+                    move[neighbor] = moves[k]
+                    frontier.append(neighbor)
+                    if events:
+                        yield Enqueue(graph.cell(neighbor))
+
+        yield Finished(graph.reached(parent), None)
+
+    @cached
+    def greedy_best_first_search(self, viz=None, stats=None) -> tuple[int, list]:
         """
         Function that solves the map with Greedy Best First Search(GBFS)
 
         Args:
             viz: an instance of Map class
+            stats: Optional SearchStats receiving the counters of the search
         Return:
             nodes: Number of nodes traversed
             path: A list including all moves to a goal. Return None if no goal is reachable
         """
-        visited = set()
-        frontier = {}
-        parent = {}
+        if viz:
+            return visualize(self.greedy_best_first_steps(), viz)
+        return run_steps(self.greedy_best_first_steps(events=False, stats=stats))
 
-        frontier[self.start] = self.heuristic_cost(self.start, self.goals)
-        parent[self.start] = (None, None)
+    def greedy_best_first_steps(self, events: bool = True, stats=None):
+        """
+        Function that runs Greedy Best First Search(GBFS) step by step
+
+        Args:
+            events: Yield an Expand event for every cell expanded and an Enqueue event for every cell queued
+            stats: Optional SearchStats receiving the counters of the search
+        Yield:
+            events: The events of the search, then PathFound if a goal is reached and Finished
+        """
+        graph = self.graph
+        offsets, targets, moves = graph.offsets, graph.targets, graph.moves
+        start = graph.cell_id(self.start)
+        goals = graph.cell_ids(self.goals)
+        heuristic = self.heuristic_field(self.goals)
+
+        visited = bytearray(graph.size)
+        frontier = PriorityFrontier()
+        parent, move = graph.parent_store()
+        observed = events or stats is not None
+        if stats is not None:
+            frontier = CountingFrontier(stats)
+            targets = CountingView(targets, stats, "generated")
+            heuristic = CountingView(heuristic, stats, "heuristic_evaluations")
+            stats.phase("search")
+
+        frontier[start] = heuristic[start]
+        parent[start] = start
 
         while frontier:
             # Get the key with the lowest cost, if similar then choose the first appear cell
-            cell = min(frontier, key=frontier.get)
-            del frontier[cell]
-            if cell not in visited:
-                visited.add(cell)
-                if viz:
-                    viz.update_map(cell)
-                    viz.update_idletasks()
-                    viz.after(50)
-
-                if self.goal_meet(cell, self.goals):
-                    path = self.parse_path(self.start, cell, parent)
-                    if viz:
-                        viz.show_path(path)
-                    return len(parent), path
-
-                neighbors = self.get_neighbors(cell)
-                for neighbor in neighbors:
-                    if neighbor[0] not in visited and neighbor[0] not in frontier:                    
-                        cost = self.heuristic_cost(neighbor[0], self.goals)
-                        frontier[neighbor[0]] = cost
-                        parent[neighbor[0]] = (cell, neighbor[1])
-
-        return len(parent), None
-
-    def astar(self, viz=None) -> tuple[int, list]:
+            cell, _ = frontier.pop()
+            if not visited[cell]:
+                visited[cell] = 1
+                if observed:
+                    if stats is not None:
+                        stats.expand(cell, len(frontier))
+                    if events:
+                        yield Expand(graph.cell(cell))
+
+                if cell in goals:
+                    if stats is not None:
+                        stats.phase("path")
+                    yield from found(self, start, graph.trace_moves(parent, move, start, cell), graph.reached(parent))
+                    return
+
+                for k in range(offsets[cell], offsets[cell + 1]):
+                    neighbor = targets[k]
+                    if not visited[neighbor] and neighbor not in frontier:
+                        frontier[neighbor] = heuristic[neighbor]
+                        parent[neighbor] = cell
+                        move[neighbor] = moves[k]
+                        if events:
+                            yield Enqueue(graph.cell(neighbor))
+
+        yield Finished(graph.reached(parent), None)
+
+    @cached
+    def astar(self, viz=None, stats=None) -> tuple[int, list]:
         """
         Function that solves the map with A* Search
 
         Args:
             viz: an instance of Map class
+            stats: Optional SearchStats receiving the counters of the search
         Return:
             nodes: Number of nodes traversed
             path: A list including all moves to a goal. Return None if no goal is reachable
         """
-        frontier = {}               
-        visited = {}              
-        parent = {}                 
+        if viz:
+            return visualize(self.astar_steps(), viz)
+        return run_steps(self.astar_steps(events=False, stats=stats))
 
-        frontier[self.start] = self.heuristic_cost(self.start, self.goals)
-        parent[self.start] = (None, None)
+    def astar_steps(self, events: bool = True, stats=None):
+        """
+        Function that runs A* Search step by step
+
+        Args:
+            events: Yield an Expand event for every cell expanded and an Enqueue event for every cell queued
+                or queued again at a lower cost
+            stats: Optional SearchStats receiving the counters of the search
+        Yield:
+            events: The events of the search, then PathFound if a goal is reached and Finished
+        """
+        graph = self.graph
+        offsets, targets, moves = graph.offsets, graph.targets, graph.moves
+        start = graph.cell_id(self.start)
+        goals = graph.cell_ids(self.goals)
+        heuristic = self.heuristic_field(self.goals)
+
+        frontier = PriorityFrontier()
+        visited = {}
+        parent, move = graph.parent_store()
+        observed = events or stats is not None
+        if stats is not None:
+            frontier = CountingFrontier(stats)
+            targets = CountingView(targets, stats, "generated")
+            heuristic = CountingView(heuristic, stats, "heuristic_evaluations")
+            stats.phase("search")
+
+        frontier[start] = heuristic[start]
+        parent[start] = start
 
         while frontier:
-            cell = min(frontier, key=frontier.get)
-            current_cell_cost = frontier[cell]
-            del frontier[cell]
+            cell, current_cell_cost = frontier.pop()
             visited[cell] = current_cell_cost
-
-            if viz:
-                viz.update_map(cell)
-                viz.update_idletasks()
-                viz.after(50)
-
-            if self.goal_meet(cell, self.goals):
-                path = self.parse_path(self.start, cell, parent)
-                if viz:
-                    viz.show_path(path)
-                return len(parent), path
-            
-            neighbors = self.get_neighbors(cell)
-            for neighbor in neighbors:
-                g_cost = current_cell_cost - self.heuristic_cost(cell, self.goals) + self.heuristic_cost(neighbor[0], [cell])
-                h_cost = self.heuristic_cost(neighbor[0], self.goals)
-                f_cost = g_cost + h_cost
-
-                if neighbor[0] in visited:
-                    if f_cost < visited[neighbor[0]]:
-                        del visited[neighbor[0]]
-                        frontier[neighbor[0]] = f_cost
-                        parent[neighbor[0]] = (cell, neighbor[1])
-                elif neighbor[0] in frontier:
-                    if f_cost < frontier[neighbor[0]]:
-                        frontier[neighbor[0]] = f_cost
-                        parent[neighbor[0]] = (cell, neighbor[1])
-                else:
-                    frontier[neighbor[0]] = f_cost
-                    parent[neighbor[0]] = (cell, neighbor[1])
-
-        return len(parent), None
-    
-    def iterative_deepening_search(self, viz=None) -> tuple[int, list]:
+            if observed:
+                if stats is not None:
+                    stats.expand(cell, len(frontier))
+                if events:
+                    yield Expand(graph.cell(cell))
+
+            if cell in goals:
+                if stats is not None:
+                    stats.phase("path")
+                yield from found(self, start, graph.trace_moves(parent, move, start, cell), graph.reached(parent))
+                return
+
+            # Every move costs 1
+            g_cost = current_cell_cost - heuristic[cell] + 1
+            for k in range(offsets[cell], offsets[cell + 1]):
+                neighbor = targets[k]
+                f_cost = g_cost + heuristic[neighbor]
+
+                if neighbor in visited:
+                    if f_cost >= visited[neighbor]:
+                        continue
+                    del visited[neighbor]
+                elif neighbor in frontier and f_cost >= frontier[neighbor]:
+                    continue
+                frontier[neighbor] = f_cost
+                parent[neighbor] = cell
+                move[neighbor] = moves[k]
+                if events:
+                    yield Enqueue(graph.cell(neighbor))
+
+        yield Finished(graph.reached(parent), None)
+
+    @cached
+    def iterative_deepening_search(self, viz=None, iterations: list = None, stats=None) -> tuple[int, list]:
         """
         Function that solves the map with Iterative Deepening Search
+        Each iteration runs a Depth First Search with an explicit stack, one level deeper than the last one.
+        The best depth reached for every cell is kept between iterations: a cell is only explored again when it is
+        reached at a lower depth, and each iteration resumes from the cells cut off at the depth limit of the last one
+        instead of starting again from the start. A cell cut off at the limit is expanded by the next iteration only,
+        so every cell is expanded once. The path found is a shortest one.
 
         Args:
             viz: an instance of Map class
+            iterations: Optional list receiving the number of nodes expanded by each iteration
+            stats: Optional SearchStats receiving the counters of the search
         Return:
-            nodes: Number of nodes traversed
+            nodes: Number of nodes expanded by all iterations
             path: A list including all moves to a goal. Return None if no goal is reachable
         """
-        def limited_search(cell: tuple, goals: set, depth: int) -> tuple:
-            """
-            This function recursively performs a Depth-First Search (DFS) to find a goal within a given depth limit.
-
-            Args:
-                cell: The current cell being explored, represented as a tuple of coordinates.
-                goals: A set of all possible goal cells.
-                depth: The current depth of the search, used to limit the search depth.
+        if viz:
+            return visualize(self.iterative_deepening_steps(iterations=iterations), viz)
+        return run_steps(self.iterative_deepening_steps(events=False, stats=stats, iterations=iterations))
 
-            Returns:
-                goal: The coordinate of a reachable goal cell if found, otherwise returns None.
-                expandable: A boolean indicating if any unvisited neighbors exist at this depth.
-            """
-            nonlocal expandable
-            if cell in visited:
-                return None
-            
-            visited.add(cell)
-            if viz:
-                viz.update_map(cell)
-                viz.update_idletasks()
-                viz.after(50)
-
-            if self.goal_meet(cell, goals):
-                return cell
-
-            neighbors = self.get_neighbors(cell)
-            if depth == 0:
-                expandable = expandable or any(neighbor[0] not in visited for neighbor in neighbors)
-                return None
-            for neighbor in neighbors:
-                if neighbor[0] not in visited:
-                    parent[neighbor[0]] = (cell, neighbor[1])
-                    goal = limited_search(neighbor[0], goals, depth-1)
-                    if goal:
-                        return goal
-            return None
-
-        depth = 0
-        while True:
-            parent = {}
-            visited = set()
-            parent[self.start] = (None, None)
-
-            expandable = False
-            goal = limited_search(self.start, self.goals, depth)
-            if goal:
-                path = self.parse_path(self.start, goal, parent)
-                if viz:
-                    viz.show_path(path)
-                return len(parent), path
-            else:
-                if not expandable:
-                    return len(visited), None
-                depth += 1
-                if viz:
-                    viz.reset_map()
-                    viz.update_idletasks()
+    def iterative_deepening_steps(self, events: bool = True, stats=None, iterations: list = None):
+        """
+        Function that runs Iterative Deepening Search step by step
 
-    def ida_star(self, viz=None) -> tuple[int, list]:
+        Args:
+            events: Yield a ThresholdRaise event with the depth limit of every iteration, an Expand event
+                for every cell expanded and an Enqueue event for every cell pushed
+            stats: Optional SearchStats receiving the counters of the search
+            iterations: Optional list receiving the number of nodes expanded by each iteration
+        Yield:
+            events: The events of the search, then PathFound if a goal is reached and Finished
+        """
+        graph = self.graph
+        offsets, targets, moves = graph.offsets, graph.targets, graph.moves
+        start = graph.cell_id(self.start)
+        goals = graph.cell_ids(self.goals)
+
+        depths = array('i', [INFINITY]) * graph.size
+        parent, move = graph.parent_store()
+        depths[start] = 0
+        parent[start] = start
+        observed = events or stats is not None
+        if stats is not None:
+            targets = CountingView(targets, stats, "generated")
+            stats.phase("search")
+
+        nodes = 0
+        goal, goal_depth = None, INFINITY
+        roots = [start]
+        limit = 0
+        while roots and goal is None:
+            stack = [(root, limit) for root in reversed(roots)]
+            if stats is not None:
+                stack = CountingStack(stats, stack)
+            limit += 1
+            if events:
+                yield ThresholdRaise(limit, False)
+            cut_off = []
+            expanded = 0
+
+            while stack:
+                cell, depth = stack.pop()
+                if depths[cell] < depth:
+                    # The cell was reached again at a lower depth after this entry was pushed
+                    continue
+                is_goal = cell in goals
+                if depth >= limit and not is_goal:
+                    # Expanded by the next iteration, which resumes from it
+                    cut_off.append(cell)
+                    continue
+                expanded += 1
+                if observed:
+                    if stats is not None:
+                        stats.expand(cell, len(stack))
+                    if events:
+                        yield Expand(graph.cell(cell))
+
+                if is_goal:
+                    if depth < goal_depth:
+                        goal, goal_depth = cell, depth
+                        # Nothing deeper than this goal can lead to a shorter path
+                        limit = depth
+                    continue
+
+                for k in range(offsets[cell + 1] - 1, offsets[cell] - 1, -1):
+                    neighbor = targets[k]
+                    if depth + 1 < depths[neighbor]:
+                        depths[neighbor] = depth + 1
+                        parent[neighbor] = cell
+                        move[neighbor] = moves[k]
+                        stack.append((neighbor, depth + 1))
+                        if events:
+                            yield Enqueue(graph.cell(neighbor))
+
+            nodes += expanded
+            if iterations is not None:
+                iterations.append(expanded)
+            if stats is not None:
+                stats.iterations += 1
+            roots = [cell for cell in dict.fromkeys(cut_off) if depths[cell] == limit]
+
+        if goal is None:
+            yield Finished(nodes, None)
+            return
+
+        if stats is not None:
+            stats.phase("path")
+        yield from found(self, start, graph.trace_moves(parent, move, start, goal), nodes)
+
+    @cached
+    def ida_star(self, viz=None, iterations: list = None, max_entries: int = None, stats=None) -> tuple[int, list]:
         """
         Function that solves the map with Iterative Deepening A*
+        Each iteration runs a Depth First Search with an explicit stack, cutting off cells whose estimated total cost
+        is above the threshold. A transposition table keeps the lowest cost each cell was reached with: a cell reached
+        again at the same or a higher cost is pruned, and each iteration resumes from the cells cut off by the last one
+        instead of starting again from the start. The path found is a shortest one.
 
         Args:
             viz: an instance of Map class
+            iterations: Optional list receiving the threshold, number of nodes expanded and table size of each iteration
+            max_entries: Optional limit on the number of cells kept in the transposition table; the least recently
+                used cells are evicted, and the cost of an evicted cell is found again from its parent links
+            stats: Optional SearchStats receiving the counters of the search
         Return:
-            nodes: Number of nodes traversed
+            nodes: Number of nodes expanded by all iterations
             path: A list including all moves to a goal. Return None if no goal is reachable
         """
-        threshold = self.heuristic_cost(self.start, self.goals)
+        if viz:
+            return visualize(self.ida_star_steps(iterations=iterations, max_entries=max_entries), viz)
+        return run_steps(self.ida_star_steps(events=False, stats=stats, iterations=iterations, max_entries=max_entries))
 
-        while True:
-            frontier = [(self.start, 0)]
-            parent = {self.start: (None, None)}
-            visited = set()
-            next_threshold = float("inf")
+    def ida_star_steps(self, events: bool = True, stats=None, iterations: list = None, max_entries: int = None):
+        """
+        Function that runs Iterative Deepening A* step by step
 
-            while frontier:
-                cell, g_cost = frontier.pop()
-                if cell not in visited:
-                    visited.add(cell)
-                    if viz:
-                        viz.update_map(cell)
-                        viz.update_idletasks()
-                        viz.after(50)
-
-                    h_cost = self.heuristic_cost(cell, self.goals)
-                    f_cost = g_cost + h_cost
-
-                    if self.goal_meet(cell, self.goals):
-                        path = self.parse_path(self.start, cell, parent)
-                        if viz:
-                            viz.show_path(path)
-                        return len(parent), path
-
-                    if f_cost > threshold:
-                        next_threshold = min(next_threshold, f_cost)
-                        continue
-                    
-                    neighbors = self.get_neighbors(cell)
-                    for neighbor in reversed(neighbors):
-                        if neighbor[0] not in visited:
-                            frontier.append((neighbor[0], g_cost + self.heuristic_cost(cell, [neighbor[0]])))
-                            parent[neighbor[0]] = (cell, neighbor[1])
-
-            if next_threshold == float("inf"):
-                return len(visited), None
-
-            threshold = next_threshold
-            if viz:
-                viz.reset_map()
-                viz.update_idletasks()
-                viz.after(50)
+        Args:
+            events: Yield a ThresholdRaise event when the threshold is raised, an Expand event for every cell
+                expanded and an Enqueue event for every cell pushed
+            stats: Optional SearchStats receiving the counters of the search
+            iterations: Optional list receiving the threshold, number of nodes expanded and table size of each iteration
+            max_entries: Optional limit on the number of cells kept in the transposition table
+        Yield:
+            events: The events of the search, then PathFound if a goal is reached and Finished
+        """
+        graph = self.graph
+        offsets, targets, moves = graph.offsets, graph.targets, graph.moves
+        start = graph.cell_id(self.start)
+        goals = graph.cell_ids(self.goals)
+        heuristic = self.heuristic_field(self.goals)
+
+        # Lowest cost each cell was reached with, least recently used first when bounded
+        bounded = max_entries is not None
+        table = OrderedDict() if bounded else {}
+        table[start] = 0
+        parent, move = graph.parent_store()
+        parent[start] = start
+        observed = events or stats is not None
+        if stats is not None:
+            targets = CountingView(targets, stats, "generated")
+            heuristic = CountingView(heuristic, stats, "heuristic_evaluations")
+            stats.phase("search")
+
+        nodes = 0
+        goal = None
+        threshold = heuristic[start]
+        roots = [(start, 0)]
+        while roots and goal is None:
+            stack = roots[::-1]
+            if stats is not None:
+                stack = CountingStack(stats, stack)
+            cut_off = []
+            next_threshold = INFINITY
+            expanded = 0
+            children = []
+
+            while stack:
+                cell, g_cost = stack.pop()
+                best = table.get(cell)
+                if best is None:
+                    # Evicted from the table, its parent links still lead back to the start
+                    best = len(graph.trace_moves(parent, move, start, cell))
+                if best < g_cost:
+                    # The cell was reached again at a lower cost after this entry was pushed
+                    continue
+                f_cost = g_cost + heuristic[cell]
+                if f_cost > threshold:
+                    # Expanded by a later iteration, which resumes from it
+                    next_threshold = min(next_threshold, f_cost)
+                    cut_off.append((cell, g_cost))
+                    continue
+                expanded += 1
+                if observed:
+                    if stats is not None:
+                        stats.expand(cell, len(stack))
+                    if events:
+                        yield Expand(graph.cell(cell))
+
+                if cell in goals:
+                    goal = cell
+                    break
 
+                g_cost += 1
+                for k in range(offsets[cell + 1] - 1, offsets[cell] - 1, -1):
+                    neighbor = targets[k]
+                    best = table.get(neighbor)
+                    if best is None:
+                        best = INFINITY if parent[neighbor] == -1 else len(graph.trace_moves(parent, move, start, neighbor))
+                    if g_cost < best:
+                        table[neighbor] = g_cost
+                        if bounded:
+                            table.move_to_end(neighbor)
+                            if len(table) > max_entries:
+                                table.popitem(last=False)
+                        parent[neighbor] = cell
+                        move[neighbor] = moves[k]
+                        children.append((heuristic[neighbor], neighbor))
+                        if events:
+                            yield Enqueue(graph.cell(neighbor))
+                # The neighbor nearest to a goal is tried first, so the last iteration reaches one sooner
+                children.sort(reverse=True)
+                for _, neighbor in children:
+                    stack.append((neighbor, g_cost))
+                children.clear()
+
+            nodes += expanded
+            if iterations is not None:
+                iterations.append({"threshold": threshold, "nodes": expanded, "entries": len(table)})
+            if stats is not None:
+                stats.iterations += 1
+            if goal is None and cut_off:
+                threshold = next_threshold
+                if events:
+                    yield ThresholdRaise(threshold, False)
+            roots = cut_off
+
+        if goal is None:
+            yield Finished(nodes, None)
+            return
+
+        if stats is not None:
+            stats.phase("path")
+        yield from found(self, start, graph.trace_moves(parent, move, start, goal), nodes)
+
+    @cached
     def astar_multi_goals(self, viz=None) -> list:
         """
-        Function that solves the map with A* Search and aims to reach all goals with the shortest path.
+        Function that solves the map with A* Search, reaching all goals by always going to the nearest remaining one.
+        This is the greedy legacy variant, kept as the baseline of held_karp_multi_goals, which search.py and the
+        GUI run for ALL; the tour it returns can be longer than the shortest one.
 
         Args:
             viz: an instance of Map class
         Returns:
-            total_paths: A list of all moves to all goals in sequence. Returns "can't reach all goals" if not all goals are reachable.
+            total_paths: A list of all moves to all goals in sequence, or None if not all goals are reachable.
         """
+        graph = self.graph
+        offsets, targets, moves = graph.offsets, graph.targets, graph.moves
         total_nodes = 0
-        total_path = []
+        total_moves = bytearray()
 
-        original_goals = self.goals.copy()
-        original_start = self.start
+        original_goals = graph.cell_ids(self.goals)
+        original_start = graph.cell_id(self.start)
+        if len(original_goals) < len(self.goals):
+            # A goal outside the map can never be reached
+            return None
 
         while True:
-            frontier = {}
+            # Only the goals that are still remaining guide the search
+            heuristic = self.heuristic_field(graph.cell(goal) for goal in original_goals)
+            frontier = PriorityFrontier()
             visited = {}
-            parent = {}
+            parent, move = graph.parent_store()
+
+            frontier[original_start] = heuristic[original_start]
+            parent[original_start] = original_start
 
-            frontier[original_start] = self.heuristic_cost(original_start, self.goals)
-            parent[original_start] = (None, None)
-            
             found_goal = None
             while frontier:
-                cell = min(frontier, key=frontier.get)
-                current_cell_cost = frontier[cell]
-                del frontier[cell]
+                cell, current_cell_cost = frontier.pop()
                 visited[cell] = current_cell_cost
 
-                if viz:
-                    viz.update_map(cell)
-                    viz.update_idletasks()
-                    viz.after(50)
-
                 if cell in original_goals:
                     found_goal = cell
                     break
-                
-                neighbors = self.get_neighbors(cell)
-                for neighbor in neighbors:
-                    g_cost = current_cell_cost - self.heuristic_cost(cell, self.goals) + self.heuristic_cost(neighbor[0], [cell])
-                    h_cost = self.heuristic_cost(neighbor[0], self.goals)
-                    f_cost = g_cost + h_cost
-
-                    if neighbor[0] in visited:
-                        if f_cost < visited[neighbor[0]]:
-                            del visited[neighbor[0]]
-                            frontier[neighbor[0]] = f_cost
-                            parent[neighbor[0]] = (cell, neighbor[1])
-                    elif neighbor[0] in frontier:
-                        if f_cost < frontier[neighbor[0]]:
-                            frontier[neighbor[0]] = f_cost
-                            parent[neighbor[0]] = (cell, neighbor[1])
+
+                g_cost = current_cell_cost - heuristic[cell] + 1
+                for k in range(offsets[cell], offsets[cell + 1]):
+                    neighbor = targets[k]
+                    f_cost = g_cost + heuristic[neighbor]
+
+                    if neighbor in visited:
+                        if f_cost < visited[neighbor]:
+                            del visited[neighbor]
+                            frontier[neighbor] = f_cost
+                            parent[neighbor] = cell
+                            move[neighbor] = moves[k]
+                    elif neighbor in frontier:
+                        if f_cost < frontier[neighbor]:
+                            frontier[neighbor] = f_cost
+                            parent[neighbor] = cell
+                            move[neighbor] = moves[k]
                     else:
-                        frontier[neighbor[0]] = f_cost
-                        parent[neighbor[0]] = (cell, neighbor[1])
-            
-            total_nodes += len(parent)
-            if not found_goal:
+                        frontier[neighbor] = f_cost
+                        parent[neighbor] = cell
+                        move[neighbor] = moves[k]
+
+            total_nodes += graph.reached(parent)
+            if found_goal is None:
                 return None
-            
-            path_to_goal = self.parse_path(original_start, found_goal, parent)
+
+            total_moves += graph.trace_moves(parent, move, original_start, found_goal)
             original_goals.remove(found_goal)
 
             if original_goals:
                 original_start = found_goal
-                total_path.extend(path_to_goal[:-1])
             else:
-                total_path.extend(path_to_goal)
+                total_path = self.make_path(graph.cell_id(self.start), total_moves)
                 if viz:
                     viz.show_path(total_path)
                 return total_path
-            
+
+    @cached
+    def held_karp_multi_goals(self, viz=None, stats=None) -> tuple[int, list]:
+        """
+        Function that solves the map by visiting all goals along the shortest tour.
+        One Breadth First Search from each goal gives the distances between the start and all goals,
+        then the visiting order is solved exactly with Held-Karp dynamic programming for up to
+        HELD_KARP_LIMIT goals, and by always going to the nearest unvisited goal beyond that.
+
+        Args:
+            viz: an instance of Map class
+            stats: Optional SearchStats receiving the counters of the searches
+        Return:
+            nodes: Number of nodes traversed by all searches
+            path: A list of all moves to all goals in sequence. Return None if not all goals are reachable
+        """
+        graph = self.graph
+        start = graph.cell_id(self.start)
+        goals = sorted(graph.cell_ids(self.goals))
+        if len(goals) < len(self.goals):
+            # A goal outside the map can never be reached
+            return 0, None
+
+        if stats is not None:
+            stats.phase("search")
+        nodes = 0
+        fields = []
+        for goal in goals:
+            # A goal on a wall can never be entered, unless the start is already there
+            field = graph.distance_field([goal] if graph.walls[goal] != 1 or goal == start else [], stats)
+            if stats is not None:
+                stats.iterations += 1
+            if graph.walls[start] == 1:
+                graph.attach_to_field(start, field[0], field[1])
+            nodes += field[2]
+            fields.append(field)
+
+        start_costs = [field[0][start] for field in fields]
+        if INFINITY in start_costs:
+            return nodes, None
+        costs = [[field[0][goal] for field in fields] for goal in goals]
+
+        if stats is not None:
+            stats.phase("order")
+        if len(goals) <= HELD_KARP_LIMIT:
+            order = self.held_karp_order(start_costs, costs)
+        else:
+            order = self.nearest_goal_order(start_costs, costs)
+
+        if stats is not None:
+            stats.phase("path")
+        total_moves = bytearray()
+        cell = start
+        for index in order:
+            total_moves += graph.follow_field(cell, fields[index][0], fields[index][1])
+            cell = goals[index]
+
+        path = self.make_path(start, total_moves)
+        if viz:
+            viz.show_path(path)
+        return nodes, path
+
+    def held_karp_order(self, start_costs: list, costs: list) -> list:
+        """
+        Function that finds the order visiting all goals with the lowest total cost using Held-Karp dynamic programming
+
+        Args:
+            start_costs: Cost from the start to each goal
+            costs: costs[i][j] is the cost from goal i to goal j
+        Return:
+            order: Indexes of the goals in visiting order
+        """
+        count = len(start_costs)
+        # best[visited][last] is the lowest cost of visiting the set of goals ending at goal last
+        best = [[INFINITY] * count for _ in range(1 << count)]
+        previous = [[-1] * count for _ in range(1 << count)]
+        for last in range(count):
+            best[1 << last][last] = start_costs[last]
+
+        for visited in range(1, 1 << count):
+            row = best[visited]
+            for last in range(count):
+                cost = row[last]
+                if cost == INFINITY or not visited >> last & 1:
+                    continue
+                last_costs = costs[last]
+                for goal in range(count):
+                    if visited >> goal & 1:
+                        continue
+                    new_cost = cost + last_costs[goal]
+                    extended = visited | 1 << goal
+                    if new_cost < best[extended][goal]:
+                        best[extended][goal] = new_cost
+                        previous[extended][goal] = last
+
+        visited = (1 << count) - 1
+        last = min(range(count), key=best[visited].__getitem__)
+        order = []
+        while last != -1:
+            order.append(last)
+            visited, last = visited ^ 1 << last, previous[visited][last]
+        order.reverse()
+        return order
+
+    def nearest_goal_order(self, start_costs: list, costs: list) -> list:
+        """
+        Function that orders the goals by always going to the nearest unvisited goal
+
+        Args:
+            start_costs: Cost from the start to each goal
+            costs: costs[i][j] is the cost from goal i to goal j
+        Return:
+            order: Indexes of the goals in visiting order
+        """
+        remaining = set(range(len(start_costs)))
+        current_costs = start_costs
+        order = []
+        while remaining:
+            goal = min(remaining, key=current_costs.__getitem__)
+            remaining.remove(goal)
+            order.append(goal)
+            current_costs = costs[goal]
+        return order
+
+    @cached
+    def solve_many(self, starts: list) -> tuple[int, list]:
+        """
+        Function that finds a shortest path to the nearest goal for many starting points at once.
+        A single Breadth First Search backward from all goals tells every cell its next move,
+        so each start is answered by walking those moves in O(path length).
+
+        Args:
+            starts: A list of starting points
+        Return:
+            nodes: Number of nodes traversed by the search
+            paths: A list with the path of each starting point in order, None if no goal is reachable from it
+        """
+        graph = self.graph
+        goals = graph.cell_ids(self.goals)
+        # A goal on a wall can never be entered
+        distance, toward, nodes = graph.distance_field([goal for goal in goals if graph.walls[goal] != 1])
+
+        paths = []
+        for start in starts:
+            if not graph.in_map(start):
+                paths.append(None)
+                continue
+
+            cell = graph.cell_id(start)
+            if cell in goals:
+                moves = bytearray()
+            else:
+                if graph.walls[cell] == 1:
+                    graph.attach_to_field(cell, distance, toward)
+                moves = graph.follow_field(cell, distance, toward)
+            paths.append(None if moves is None else self.make_path(cell, moves))
+
+        return nodes, paths
+
+    @cached
+    def bidirectional_breadth_first_search(self, viz=None, stats=None) -> tuple[int, list]:
+        """
+        Function that solves the map with Bidirectional Breadth First Search
+        One search grows forward from the start and another grows backward from all goals at once,
+        each one expanding a whole layer at a time, and the path is joined where the two searches meet
+
+        Args:
+            viz: an instance of Map class
+            stats: Optional SearchStats receiving the counters of the search
+        Return:
+            nodes: Number of nodes traversed
+            path: A list including all moves to a goal. Return None if no goal is reachable
+        """
+        if viz:
+            return visualize(self.bidirectional_breadth_first_steps(), viz)
+        return run_steps(self.bidirectional_breadth_first_steps(events=False, stats=stats))
+
+    def bidirectional_breadth_first_steps(self, events: bool = True, stats=None):
+        """
+        Function that runs Bidirectional Breadth First Search step by step
+
+        Args:
+            events: Yield an Expand event for every cell expanded and an Enqueue event for every cell added
+                to the next layer, on both sides
+            stats: Optional SearchStats receiving the counters of the search
+        Yield:
+            events: The events of the search, then PathFound if a goal is reached and Finished
+        """
+        graph = self.graph
+        offsets, targets, moves = graph.offsets, graph.targets, graph.moves
+        start = graph.cell_id(self.start)
+        goals = graph.cell_ids(self.goals)
+
+        if start in goals:
+            yield from found(self, start, bytearray(), 1)
+            return
+
+        # A goal on a wall can never be entered, so it does not seed the backward search
+        goals = [goal for goal in goals if graph.walls[goal] != 1]
+
+        # side[cell] has bit 1 set when the forward search reached it and bit 2 for the backward search
+        side = bytearray(graph.size)
+        parents = (graph.parent_store(), graph.parent_store())
+        layers = ([start], goals)
+
+        side[start] = 1
+        parents[0][0][start] = start
+        for goal in goals:
+            side[goal] = 2
+            parents[1][0][goal] = goal
+        observed = events or stats is not None
+        if stats is not None:
+            stats.pushes += 1 + len(goals)
+            targets = CountingView(targets, stats, "generated")
+            stats.phase("search")
+
+        meet = None
+        while layers[0] and layers[1] and meet is None:
+            # Expand the smaller layer
+            direction = 0 if len(layers[0]) <= len(layers[1]) else 1
+            own, other = (1, 2) if direction == 0 else (2, 1)
+            parent, move = parents[direction]
+
+            next_layer = [] if stats is None else CountingStack(stats)
+            for cell in layers[direction]:
+                if observed:
+                    if stats is not None:
+                        stats.pops += 1
+                        stats.expand(cell, len(layers[0]) + len(layers[1]) + len(next_layer))
+                    if events:
+                        yield Expand(graph.cell(cell))
+
+                for k in range(offsets[cell], offsets[cell + 1]):
+                    neighbor = targets[k]
+                    if side[neighbor] & own:
+                        continue
+                    side[neighbor] |= own
+                    parent[neighbor] = cell
+                    # The backward search stores the move from the neighbor back to the cell
+                    move[neighbor] = moves[k] if direction == 0 else (moves[k] + 2) % 4
+                    next_layer.append(neighbor)
+                    if events:
+                        yield Enqueue(graph.cell(neighbor))
+
+                    # The first meeting gives a shortest path, as no shorter path was found by the earlier layers
+                    if side[neighbor] & other:
+                        meet = neighbor
+                        break
+                if meet is not None:
+                    break
+
+            layers = (next_layer, layers[1]) if direction == 0 else (layers[0], next_layer)
+
+        nodes = graph.size - side.count(0)
+        if meet is None:
+            yield Finished(nodes, None)
+            return
+
+        if stats is not None:
+            stats.phase("path")
+        yield from found(self, start, self.join_moves(start, meet, parents[0], parents[1]), nodes)
+
+    @cached
+    def bidirectional_astar(self, viz=None, stats=None) -> tuple[int, list]:
+        """
+        Function that solves the map with Bidirectional A* Search
+        The forward search is guided by the distance to the nearest goal and the backward search,
+        which starts from all goals at once, by the distance to the start. The searches stop once
+        the best meeting found so far is proven to be the shortest path.
+
+        Args:
+            viz: an instance of Map class
+            stats: Optional SearchStats receiving the counters of the search
+        Return:
+            nodes: Number of nodes traversed
+            path: A list including all moves to a goal. Return None if no goal is reachable
+        """
+        if viz:
+            return visualize(self.bidirectional_astar_steps(), viz)
+        return run_steps(self.bidirectional_astar_steps(events=False, stats=stats))
+
+    def bidirectional_astar_steps(self, events: bool = True, stats=None):
+        """
+        Function that runs Bidirectional A* Search step by step
+
+        Args:
+            events: Yield an Expand event for every cell expanded and an Enqueue event for every cell queued
+                or queued again at a lower cost, on both sides
+            stats: Optional SearchStats receiving the counters of the search
+        Yield:
+            events: The events of the search, then PathFound if a goal is reached and Finished
+        """
+        graph = self.graph
+        offsets, targets, moves = graph.offsets, graph.targets, graph.moves
+        start = graph.cell_id(self.start)
+        goals = graph.cell_ids(self.goals)
+
+        if start in goals:
+            yield from found(self, start, bytearray(), 1)
+            return
+
+        # A goal on a wall can never be entered, so it does not seed the backward search
+        goals = [goal for goal in goals if graph.walls[goal] != 1]
+
+        # The goal field is cached for later searches, the distance to the start changes with every start
+        heuristics = (self.heuristic_field(self.goals), ManhattanDistance(graph, self.start))
+        costs = (array('i', [INFINITY]) * graph.size, array('i', [INFINITY]) * graph.size)
+        parents = (graph.parent_store(), graph.parent_store())
+        frontiers = (PriorityFrontier(), PriorityFrontier())
+        observed = events or stats is not None
+        if stats is not None:
+            heuristics = tuple(CountingView(heuristic, stats, "heuristic_evaluations") for heuristic in heuristics)
+            frontiers = (CountingFrontier(stats), CountingFrontier(stats))
+            targets = CountingView(targets, stats, "generated")
+            stats.phase("search")
+        # Bit 1 marks cells of the forward search and bit 2 cells of the backward search
+        side = bytearray(graph.size)
+        closed = bytearray(graph.size)
+
+        side[start] = 1
+        costs[0][start] = 0
+        parents[0][0][start] = start
+        frontiers[0][start] = heuristics[0][start]
+        for goal in goals:
+            side[goal] |= 2
+            costs[1][goal] = 0
+            parents[1][0][goal] = goal
+            frontiers[1][goal] = heuristics[1][goal]
+
+        best_cost = INFINITY
+        meet = None
+        while frontiers[0] and frontiers[1]:
+            # Every shorter path must pass through an open cell whose f cost is below best_cost on both sides
+            if best_cost <= max(frontiers[0].peek()[1], frontiers[1].peek()[1]):
+                break
+
+            # Expand the smaller frontier
+            direction = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+            own = 1 if direction == 0 else 2
+            heuristic, frontier = heuristics[direction], frontiers[direction]
+            own_cost, other_cost = costs[direction], costs[1 - direction]
+            parent, move = parents[direction]
+
+            cell, _ = frontier.pop()
+            closed[cell] |= own
+            if observed:
+                if stats is not None:
+                    stats.expand(cell, len(frontiers[0]) + len(frontiers[1]))
+                if events:
+                    yield Expand(graph.cell(cell))
+
+            g_cost = own_cost[cell] + 1
+            for k in range(offsets[cell], offsets[cell + 1]):
+                neighbor = targets[k]
+                if closed[neighbor] & own or g_cost >= own_cost[neighbor]:
+                    continue
+                side[neighbor] |= own
+                own_cost[neighbor] = g_cost
+                parent[neighbor] = cell
+                # The backward search stores the move from the neighbor back to the cell
+                move[neighbor] = moves[k] if direction == 0 else (moves[k] + 2) % 4
+                frontier[neighbor] = g_cost + heuristic[neighbor]
+                if events:
+                    yield Enqueue(graph.cell(neighbor))
+
+                if g_cost + other_cost[neighbor] < best_cost:
+                    best_cost = g_cost + other_cost[neighbor]
+                    meet = neighbor
+
+        nodes = graph.size - side.count(0)
+        if meet is None:
+            yield Finished(nodes, None)
+            return
+
+        if stats is not None:
+            stats.phase("path")
+        yield from found(self, start, self.join_moves(start, meet, parents[0], parents[1]), nodes)
+
+    def join_moves(self, start: int, meet: int, forward: tuple, backward: tuple) -> bytearray:
+        """
+        Function that joins the moves of a forward and a backward search where they meet
+
+        Args:
+            start: ID of the starting cell
+            meet: ID of the cell reached by both searches
+            forward: Parent links of the forward search, starting from the start
+            backward: Parent links of the backward search, starting from the goals
+        Return:
+            moves: Direction codes of all moves from the start to a goal
+        """
+        moves = self.graph.trace_moves(forward[0], forward[1], start, meet)
+
+        parent, move = backward
+        cell = meet
+        while parent[cell] != cell:
+            moves.append(move[cell])
+            cell = parent[cell]
+        return moves
+
+    @cached
+    def jump_point_search(self, viz=None, stats=None) -> tuple[int, list]:
+        """
+        Function that solves the map with Jump Point Search, an A* Search that only stops at jump points
+        Moving horizontally, a cell is a jump point if a cell above or below it opens up next to a wall.
+        Moving vertically, a cell is a jump point if a cell to its left or right opens up next to a wall,
+        or if a horizontal jump from it reaches a jump point. Goals are always jump points.
+
+        Args:
+            viz: an instance of Map class
+            stats: Optional SearchStats receiving the counters of the search
+        Return:
+            nodes: Number of jump points reached
+            path: A list including all moves to a goal. Return None if no goal is reachable
+        """
+        if viz:
+            return visualize(self.jump_point_steps(), viz)
+        return run_steps(self.jump_point_steps(events=False, stats=stats))
+
+    def jump_point_steps(self, events: bool = True, stats=None):
+        """
+        Function that runs Jump Point Search step by step
+
+        Args:
+            events: Yield an Expand event for every jump point expanded and an Enqueue event for every jump point
+                queued or queued again at a lower cost, the cells jumped over have no events
+            stats: Optional SearchStats receiving the counters of the search
+        Yield:
+            events: The events of the search, then PathFound if a goal is reached and Finished
+        """
+        graph = self.graph
+        width = graph.width
+        start = graph.cell_id(self.start)
+        goals = graph.cell_ids(self.goals)
+        heuristic = self.heuristic_field(self.goals)
+
+        open_cell, jump = self.jumper(goals)
+
+        # Directions to try from a jump point, given the direction it was reached with
+        pruned = {UP: (LEFT, RIGHT, UP), DOWN: (LEFT, RIGHT, DOWN), LEFT: (UP, DOWN, LEFT), RIGHT: (UP, DOWN, RIGHT)}
+        steps = graph.steps
+
+        frontier = PriorityFrontier()
+        costs = array('i', [INFINITY]) * graph.size
+        closed = bytearray(graph.size)
+        parent, move = graph.parent_store()
+
+        observed = events or stats is not None
+        if stats is not None:
+            frontier = CountingFrontier(stats)
+            heuristic = CountingView(heuristic, stats, "heuristic_evaluations")
+            stats.phase("search")
+
+        costs[start] = 0
+        parent[start] = start
+        frontier[start] = heuristic[start]
+
+        while frontier:
+            cell, _ = frontier.pop()
+            closed[cell] = 1
+            if observed:
+                if stats is not None:
+                    stats.expand(cell, len(frontier))
+                if events:
+                    yield Expand(graph.cell(cell))
+
+            if cell in goals:
+                if stats is not None:
+                    stats.phase("path")
+                yield from found(self, start, self.expand_jumps(start, cell, parent, move), graph.reached(parent))
+                return
+
+            y, x = divmod(cell, width)
+            for direction in (pruned[move[cell]] if cell != start else (UP, LEFT, DOWN, RIGHT)):
+                dx, dy = ((0, -1), (-1, 0), (0, 1), (1, 0))[direction]
+                if not open_cell(x + dx, y + dy):
+                    continue
+                jump_point = jump(cell + steps[direction], direction)
+                if jump_point < 0 or closed[jump_point]:
+                    continue
+                if stats is not None:
+                    stats.generated += 1
+
+                g_cost = costs[cell] + abs(jump_point - cell) // (width if dy else 1)
+                if g_cost < costs[jump_point]:
+                    costs[jump_point] = g_cost
+                    parent[jump_point] = cell
+                    move[jump_point] = direction
+                    frontier[jump_point] = g_cost + heuristic[jump_point]
+                    if events:
+                        yield Enqueue(graph.cell(jump_point))
+
+        yield Finished(graph.reached(parent), None)
+
+    def jumper(self, goals: set) -> tuple:
+        """
+        Function that creates the jump function of Jump Point Search, remembering the jumps already made
+
+        Args:
+            goals: A set of goal cell IDs, which are always jump points
+        Return:
+            open_cell: Function telling if the cell at (x, y) is inside the map and not a wall
+            jump: Function finding the first jump point at or after a cell when moving in a direction
+        """
+        graph = self.graph
+        width, height, walls = graph.width, graph.height, graph.walls
+
+        def open_cell(x: int, y: int) -> bool:
+            return 0 <= x < width and 0 <= y < height and walls[y * width + x] != 1
+
+        # Results of horizontal and vertical jumps starting at a cell, indexed by direction code
+        # UNKNOWN until computed, then the ID of the jump point found or -1 if the jump hits a wall
+        UNKNOWN = -2
+        jumps = [array('i', [UNKNOWN]) * graph.size for _ in range(4)]
+
+        def jump(cell: int, direction: int) -> int:
+            """
+            This function finds the first jump point at or after a cell when moving in a direction.
+
+            Args:
+                cell: The ID of the first cell of the jump.
+                direction: The direction code of the move.
+
+            Returns:
+                jump_point: The ID of the jump point found, or -1 if the jump hits a wall or the map boundaries.
+            """
+            memo = jumps[direction]
+            dx, dy = ((0, -1), (-1, 0), (0, 1), (1, 0))[direction]
+            y, x = divmod(cell, width)
+            scanned = []
+            result = -1
+            while open_cell(x, y):
+                cell = y * width + x
+                if memo[cell] != UNKNOWN:
+                    result = memo[cell]
+                    break
+                scanned.append(cell)
+                if cell in goals:
+                    result = cell
+                    break
+                if dx:
+                    if (open_cell(x, y - 1) and not open_cell(x - dx, y - 1)) or \
+                       (open_cell(x, y + 1) and not open_cell(x - dx, y + 1)):
+                        result = cell
+                        break
+                else:
+                    if (open_cell(x - 1, y) and not open_cell(x - 1, y - dy)) or \
+                       (open_cell(x + 1, y) and not open_cell(x + 1, y - dy)) or \
+                       (x > 0 and jump(cell - 1, LEFT) >= 0) or \
+                       (x < width - 1 and jump(cell + 1, RIGHT) >= 0):
+                        result = cell
+                        break
+                x += dx
+                y += dy
+
+            # Every cell scanned on the way leads to the same jump point
+            for cell in scanned:
+                memo[cell] = result
+            return result
+
+        return open_cell, jump
+
+    def expand_jumps(self, start: int, cell: int, parent: array, move: bytearray) -> bytearray:
+        """
+        Function that expands the straight jumps between jump points into single moves
+
+        Args:
+            start: ID of the starting cell
+            cell: ID of the reached goal
+            parent: An array of parent jump point IDs
+            move: A bytearray of the direction codes of the jumps
+        Return:
+            moves: Direction codes of all moves from the start to the goal
+        """
+        width = self.graph.width
+        moves = bytearray()
+        while cell != start:
+            direction = move[cell]
+            length = abs(cell - parent[cell]) // (width if direction in (UP, DOWN) else 1)
+            moves += bytes([direction]) * length
+            cell = parent[cell]
+        moves.reverse()
+        return moves
+
+    @cached
+    def hierarchical_search(self, viz=None, stats=None) -> tuple[int, list]:
+        """
+        Function that solves the map with Hierarchical Path-Finding A* (HPA*)
+        The abstract graph of the map is built on the first call and reused by later calls,
+        the path found may be slightly longer than the shortest one
+
+        Args:
+            viz: an instance of Map class
+            stats: Optional SearchStats receiving the counters of the abstract search, building the abstract graph
+                and linking the start and goals to it are timed as its setup phase
+        Return:
+            nodes: Number of abstract nodes expanded
+            path: A list including all moves to a goal. Return None if no goal is reachable
+        """
+        graph = self.graph
+        if self.hierarchy is None:
+            self.hierarchy = HierarchicalSolver(graph)
+        start = graph.cell_id(self.start)
+        nodes, moves = self.hierarchy.search(start, graph.cell_ids(self.goals), stats)
+        if moves is None:
+            return nodes, None
+
+        path = self.make_path(start, moves)
+        if viz:
+            viz.show_path(path)
+        return nodes, path
+
+    def steps(self, method: str, **options):
+        """
+        Function that runs a search step by step, as a generator of events consumed lazily
+        Searches without a step generator run at once and only yield their result
+
+        Args:
+            method: Name of the search method, such as "astar"
+            options: Keyword arguments of the step generator, such as max_entries for ida_star
+        Return:
+            steps: A generator of Expand, Enqueue, ThresholdRaise and PathFound events, ending with Finished
+        """
+        if method in STEPS:
+            return getattr(self, STEPS[method])(**options)
+        return result_steps(functools.partial(getattr(self, method), **options))
+
+    def run(self, method: str, **options) -> tuple[int, list]:
+        """
+        Function that runs a search without events, bypassing the cache
+        The step generator is asked for no events, so it only yields its result and the search runs as a plain loop.
+        This is the path taken by the search methods when they are not shown in the visualizer
+
+        Args:
+            method: Name of the search method, such as "astar"
+            options: Keyword arguments of the step generator, such as iterations for ida_star
+        Return:
+            nodes: Number of nodes traversed
+            path: The path found, None if no goal is reachable
+        """
+        if method in STEPS:
+            return run_steps(getattr(self, STEPS[method])(events=False, **options))
+        return getattr(self, method)(**options)
+
+    def record(self, method: str, filename: str, **options) -> tuple[int, list]:
+        """
+        Function that runs a search step by step while recording its events to a compact trace file,
+        which replayTrace.py replays in the visualizer or renders to a PNG without running the search again
+
+        Args:
+            method: Name of the search method, such as "astar"
+            filename: Path of the trace file to write
+            options: Keyword arguments of the step generator, such as max_entries for ida_star
+        Return:
+            nodes: Number of nodes traversed
+            path: The path found, None if no goal is reachable
+        """
+        return record_trace(self, method, filename, **options)
+
     def cell_in_map(self, cell: tuple) -> bool:
         """
         Function that checks if a cell is within the map boundaries
@@ -455,6 +1460,27 @@ class MapSolver:
         """
         return point in goals
     
+    def heuristic_field(self, goals: set) -> array:
+        """
+        Function that retrieves the nearest-goal Manhattan distance of every cell for a set of goals
+        The field is computed once per set of goals and reused by later searches,
+        keeping the HEURISTIC_FIELDS most recently used fields
+
+        Args:
+            goals: A set of all possible goals
+        Return:
+            field: A flat array where field[cell] is the minimum Manhattan distance from the cell ID to any goal
+        """
+        key = frozenset(goals)
+        fields = self.heuristic_fields
+        field = fields.get(key)
+        if field is None:
+            field = fields[key] = self.graph.distance_transform(key)
+            while len(fields) > HEURISTIC_FIELDS:
+                fields.popitem(last=False)
+        fields.move_to_end(key)
+        return field
+
     def heuristic_cost(self, point: tuple, goals: set) -> int:
         """
         Function that calculates the Manhattan distance from a point to a set of goals
@@ -479,11 +1505,35 @@ class MapSolver:
         Return:
             path: A list containing the final path
         """
-        path = []
-        path.insert(0, (cell, None))
+        path = [(cell, None)]
 
         while cell != start:
-            path.insert(0, parent[cell][:2])
+            path.append(parent[cell][:2])
             cell = parent[cell][0]
 
-        return path
\ No newline at end of file
+        path.reverse()
+        return path
+
+    def make_path(self, start: int, moves: bytearray):
+        """
+        Function that turns the moves found by a search into the returned path
+
+        Args:
+            start: ID of the starting cell
+            moves: Direction codes of all moves from the starting cell to the goal
+        Return:
+            path: A list of (cell, direction) tuples ending with (goal, None),
+                or the bytes of the direction codes if the solver returns directions only
+        """
+        if self.directions_only:
+            return bytes(moves)
+
+        graph = self.graph
+        steps = graph.steps
+        path = []
+        cell = start
+        for move in moves:
+            path.append((graph.cell(cell), DIRECTIONS[move]))
+            cell += steps[move]
+        path.append((graph.cell(cell), None))
+        return path
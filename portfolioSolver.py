@@ -0,0 +1,232 @@
+import json
+import multiprocessing
+import queue
+import time
+from array import array
+from multiprocessing import shared_memory
+from gridGraph import GridGraph
+from mapSolver import MapSolver, METHODS
+from solverCache import map_fingerprint
+
+# Methods started by PORTFOLIO when none are chosen
+DEFAULT_METHODS = ["DFS", "BFS", "GBFS", "AS", "CUS1", "CUS2"]
+
+# Methods whose path is always a shortest one
+OPTIMAL_METHODS = {"BFS", "AS", "CUS1", "CUS2", "BIBFS", "BIAS", "JPS"}
+
+# Seconds between checks that the members still running have not died without a result
+POLL_SECONDS = 0.1
+
+# Bytes taken by each entry of the offsets and targets of a GridGraph
+INT_SIZE = array('i').itemsize
+
+class SharedGridGraph(GridGraph):
+    def __init__(self, buffer, width: int, height: int, edges: int):
+        """
+        Initializes a GridGraph reading its walls and CSR neighbor table from a buffer, without building them.
+
+        The buffer is laid out by copy_graph. Nothing is copied: the arrays of the graph are views of the buffer,
+        which release must let go of before the buffer is closed.
+
+        Args:
+            buffer: A memoryview of the shared memory holding the graph
+            width: Number of columns of the map
+            height: Number of rows of the map
+            edges: Number of neighbor links in the CSR table
+        """
+        self.height = height
+        self.width = width
+        self.size = width * height
+        # Change of cell ID made by each move
+        self.steps = (-width, -1, width, 1)
+        self.views = graph_views(buffer, self.size, edges)
+        self.offsets, self.targets, self.walls, self.moves = self.views
+
+    def release(self):
+        """
+        Function that releases the views of the buffer, after which the graph can no longer be searched
+        """
+        for view in self.views:
+            view.release()
+
+def graph_views(buffer, size: int, edges: int) -> tuple:
+    """
+    Function that splits a buffer into the arrays of a GridGraph: offsets and targets as C ints, then the walls
+    and moves one byte each
+
+    Args:
+        buffer: A memoryview of at least graph_bytes(size, edges) bytes
+        size: Number of cells of the map
+        edges: Number of neighbor links in the CSR table
+    Return:
+        views: Memoryviews of the offsets, targets, walls and moves
+    """
+    targets_begin = (size + 1) * INT_SIZE
+    walls_begin = targets_begin + edges * INT_SIZE
+    moves_begin = walls_begin + size
+    return (buffer[:targets_begin].cast('i'), buffer[targets_begin:walls_begin].cast('i'),
+            buffer[walls_begin:moves_begin], buffer[moves_begin:moves_begin + edges])
+
+def graph_bytes(size: int, edges: int) -> int:
+    """
+    Function that computes the size of the buffer holding a GridGraph
+
+    Args:
+        size: Number of cells of the map
+        edges: Number of neighbor links in the CSR table
+    Return:
+        size: Number of bytes laid out by graph_views
+    """
+    return (size + 1 + edges) * INT_SIZE + size + edges
+
+def copy_graph(graph: GridGraph, buffer):
+    """
+    Function that copies the walls and CSR neighbor table of a GridGraph into a buffer, as read by SharedGridGraph
+
+    Args:
+        graph: The GridGraph to copy
+        buffer: A memoryview of at least graph_bytes(graph.size, len(graph.targets)) bytes
+    """
+    views = graph_views(buffer, graph.size, len(graph.targets))
+    for view, values in zip(views, (graph.offsets, graph.targets, graph.walls, graph.moves)):
+        view[:] = values
+        view.release()
+
+def run_member(memory_name: str, width: int, height: int, edges: int, start: tuple, goals: set, method: str, results):
+    """
+    Function that runs one method of a portfolio in its own process, on the graph shared by the portfolio
+
+    Args:
+        memory_name: Name of the shared memory holding the graph, as laid out by copy_graph
+        width: Number of columns of the map
+        height: Number of rows of the map
+        edges: Number of neighbor links in the CSR table
+        start: Coordinate of the starting point
+        goals: A set of goal points
+        method: Name of the method, as used by search.py
+        results: Queue receiving (method, nodes, path, seconds, error)
+    """
+    try:
+        memory = shared_memory.SharedMemory(name=memory_name)
+        graph = SharedGridGraph(memory.buf, width, height, edges)
+        try:
+            began = time.perf_counter()
+            nodes, path = getattr(MapSolver(None, start, goals, graph=graph), METHODS[method])()
+            seconds = time.perf_counter() - began
+        finally:
+            graph.release()
+            memory.close()
+        results.put((method, nodes, path, seconds, None))
+    except Exception as error:
+        results.put((method, 0, None, 0.0, f"{type(error).__name__}: {error}"))
+
+def proven_optimal(solver: MapSolver, method: str, path) -> bool:
+    """
+    Function that checks if the result of a method is known to be a shortest path
+
+    Args:
+        solver: The MapSolver of the map
+        method: Name of the method, as used by search.py
+        path: The path found by the method, None if no goal is reachable
+    Return:
+        true: If the method always finds a shortest path, no path exists,
+            or the path is as short as the Manhattan distance to the nearest goal
+        false: Otherwise
+    """
+    if method in OPTIMAL_METHODS or path is None:
+        return True
+    x, y = solver.start
+    return len(path) - 1 == min(abs(x - goal_x) + abs(y - goal_y) for goal_x, goal_y in solver.goals)
+
+def portfolio_search(solver: MapSolver, methods: list = None, optimal: bool = False, log: str = None) -> tuple[str, int, list]:
+    """
+    Function that races several methods in separate processes on the same map, keeping the first result
+
+    The walls and neighbor table of the map are put once in shared memory, which every process searches in place.
+    The processes still running when the winner is known are terminated. With optimal, a result is only kept
+    once it is proven to be a shortest path; if no result can be proven, the shortest one is kept after all
+    methods finished.
+
+    Args:
+        solver: The MapSolver of the map
+        methods: Names of the methods, as used by search.py, DEFAULT_METHODS if not given
+        optimal: Keep the first result proven to be a shortest path instead of the first result
+        log: Path of a file to which a JSON line describing the race and its winner is appended
+    Return:
+        winner: Name of the method whose result is kept
+        nodes: Number of nodes traversed by the winner
+        path: The path found by the winner, None if no goal is reachable
+    Raise:
+        ValueError: If a method is unknown, or is ALL, which solves another problem
+        RuntimeError: If every method failed
+    """
+    methods = list(dict.fromkeys(methods or DEFAULT_METHODS))
+    unknown = [method for method in methods if method not in METHODS or method == "ALL"]
+    if unknown:
+        raise ValueError(f"Unknown portfolio methods {', '.join(unknown)}; choose from {', '.join(method for method in METHODS if method != 'ALL')}")
+
+    graph = solver.graph
+    began = time.perf_counter()
+    edges = len(graph.targets)
+    memory = shared_memory.SharedMemory(create=True, size=graph_bytes(graph.size, edges))
+    members = {}
+    finished = []
+    winner = None
+    try:
+        copy_graph(graph, memory.buf)
+        results = multiprocessing.Queue()
+        for method in methods:
+            members[method] = multiprocessing.Process(target=run_member, daemon=True,
+                                                      args=(memory.name, graph.width, graph.height, edges, solver.start, solver.goals, method, results))
+            members[method].start()
+
+        while len(finished) < len(members):
+            try:
+                result = results.get(timeout=POLL_SECONDS)
+            except queue.Empty:
+                # A member killed before sending its result would otherwise be waited for forever
+                if not any(member.is_alive() for member in members.values()) and results.empty():
+                    break
+                continue
+            finished.append(result)
+            method, nodes, path, seconds, error = result
+            if error is None and (not optimal or proven_optimal(solver, method, path)):
+                winner = result
+                break
+    finally:
+        for member in members.values():
+            if member.is_alive():
+                member.terminate()
+        for member in members.values():
+            member.join()
+        memory.close()
+        memory.unlink()
+
+    succeeded = [result for result in finished if result[4] is None]
+    if not succeeded:
+        errors = "; ".join(f"{result[0]}: {result[4]}" for result in finished)
+        raise RuntimeError(f"Every portfolio method failed{'; ' + errors if errors else ''}")
+    if winner is None:
+        winner = min(succeeded, key=lambda result: len(result[2]))
+    method, nodes, path, seconds, _ = winner
+
+    if log is not None:
+        record = {
+            "map": map_fingerprint(graph),
+            "width": graph.width,
+            "height": graph.height,
+            "walls": graph.walls.count(1),
+            "goals": len(solver.goals),
+            "methods": methods,
+            "optimal": optimal,
+            "winner": method,
+            "proven_optimal": proven_optimal(solver, method, path),
+            "nodes": nodes,
+            "path_length": None if path is None else len(path) - 1,
+            "search_seconds": round(seconds, 6),
+            "seconds": round(time.perf_counter() - began, 6),
+            "finished": [result[0] for result in finished],
+        }
+        with open(log, "a") as file:
+            file.write(json.dumps(record) + "\n")
+    return method, nodes, path
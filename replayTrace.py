@@ -0,0 +1,47 @@
+import argparse
+import sys
+from mapSolver import MapSolver
+from searchTrace import read_trace, render_trace, write_png
+from solverCache import map_fingerprint
+from utils import parse_grid, MapFormatError
+
+# Side in pixels of the rendered map when no scale is given
+IMAGE_SIDE = 512
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a search trace recorded with search.py --trace, without running the search")
+    parser.add_argument("map", help="the map file the trace was recorded on")
+    parser.add_argument("trace", help="the trace file")
+    parser.add_argument("--png", help="render the final state of the search to this PNG file instead of opening the visualizer")
+    parser.add_argument("--heatmap", action="store_true", help="color the PNG by how many times each cell was expanded")
+    parser.add_argument("--scale", type=int, help="side of each cell in pixels of the PNG")
+    args = parser.parse_args()
+    if args.heatmap and not args.png:
+        parser.error("--heatmap needs --png")
+
+    try:
+        start, goals, map = parse_grid(filename=args.map)
+        header, events = read_trace(args.trace)
+    except (OSError, MapFormatError, ValueError) as error:
+        print(error)
+        sys.exit(1)
+
+    solver = MapSolver(map, start, goals)
+    if header.fingerprint != map_fingerprint(solver.graph):
+        print(f"{args.trace} was recorded on another map than {args.map}")
+        sys.exit(1)
+
+    if args.png:
+        scale = args.scale or max(1, IMAGE_SIDE // max(header.width, header.height, 1))
+        pixels = render_trace(solver, events, heatmap=args.heatmap)
+        write_png(args.png, pixels, header.width, header.height, scale)
+        return
+
+    # The visualizer needs customtkinter, which the PNG renderer does without
+    from map import Map
+    map_viz = Map(solver)
+    map_viz.play_steps(events, status=f"Replaying {header.method}...")
+    map_viz.mainloop()
+
+if __name__ == "__main__":
+    main()
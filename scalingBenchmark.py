@@ -0,0 +1,103 @@
+import argparse
+import csv
+import inspect
+import io
+import sys
+import time
+from mapGenerator import GENERATORS, format_map, generate_map, sweep_sizes
+from mapSolver import MapSolver, METHODS
+from searchStats import SearchStats
+from utils import parse_grid
+
+# Fields written for each (kind, cells, method) result, in CSV column order
+FIELDS = ["kind", "cells", "walls", "method", "nodes", "expansions", "path_length", "seconds", "us_per_cell"]
+
+def generated_map(kind: str, rows: int, columns: int, seed: int = None) -> tuple[tuple, set, list, int]:
+    """
+    Function that generates a map and reads it back with parse_grid, as a map file would be
+
+    Args:
+        kind: Name of the generator, one of mapGenerator.GENERATORS
+        rows: Number of rows of the map
+        columns: Number of columns of the map
+        seed: Seed of the generator
+    Return:
+        start: Coordinate of the starting point
+        goals: A set of goal points
+        map: A 2D array representing the map
+        walls: Number of wall rectangles
+    """
+    start, goals, walls = generate_map(kind, rows, columns, seed)
+    start, goals, map = parse_grid(io.StringIO(format_map(rows, columns, start, goals, walls)))
+    return start, goals, map, len(walls)
+
+def run_sweep(kinds: list, methods: list, max_exponent: int, seed: int = None, output=sys.stdout) -> list:
+    """
+    Function that times every method once on generated maps from 10^2 to 10^max_exponent cells
+
+    Args:
+        kinds: Names of the generators
+        methods: Names of the methods, as used by search.py
+        max_exponent: The largest map has about 10 ** max_exponent cells
+        seed: Seed of the generators
+        output: Stream receiving the progress lines, None to stay silent
+    Return:
+        results: A list of dictionaries with the FIELDS of each result
+    """
+    results = []
+    if output:
+        output.write(f"{'kind':<10} {'cells':>10} {'method':<6} {'nodes':>10} {'seconds':>10} {'us/cell':>8}\n")
+    for kind in kinds:
+        for rows, columns in sweep_sizes(2, max_exponent):
+            start, goals, map, walls = generated_map(kind, rows, columns, seed)
+            solver = MapSolver(map, start, goals)
+            for method in methods:
+                search = getattr(solver, METHODS[method])
+                started = time.perf_counter()
+                nodes, path = search()
+                seconds = time.perf_counter() - started
+
+                # Expansions are counted in a separate run, so that the timed run stays untouched
+                stats = None
+                if "stats" in inspect.signature(search).parameters:
+                    stats = SearchStats()
+                    search(stats=stats)
+
+                result = {
+                    "kind": kind,
+                    "cells": rows * columns,
+                    "walls": walls,
+                    "method": method,
+                    "nodes": nodes,
+                    "expansions": stats.expansions if stats else None,
+                    "path_length": len(path) - 1 if path is not None else None,
+                    "seconds": seconds,
+                    "us_per_cell": seconds / (rows * columns) * 1e6,
+                }
+                results.append(result)
+                if output:
+                    output.write(f"{kind:<10} {result['cells']:>10} {method:<6} {nodes:>10} {seconds:>10.4f} {result['us_per_cell']:>8.3f}\n")
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the search methods on generated maps of growing size")
+    parser.add_argument("--kinds", nargs="+", choices=GENERATORS, default=list(GENERATORS), help="layouts of the generated maps")
+    parser.add_argument("--methods", nargs="+", default=["BFS", "AS"], help="names of the methods, as used by search.py")
+    parser.add_argument("--max-exponent", type=int, default=6, help="the largest map has about 10^MAX_EXPONENT cells, up to 7")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the generators")
+    parser.add_argument("--output", help="write the results to this CSV file")
+    args = parser.parse_args()
+
+    unknown = [method for method in args.methods if method not in METHODS]
+    if unknown:
+        parser.error(f"Unknown methods {', '.join(unknown)}; choose from {', '.join(METHODS)}")
+
+    results = run_sweep(args.kinds, args.methods, args.max_exponent, args.seed)
+    if args.output:
+        with open(args.output, "w", newline="") as file:
+            writer = csv.DictWriter(file, fieldnames=FIELDS)
+            writer.writeheader()
+            writer.writerows(results)
+
+if __name__ == "__main__":
+    main()
@@ -1,51 +1,171 @@
 import sys
 from utils import *
-from mapSolver import MapSolver
+from mapSolver import MapSolver, METHODS
+from solverCache import SolverCache
+from batchSolver import run_batch
+from searchStats import SearchStats
+from portfolioSolver import portfolio_search
 from map import *
 
+def pop_flag_value(flag: str) -> str:
+    """
+    Function that removes a flag and the value following it from the command line
+
+    Args:
+        flag: The flag, such as "--cache"
+    Return:
+        value: The value given after the flag
+    """
+    index = sys.argv.index(flag)
+    if index + 1 == len(sys.argv) or sys.argv[index + 1].startswith("--"):
+        print(f"Usage: search.py <map> <METHOD> [{flag} <file>]: {flag} needs a file")
+        sys.exit(1)
+    value = sys.argv[index + 1]
+    del sys.argv[index:index + 2]
+    return value
+
 def main():
+    # --batch <dir|manifest> <METHOD...> solves many maps in parallel, printing one JSON line per result
+    if len(sys.argv) > 3 and sys.argv[1] == "--batch":
+        try:
+            run_batch(sys.argv[2], sys.argv[3:])
+        except (FileNotFoundError, ValueError) as error:
+            print(error)
+            sys.exit(1)
+        return
+
+    # --cache <file> keeps the results of searches in a file to reuse them in later runs
+    cache = None
+    if "--cache" in sys.argv:
+        cache = SolverCache(path=pop_flag_value("--cache"))
+
+    # --stats prints the counters and phase times of the search after its result
+    stats = None
+    if "--stats" in sys.argv:
+        stats = SearchStats()
+        sys.argv.remove("--stats")
+
+    # --trace <file> records the events of the search to a trace file, replayed by replayTrace.py
+    trace = None
+    if "--trace" in sys.argv:
+        trace = pop_flag_value("--trace")
+
+    # --optimal makes PORTFOLIO keep the first result proven to be a shortest path,
+    # --portfolio-log <file> appends the winner of each PORTFOLIO race to a file of JSON lines
+    portfolio = {"optimal": "--optimal" in sys.argv, "log": None}
+    if portfolio["optimal"]:
+        sys.argv.remove("--optimal")
+    if "--portfolio-log" in sys.argv:
+        portfolio["log"] = pop_flag_value("--portfolio-log")
+
+    try:
+        solve(cache, stats, trace, portfolio)
+    finally:
+        if cache:
+            cache.close()
+
+def solve(cache, stats=None, trace=None, portfolio=None):
     filename = sys.argv[1]
-    start, goals, map = parse_grid(filename=filename)
+    try:
+        start, goals, map = parse_grid(filename=filename)
+    except (OSError, MapFormatError) as error:
+        print(f"Cannot read map {filename}: {error}")
+        sys.exit(1)
     # print(map)
 
     # for line in map:
     #     print(line)
 
-    solver = MapSolver(map, start, goals)
+    try:
+        solver = MapSolver(map, start, goals, cache=cache)
+    except ValueError as error:
+        print(f"Cannot solve map {filename}: {error}")
+        sys.exit(1)
+
+    if (len(sys.argv) >= 3 and sys.argv[2] == "PORTFOLIO"):
+        # Race the given methods, or the default ones, in separate processes and keep the first result
+        try:
+            winner, nodes, path = portfolio_search(solver, sys.argv[3:], **(portfolio or {}))
+        except (ValueError, RuntimeError) as error:
+            print(error)
+            sys.exit(1)
+
+        print(f"{filename} PORTFOLIO {winner}")
+        if (path != None):
+            print(f"<Node {path[-1][0]}> {nodes}")
+            if len(path[:-1]) > 0:
+                print([direction for _, direction in path[:-1]])
+            else:
+                print("Already at the goal")
+        else:
+            print(f"No goal is reachable; {nodes}")
+
+    elif (len(sys.argv) == 3):
+        if sys.argv[2] not in METHODS:
+            print(f"Unknown method {sys.argv[2]}; choose one of {', '.join(METHODS)}")
+            return
+        if trace is not None:
+            nodes, path = solver.record(METHODS[sys.argv[2]], trace)
+        elif stats is not None:
+            nodes, path = getattr(solver, METHODS[sys.argv[2]])(stats=stats)
+        else:
+            nodes, path = getattr(solver, METHODS[sys.argv[2]])()
 
-    if (len(sys.argv) == 3):
-        if sys.argv[2] == "ALL":
-            path = solver.astar_multi_goals()
-            print([direction for _, direction in path[:-1]])  
+        # Show result
+        if (path != None):
+            print(f"{filename} {sys.argv[2]}")
+            print(f"<Node {path[-1][0]}> {nodes}")
+            if len(path[:-1]) > 0:
+                print([direction for _, direction in path[:-1]])  
+            else:
+                print("Already at the goal")
         else:
-            if (sys.argv[2] == "DFS"):
-                nodes, path = solver.depth_first_search()
-            elif (sys.argv[2] == "BFS"):
-                nodes, path = solver.breadth_first_search()
-            elif (sys.argv[2] == "GBFS"):
-                nodes, path = solver.greedy_best_first_search()
-            elif (sys.argv[2] == "AS"):
-                nodes, path = solver.astar()
-            elif (sys.argv[2] == "CUS1"):
-                nodes, path = solver.iterative_deepening_search()
-            elif (sys.argv[2] == "CUS2"):
-                nodes, path = solver.ida_star()
-
-            # Show result
-            if (path != None):
-                print(f"{filename} {sys.argv[2]}")
-                print(f"<Node {path[-1][0]}> {nodes}")
-                if len(path[:-1]) > 0:
-                    print([direction for _, direction in path[:-1]])  
-                else:
-                    print("Already at the goal")
+            print(f"{filename} {sys.argv[2]}")
+            if sys.argv[2] == "ALL":
+                print(f"Not all goals are reachable; {nodes}")
             else:
-                print(f"{filename} {sys.argv[2]}")
                 print(f"No goal is reachable; {nodes}")
 
+        # A recorded search runs its step version, which keeps no counters
+        if stats is not None and trace is None:
+            print_stats(stats)
+
+    elif (len(sys.argv) == 4 and sys.argv[2] == "MANY"):
+        # Route every starting point listed in the given file to its nearest goal
+        try:
+            starts = parse_starts(sys.argv[3])
+        except (OSError, MapFormatError) as error:
+            print(f"Cannot read starting points {sys.argv[3]}: {error}")
+            sys.exit(1)
+        nodes, paths = solver.solve_many(starts)
+
+        print(f"{filename} MANY {len(starts)}")
+        print(f"Nodes traversed: {nodes}")
+        for start, path in zip(starts, paths):
+            if path is None:
+                print(f"{start} No goal is reachable")
+            elif len(path[:-1]) > 0:
+                print(f"{start} <Node {path[-1][0]}> {[direction for _, direction in path[:-1]]}")
+            else:
+                print(f"{start} <Node {path[-1][0]}> Already at the goal")
+
     elif(len(sys.argv) == 2):
         map_viz = Map(solver)
         map_viz.mainloop()
 
+def print_stats(stats: SearchStats):
+    """
+    Function that prints the counters of a search, one per line, and the wall time of its phases in milliseconds
+
+    Args:
+        stats: The SearchStats filled in by the search
+    """
+    for name, value in stats.as_dict().items():
+        if name == "phase_seconds":
+            for phase, seconds in value.items():
+                print(f"{phase}_ms: {seconds * 1000:.3f}")
+        else:
+            print(f"{name}: {value}")
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
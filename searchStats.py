@@ -0,0 +1,197 @@
+import time
+from collections import deque
+from frontier import PriorityFrontier
+
+# Attributes of SearchStats that are bookkeeping rather than counters
+INTERNAL = ("expanded", "current_phase", "phase_started")
+
+class SearchStats:
+    def __init__(self):
+        """
+        Initializes the counters filled in by a search when a SearchStats is passed to it.
+
+        Searches only update the counters when they are given one, swapping in the counting frontiers and views
+        below. Without one they still test a flag for every cell expanded and every cell pushed, which costs about
+        1% of the search time. Counters add up over several searches given the same SearchStats.
+        - expansions: Cells expanded, re_expansions of them had already been expanded before
+        - generated: Neighbors looked at while expanding cells, or jump points found by Jump Point Search
+        - pushes, pops, decrease_keys: Operations on the frontier, a decrease-key lowers the cost of a queued cell
+        - peak_frontier: Largest number of cells waiting in the frontier
+        - peak_closed: Number of distinct cells expanded
+        - heuristic_evaluations: Heuristic values looked up
+        - iterations: Iterations of the iterative deepening searches, or searches run by ALL
+        - phase_seconds: Wall time of each phase of the search, such as setup, search and path
+        """
+        self.expansions = 0
+        self.generated = 0
+        self.pushes = 0
+        self.pops = 0
+        self.decrease_keys = 0
+        self.peak_frontier = 0
+        self.peak_closed = 0
+        self.heuristic_evaluations = 0
+        self.re_expansions = 0
+        self.iterations = 0
+        self.phase_seconds = {}
+        self.expanded = bytearray()
+        self.current_phase = None
+        self.phase_started = 0.0
+
+    def begin(self, size: int):
+        """
+        Function that prepares the counters for a search, starting its setup phase
+
+        Args:
+            size: Number of cells of the map
+        """
+        self.expanded = bytearray(size)
+        self.phase("setup")
+
+    def phase(self, name: str):
+        """
+        Function that ends the current phase and starts another one
+
+        Args:
+            name: Name of the new phase, None to only end the current one
+        """
+        now = time.perf_counter()
+        if self.current_phase is not None:
+            self.phase_seconds[self.current_phase] = self.phase_seconds.get(self.current_phase, 0.0) + now - self.phase_started
+        self.current_phase, self.phase_started = name, now
+
+    def end(self):
+        """
+        Function that ends the last phase of a search
+        """
+        self.phase(None)
+
+    def expand(self, cell: int, frontier_size: int):
+        """
+        Function that counts the expansion of a cell
+
+        Args:
+            cell: ID of the expanded cell
+            frontier_size: Number of cells waiting in the frontier when the cell is expanded
+        """
+        self.expansions += 1
+        if self.expanded[cell]:
+            self.re_expansions += 1
+        else:
+            self.expanded[cell] = 1
+            self.peak_closed += 1
+        if frontier_size > self.peak_frontier:
+            self.peak_frontier = frontier_size
+
+    def as_dict(self) -> dict:
+        """
+        Function that lists the counters
+
+        Return:
+            counters: A dictionary of the counters by name
+        """
+        return {name: value for name, value in vars(self).items() if name not in INTERNAL}
+
+class CountingFrontier(PriorityFrontier):
+    def __init__(self, stats: SearchStats):
+        """
+        Initializes a PriorityFrontier counting its pushes, pops and decrease-keys.
+
+        Args:
+            stats: The SearchStats receiving the counters
+        """
+        super().__init__()
+        self.stats = stats
+
+    def __setitem__(self, cell, cost):
+        if cell in self.entries:
+            self.stats.decrease_keys += 1
+        else:
+            self.stats.pushes += 1
+        super().__setitem__(cell, cost)
+
+    def pop(self) -> tuple:
+        self.stats.pops += 1
+        return super().pop()
+
+class CountingQueue(deque):
+    def __init__(self, stats: SearchStats, cells=()):
+        """
+        Initializes a first-in first-out frontier counting its pushes and pops.
+
+        Args:
+            stats: The SearchStats receiving the counters
+            cells: Cells already in the frontier, counted as pushes
+        """
+        super().__init__(cells)
+        self.stats = stats
+        stats.pushes += len(self)
+
+    def append(self, cell):
+        self.stats.pushes += 1
+        super().append(cell)
+
+    def popleft(self):
+        self.stats.pops += 1
+        return super().popleft()
+
+class CountingStack(list):
+    def __init__(self, stats: SearchStats, cells=()):
+        """
+        Initializes a last-in first-out frontier counting its pushes and pops.
+
+        Args:
+            stats: The SearchStats receiving the counters
+            cells: Cells already in the frontier, counted as pushes
+        """
+        super().__init__(cells)
+        self.stats = stats
+        stats.pushes += len(self)
+
+    def append(self, cell):
+        self.stats.pushes += 1
+        super().append(cell)
+
+    def pop(self, *args):
+        self.stats.pops += 1
+        return super().pop(*args)
+
+class CountingView:
+    def __init__(self, values, stats: SearchStats, counter: str):
+        """
+        Initializes a read-only view of an array counting how many values are read from it.
+
+        Searches read neighbors from a view of GridGraph.targets to count generated cells,
+        and heuristic values from a view of their heuristic field.
+
+        Args:
+            values: The array to read from
+            stats: The SearchStats receiving the counter
+            counter: Name of the counter of stats to increase on each read
+        """
+        self.values = values
+        self.stats = stats
+        self.counter = counter
+
+    def __getitem__(self, index):
+        stats = self.stats
+        setattr(stats, self.counter, getattr(stats, self.counter) + 1)
+        return self.values[index]
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+def counted(function, stats: SearchStats, counter: str):
+    """
+    Function that wraps a function to count its calls
+
+    Args:
+        function: The function to count, such as a heuristic
+        stats: The SearchStats receiving the counter
+        counter: Name of the counter of stats to increase on each call
+    Return:
+        wrapper: The function counting its calls
+    """
+    def wrapper(*args):
+        setattr(stats, counter, getattr(stats, counter) + 1)
+        return function(*args)
+    return wrapper
@@ -0,0 +1,108 @@
+from typing import NamedTuple
+
+class Expand(NamedTuple):
+    """
+    Event of a cell taken from the frontier and expanded
+    """
+    cell: tuple
+
+class Enqueue(NamedTuple):
+    """
+    Event of a cell added to the frontier, or queued again at a lower cost
+    """
+    cell: tuple
+
+class ThresholdRaise(NamedTuple):
+    """
+    Event of a new iteration of an iterative deepening search, with its depth limit or cost threshold
+    restart tells if the iteration starts again from the start instead of resuming where the last one stopped
+    """
+    threshold: int
+    restart: bool
+
+class PathFound(NamedTuple):
+    """
+    Event of a goal reached, with the path to it
+    """
+    path: list
+
+class Finished(NamedTuple):
+    """
+    Last event of every search, with its result
+    """
+    nodes: int
+    path: list
+
+def run_steps(steps, handle=None) -> tuple[int, list]:
+    """
+    Function that runs a step generator to its end
+
+    Args:
+        steps: A generator of search events
+        handle: Optional function called with every event
+    Return:
+        nodes: Number of nodes traversed
+        path: The path found, None if no goal is reachable
+    """
+    for event in steps:
+        if handle is not None:
+            handle(event)
+        if type(event) is Finished:
+            return event.nodes, event.path
+
+def visualize(steps, viz) -> tuple[int, list]:
+    """
+    Function that runs a step generator while showing its events in the Map visualizer
+
+    Args:
+        steps: A generator of search events
+        viz: an instance of Map class
+    Return:
+        nodes: Number of nodes traversed
+        path: The path found, None if no goal is reachable
+    """
+    for event in steps:
+        kind = type(event)
+        if kind is Expand:
+            viz.update_map(event.cell)
+            viz.update_idletasks()
+            viz.after(50)
+        elif kind is ThresholdRaise and event.restart:
+            viz.reset_map()
+            viz.update_idletasks()
+            viz.after(50)
+        elif kind is PathFound:
+            viz.show_path(event.path)
+        elif kind is Finished:
+            return event.nodes, event.path
+
+def result_steps(search):
+    """
+    Function that turns a search without a step version into a step generator
+    The search runs at once, only its path and result are yielded
+
+    Args:
+        search: A bound search method of MapSolver
+    Yield:
+        events: PathFound if a path is found, then Finished
+    """
+    nodes, path = search()
+    if path is not None:
+        yield PathFound(path)
+    yield Finished(nodes, path)
+
+def found(solver, start: int, moves: bytearray, nodes: int):
+    """
+    Function that yields the closing events of a search that reached a goal
+
+    Args:
+        solver: The MapSolver searched
+        start: ID of the starting cell
+        moves: Direction codes of all moves from the starting cell to the goal
+        nodes: Number of nodes traversed
+    Yield:
+        events: PathFound, then Finished
+    """
+    path = solver.make_path(start, moves)
+    yield PathFound(path)
+    yield Finished(nodes, path)
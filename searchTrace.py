@@ -0,0 +1,365 @@
+import struct
+import zlib
+from typing import NamedTuple
+from gridGraph import DIRECTIONS
+from searchSteps import Expand, Enqueue, ThresholdRaise, PathFound, Finished, run_steps
+from solverCache import map_fingerprint
+
+# First bytes of every trace file, followed by the version of the format
+MAGIC = b"MSTR"
+VERSION = 1
+
+# Event codes, kept in the two low bits of the varint of each record
+EXPAND = 0
+ENQUEUE = 1
+ITERATION = 2
+RESULT = 3
+
+# Bytes buffered by TraceWriter before writing them to the file
+FLUSH_BYTES = 1 << 16
+
+# Direction code of each direction name of a path
+MOVE_CODES = {direction: code for code, direction in enumerate(DIRECTIONS)}
+
+# Change of (x, y) made by each move, in the order of the direction codes
+MOVE_OFFSETS = ((0, -1), (-1, 0), (0, 1), (1, 0))
+
+# RGB colors of the offline renderer, the same as the Map visualizer
+WALL_RGB = (0x00, 0x00, 0x00)
+EMPTY_RGB = (0xFF, 0xFF, 0xFF)
+EXPANDED_RGB = (0xFF, 0xBA, 0x08)
+FRONTIER_RGB = (0xFF, 0xE2, 0x9A)
+PATH_RGB = (0x1D, 0xB9, 0x54)
+START_RGB = (0xD0, 0x00, 0x00)
+GOAL_RGB = (0x1D, 0xB9, 0x54)
+# Heatmap colors of the cells expanded the fewest and the most times
+COLD_RGB = (0xFF, 0xE2, 0x9A)
+HOT_RGB = (0xD0, 0x00, 0x00)
+
+class TraceHeader(NamedTuple):
+    """
+    Header of a trace file, telling on which map and with which search it was recorded
+    """
+    fingerprint: str
+    method: str
+    width: int
+    height: int
+    start: tuple
+
+def put_varint(buffer: bytearray, value: int):
+    """
+    Function that appends a non-negative integer as a varint, 7 bits per byte with the high bit set on all but the last
+
+    Args:
+        buffer: The bytes to append to
+        value: The integer to encode
+    """
+    while value > 0x7F:
+        buffer.append(value & 0x7F | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+def get_varint(data: bytes, position: int) -> tuple[int, int]:
+    """
+    Function that reads a varint
+
+    Args:
+        data: The encoded bytes
+        position: Index of the first byte of the varint
+    Return:
+        value: The decoded integer
+        position: Index of the byte after the varint
+    """
+    value = shift = 0
+    while True:
+        byte = data[position]
+        position += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, position
+        shift += 7
+
+def pack_moves(moves) -> bytes:
+    """
+    Function that packs direction codes four to a byte
+
+    Args:
+        moves: Direction codes, 0 up, 1 left, 2 down, 3 right
+    Return:
+        packed: The packed bytes, the first move in the two low bits of the first byte
+    """
+    packed = bytearray((len(moves) + 3) // 4)
+    for index, move in enumerate(moves):
+        packed[index >> 2] |= move << ((index & 3) * 2)
+    return bytes(packed)
+
+def unpack_moves(packed: bytes, count: int) -> bytes:
+    """
+    Function that unpacks direction codes packed by pack_moves
+
+    Args:
+        packed: The packed bytes
+        count: Number of moves
+    Return:
+        moves: The direction codes
+    """
+    return bytes((packed[index >> 2] >> ((index & 3) * 2)) & 3 for index in range(count))
+
+class TraceWriter:
+    def __init__(self, file, solver, method: str):
+        """
+        Initializes a writer of the events of a search to a binary trace file.
+
+        The header holds the map fingerprint, the method name, the map size and the starting cell. Each event is
+        then a single varint, with its code in the two low bits:
+        - Expand and Enqueue: the change of cell ID from the previous Expand or Enqueue, zigzag encoded,
+          so that the neighboring cells of most searches take one byte
+        - ThresholdRaise: the threshold and the restart flag, marking the iteration boundaries of IDS and IDA*
+        - PathFound: the number of moves, followed by the moves packed four to a byte
+        - Finished: the number of nodes and whether a path was found, which is the last PathFound
+        Events are buffered and written in blocks, so recording costs about one encoding per event.
+
+        Args:
+            file: A binary file open for writing
+            solver: The MapSolver searched
+            method: Name of the search method, such as "astar"
+        """
+        graph = solver.graph
+        self.file = file
+        self.width = graph.width
+        self.last = graph.cell_id(solver.start)
+
+        buffer = bytearray(MAGIC)
+        buffer.append(VERSION)
+        fingerprint = bytes.fromhex(map_fingerprint(graph))
+        put_varint(buffer, len(fingerprint))
+        buffer += fingerprint
+        name = method.encode()
+        put_varint(buffer, len(name))
+        buffer += name
+        for value in (graph.width, graph.height, self.last):
+            put_varint(buffer, value)
+        self.buffer = buffer
+
+    def write(self, event):
+        """
+        Function that records one event of a search
+
+        Args:
+            event: An event of searchSteps
+        """
+        kind = type(event)
+        buffer = self.buffer
+        if kind is Expand or kind is Enqueue:
+            x, y = event.cell
+            cell = y * self.width + x
+            delta = cell - self.last
+            self.last = cell
+            put_varint(buffer, (delta << 3 if delta >= 0 else (-delta << 3) - 4) | (kind is Enqueue))
+        elif kind is ThresholdRaise:
+            put_varint(buffer, int(event.threshold) << 3 | event.restart << 2 | ITERATION)
+        elif kind is PathFound:
+            path = event.path
+            moves = path if isinstance(path, bytes) else [MOVE_CODES[direction] for _, direction in path[:-1]]
+            put_varint(buffer, len(moves) << 3 | RESULT)
+            buffer += pack_moves(moves)
+        elif kind is Finished:
+            put_varint(buffer, event.nodes << 4 | (event.path is not None) << 3 | 1 << 2 | RESULT)
+
+        if len(buffer) >= FLUSH_BYTES:
+            self.flush()
+
+    def flush(self):
+        """
+        Function that writes the buffered events to the file
+        """
+        self.file.write(self.buffer)
+        self.buffer = bytearray()
+
+def record_trace(solver, method: str, filename: str, **options) -> tuple[int, list]:
+    """
+    Function that runs a search step by step, recording its events to a trace file
+
+    Args:
+        solver: The MapSolver to search
+        method: Name of the search method, such as "astar"
+        filename: Path of the trace file to write
+        options: Keyword arguments of the step generator, such as max_entries for ida_star
+    Return:
+        nodes: Number of nodes traversed
+        path: The path found, None if no goal is reachable
+    """
+    with open(filename, "wb") as file:
+        writer = TraceWriter(file, solver, method)
+        result = run_steps(solver.steps(method, **options), writer.write)
+        writer.flush()
+    return result
+
+def read_trace(filename: str) -> tuple[TraceHeader, object]:
+    """
+    Function that reads a trace file written by record_trace
+
+    Args:
+        filename: Path of the trace file
+    Return:
+        header: The TraceHeader of the trace
+        events: A generator of the recorded events, as yielded by the search
+    Raise:
+        ValueError: If the file is not a trace of a known version
+    """
+    with open(filename, "rb") as file:
+        data = file.read()
+    if data[:len(MAGIC)] != MAGIC:
+        raise ValueError(f"{filename} is not a search trace")
+    if data[len(MAGIC)] != VERSION:
+        raise ValueError(f"{filename} has trace version {data[len(MAGIC)]}, expected {VERSION}")
+
+    position = len(MAGIC) + 1
+    length, position = get_varint(data, position)
+    fingerprint = data[position:position + length].hex()
+    position += length
+    length, position = get_varint(data, position)
+    method = data[position:position + length].decode()
+    position += length
+    width, position = get_varint(data, position)
+    height, position = get_varint(data, position)
+    start, position = get_varint(data, position)
+
+    header = TraceHeader(fingerprint, method, width, height, (start % width, start // width) if width else (0, 0))
+    return header, trace_events(data, position, header, start)
+
+def trace_events(data: bytes, position: int, header: TraceHeader, start: int):
+    """
+    Function that decodes the events of a trace
+
+    Args:
+        data: The bytes of the trace file
+        position: Index of the first event
+        header: The TraceHeader of the trace
+        start: ID of the starting cell
+    Yield:
+        events: Expand, Enqueue, ThresholdRaise and PathFound events, ending with Finished
+    """
+    width = header.width
+    last = start
+    path = None
+    end = len(data)
+    while position < end:
+        value, position = get_varint(data, position)
+        code = value & 3
+        if code == EXPAND or code == ENQUEUE:
+            zigzag = value >> 2
+            last += -((zigzag + 1) >> 1) if zigzag & 1 else zigzag >> 1
+            y, x = divmod(last, width)
+            yield Expand((x, y)) if code == EXPAND else Enqueue((x, y))
+        elif code == ITERATION:
+            yield ThresholdRaise(value >> 3, bool(value & 4))
+        elif value & 4:
+            yield Finished(value >> 4, path if value & 8 else None)
+        else:
+            count = value >> 3
+            length = (count + 3) // 4
+            path = moves_path(header.start, unpack_moves(data[position:position + length], count))
+            position += length
+            yield PathFound(path)
+
+def moves_path(start: tuple, moves: bytes) -> list:
+    """
+    Function that turns the moves of a trace back into a path
+
+    Args:
+        start: Coordinate of the starting cell
+        moves: Direction codes of all moves from the starting cell to the goal
+    Return:
+        path: A list of (cell, direction) tuples ending with (goal, None)
+    """
+    x, y = start
+    path = []
+    for move in moves:
+        path.append(((x, y), DIRECTIONS[move]))
+        dx, dy = MOVE_OFFSETS[move]
+        x, y = x + dx, y + dy
+    path.append(((x, y), None))
+    return path
+
+def render_trace(solver, events, heatmap: bool = False) -> bytearray:
+    """
+    Function that colors the cells of a map from the events of a trace, without running the search
+
+    Args:
+        solver: The MapSolver of the map the trace was recorded on
+        events: The events of the trace
+        heatmap: Color expanded cells by how many times they were expanded instead of showing the final state
+    Return:
+        pixels: The RGB bytes of the cells, row by row
+    """
+    graph = solver.graph
+    width, size = graph.width, graph.size
+    counts = [0] * size
+    frontier = bytearray(size)
+    path = None
+    for event in events:
+        kind = type(event)
+        if kind is Expand:
+            x, y = event.cell
+            counts[y * width + x] += 1
+        elif kind is Enqueue:
+            x, y = event.cell
+            frontier[y * width + x] = 1
+        elif kind is ThresholdRaise and event.restart and not heatmap:
+            # IDA* starts over, like the visualizer the final state only shows its last iteration
+            counts = [0] * size
+            frontier = bytearray(size)
+        elif kind is PathFound:
+            path = event.path
+
+    highest = max(counts, default=0)
+    pixels = bytearray()
+    for cell in range(size):
+        if graph.walls[cell] == 1:
+            color = WALL_RGB
+        elif counts[cell] and heatmap:
+            heat = (counts[cell] - 1) / max(1, highest - 1)
+            color = tuple(round(cold + (hot - cold) * heat) for cold, hot in zip(COLD_RGB, HOT_RGB))
+        elif counts[cell]:
+            color = EXPANDED_RGB
+        elif frontier[cell] and not heatmap:
+            color = FRONTIER_RGB
+        else:
+            color = EMPTY_RGB
+        pixels += bytes(color)
+
+    marked = [] if heatmap or path is None else [(cell, PATH_RGB) for cell, _ in path[:-1]]
+    marked += [(goal, GOAL_RGB) for goal in solver.goals] + [(solver.start, START_RGB)]
+    for cell, color in marked:
+        if graph.in_map(cell) and graph.walls[graph.cell_id(cell)] != 1:
+            index = graph.cell_id(cell) * 3
+            pixels[index:index + 3] = bytes(color)
+    return pixels
+
+def write_png(filename: str, pixels: bytes, width: int, height: int, scale: int = 1):
+    """
+    Function that writes RGB pixels to a PNG file
+
+    Args:
+        filename: Path of the PNG file
+        pixels: The RGB bytes of the cells, row by row
+        width: Number of cells of a row
+        height: Number of rows
+        scale: Side of each cell in pixels
+    """
+    rows = bytearray()
+    for y in range(height):
+        row = pixels[y * width * 3:(y + 1) * width * 3]
+        if scale > 1:
+            row = b"".join(row[index:index + 3] * scale for index in range(0, len(row), 3))
+        rows += (b"\x00" + row) * scale
+
+    def chunk(tag: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data))
+
+    with open(filename, "wb") as file:
+        file.write(b"\x89PNG\r\n\x1a\n")
+        file.write(chunk(b"IHDR", struct.pack(">IIBBBBB", width * scale, height * scale, 8, 2, 0, 0, 0)))
+        file.write(chunk(b"IDAT", zlib.compress(bytes(rows), 6)))
+        file.write(chunk(b"IEND", b""))
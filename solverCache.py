@@ -0,0 +1,109 @@
+import hashlib
+import pickle
+import shelve
+from collections import OrderedDict
+
+class SolverCache:
+    def __init__(self, max_size: int = 1024, path: str = None):
+        """
+        Initializes a cache of search results.
+
+        Results are kept in memory up to max_size entries, evicting the least recently used one first.
+        When a path is given, results are also written to a shelve database at that path,
+        so they survive across runs of search.py.
+
+        Args:
+            max_size: Maximum number of results kept in memory
+            path: Path of the on-disk database, None to keep results in memory only
+        """
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.disk = shelve.open(path) if path else None
+
+    def key(self, fingerprint: str, start: tuple, goals: set, method: str, *args) -> str:
+        """
+        Function that builds the key of a search
+
+        Args:
+            fingerprint: Content hash of the map
+            start: The starting point
+            goals: A set of all possible goals
+            method: Name of the search method
+            args: Any other arguments that change the result
+        Return:
+            key: A string identifying the search
+        """
+        description = repr((tuple(start), sorted(goals), method, args))
+        return f"{fingerprint}:{hashlib.sha256(description.encode()).hexdigest()}"
+
+    def get(self, key: str, default=None):
+        """
+        Function that retrieves a cached result and counts the hit or miss
+
+        Args:
+            key: Key of the search
+            default: Value returned if the search is not cached
+        Return:
+            result: A fresh copy of the cached result, default if the search is not cached
+        """
+        data = self.entries.get(key)
+        if data is not None:
+            self.entries.move_to_end(key)
+        elif self.disk is not None and key in self.disk:
+            data = self.disk[key]
+            self.remember(key, data)
+
+        if data is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return pickle.loads(data)
+
+    def put(self, key: str, result):
+        """
+        Function that stores the result of a search
+
+        Args:
+            key: Key of the search
+            result: Result returned by the search
+        """
+        data = pickle.dumps(result)
+        self.remember(key, data)
+        if self.disk is not None:
+            self.disk[key] = data
+
+    def remember(self, key: str, data: bytes):
+        """
+        Function that keeps a result in memory, evicting the least recently used results when full
+
+        Args:
+            key: Key of the search
+            data: The pickled result
+        """
+        self.entries[key] = data
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def close(self):
+        """
+        Function that writes the on-disk database and closes it
+        """
+        if self.disk is not None:
+            self.disk.close()
+            self.disk = None
+
+def map_fingerprint(graph) -> str:
+    """
+    Function that computes a content hash of a map
+
+    Args:
+        graph: A GridGraph of the map
+    Return:
+        fingerprint: A hex digest of the size and walls of the map
+    """
+    digest = hashlib.sha256(f"{graph.width}x{graph.height}:".encode())
+    digest.update(graph.walls)
+    return digest.hexdigest()
@@ -0,0 +1,129 @@
+import argparse
+import json
+import socket
+from itertools import count
+
+class SolverClient:
+    def __init__(self, unix: str = None, host: str = "127.0.0.1", port: int = 8765):
+        """
+        Initializes a blocking client of the solver service, see solverService.py for the protocol.
+
+        Args:
+            unix: Path of the Unix socket of the service, TCP is used if None
+            host: Host of the service with TCP
+            port: Port of the service with TCP
+        """
+        if unix:
+            self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.socket.connect(unix)
+        else:
+            self.socket = socket.create_connection((host, port))
+        self.stream = self.socket.makefile("rwb")
+        self.ids = count()
+
+    def request(self, op: str, **fields) -> dict:
+        """
+        Function that sends one request and waits for its response
+
+        Args:
+            op: The operation of the request
+            fields: Other fields of the request
+        Return:
+            response: The decoded response
+        """
+        request_id = next(self.ids)
+        self.stream.write(json.dumps({"id": request_id, "op": op, **fields}).encode() + b"\n")
+        self.stream.flush()
+        line = self.stream.readline()
+        if not line:
+            raise ConnectionError("The service closed the connection")
+        response = json.loads(line)
+        if not response["ok"]:
+            raise RuntimeError(response["error"])
+        return response
+
+    def load(self, map_id: str, path: str = None, text: str = None) -> dict:
+        """
+        Function that loads a map into the service
+
+        Args:
+            map_id: Name of the map
+            path: Path to the map file as seen by the service
+            text: Content of the map file, sent instead of the path
+        Return:
+            response: The size, start and goals of the map
+        """
+        if text is not None:
+            return self.request("load", map_id=map_id, text=text)
+        return self.request("load", map_id=map_id, path=path)
+
+    def solve(self, map_id: str, method: str, start: tuple = None, goals: set = None) -> dict:
+        """
+        Function that solves a loaded map
+
+        Args:
+            map_id: Name of the map
+            method: Name of the method, as used by search.py
+            start: The starting point, the one of the map file if None
+            goals: A set of all possible goals, the ones of the map file if None
+        Return:
+            response: The goal, nodes, path and wall time in seconds of the search
+        """
+        fields = {"map_id": map_id, "method": method}
+        if start is not None:
+            fields["start"] = list(start)
+        if goals is not None:
+            fields["goals"] = [list(goal) for goal in goals]
+        return self.request("solve", **fields)
+
+    def close(self):
+        """
+        Function that closes the connection
+        """
+        self.stream.close()
+        self.socket.close()
+
+def parse_cell(text: str) -> tuple:
+    """
+    Function that parses a cell written as x,y
+
+    Args:
+        text: The cell
+    Return:
+        cell: The (x, y) tuple
+    """
+    x, y = text.split(",")
+    return int(x), int(y)
+
+def main():
+    parser = argparse.ArgumentParser(description="Solve a map with a running solver service")
+    parser.add_argument("--unix", help="path of the Unix socket of the service")
+    parser.add_argument("--host", default="127.0.0.1", help="host of the service with TCP")
+    parser.add_argument("--port", type=int, default=8765, help="port of the service with TCP")
+    parser.add_argument("--start", type=parse_cell, help="starting point as x,y, the one of the map file by default")
+    parser.add_argument("--goal", type=parse_cell, action="append", help="goal as x,y, the ones of the map file by default")
+    parser.add_argument("filename", help="map file, loaded under its own name")
+    parser.add_argument("method", help="name of the method, as used by search.py")
+    args = parser.parse_args()
+
+    client = SolverClient(args.unix, args.host, args.port)
+    try:
+        with open(args.filename, "r") as file:
+            client.load(args.filename, text=file.read())
+        result = client.solve(args.filename, args.method, args.start, args.goal)
+    except (OSError, RuntimeError) as error:
+        print(error)
+        raise SystemExit(1)
+    finally:
+        client.close()
+
+    print(f"{args.filename} {args.method}")
+    if result["path"] is None:
+        reason = "Not all goals are reachable" if args.method == "ALL" else "No goal is reachable"
+        print(f"{reason}; {result['nodes']}")
+    else:
+        print(f"<Node ({result['goal'][0]}, {result['goal'][1]})> {result['nodes']}")
+        print(result["path"] or "Already at the goal")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,312 @@
+import argparse
+import asyncio
+import io
+import json
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import count
+from mapSolver import MapSolver, METHODS
+from utils import parse_grid, read_text, MapFormatError
+
+# Number of map versions each worker keeps to reuse in later requests
+CACHED_MAPS = 8
+# Longest line, in bytes, read from a stream, well above asyncio's default of 64 KiB so that a load request can carry
+# the text of a large map
+LINE_LIMIT = 2**28
+
+solvers = OrderedDict()
+
+def cache_solver(map_key: tuple, text: str) -> MapSolver:
+    """
+    Function that parses a map and keeps its solver for later requests of the worker process
+
+    Args:
+        map_key: The map ID and version, identifying the map content
+        text: Content of the map file
+    Return:
+        solver: The MapSolver of the map
+    """
+    map_start, map_goals, map = parse_grid(io.StringIO(text))
+    solver = MapSolver(map, map_start, map_goals)
+    solvers[map_key] = solver
+    while len(solvers) > CACHED_MAPS:
+        solvers.popitem(last=False)
+    return solver
+
+def load_request(map_key: tuple, text: str) -> tuple:
+    """
+    Function that parses a loaded map inside a worker process, keeping the event loop of the service free
+
+    Args:
+        map_key: The map ID and version, identifying the map content
+        text: Content of the map file
+    Return:
+        rows: Number of rows of the map
+        columns: Number of columns of the map
+        start: The start of the map file
+        goals: The goals of the map file
+    """
+    solver = cache_solver(map_key, text)
+    return solver.graph.height, solver.graph.width, solver.start, solver.goals
+
+def solve_request(map_key: tuple, start: tuple, goals: set, method: str, text: str = None) -> dict:
+    """
+    Function that solves one request inside a worker process
+    The map is parsed the first time the worker sees this version of it, only then does the service send its text
+
+    Args:
+        map_key: The map ID and version, identifying the map content
+        start: The starting point
+        goals: A set of all possible goals
+        method: Name of the method, as used by search.py
+        text: Content of the map file, needed only when the worker does not hold this version of the map
+    Return:
+        result: A dictionary with the goal, nodes, path and wall time in seconds of the search,
+            or None when the worker does not hold the map and no text was given
+    """
+    solver = solvers.get(map_key)
+    if solver is None:
+        if text is None:
+            return None
+        solver = cache_solver(map_key, text)
+    solvers.move_to_end(map_key)
+
+    if not solver.graph.in_map(start):
+        raise ValueError(f"Start {start} is outside the map")
+    # Searches read the start and goals of the solver when they run
+    solver.start, solver.goals = start, goals
+
+    started = time.perf_counter()
+    nodes, path = getattr(solver, METHODS[method])()
+    return {
+        "goal": list(path[-1][0]) if path else None,
+        "nodes": nodes,
+        "path": [direction for _, direction in path[:-1]] if path else None,
+        "seconds": time.perf_counter() - started,
+    }
+
+def parse_point(value, name: str) -> tuple:
+    """
+    Function that checks a point of a request
+
+    Args:
+        value: The decoded point, expected to be a list of two integers
+        name: Name of the point in error messages
+    Return:
+        point: The point as an (x, y) tuple
+    Raise:
+        ValueError: If the point is not a pair of integers
+    """
+    if not isinstance(value, (list, tuple)) or len(value) != 2 or not all(type(part) is int for part in value):
+        raise ValueError(f"{name} must be a pair of integers [x, y], got {value!r}")
+    return tuple(value)
+
+class SolverService:
+    def __init__(self, workers: int = None):
+        """
+        Initializes a service keeping named maps loaded and solving requests on a pool of processes.
+
+        The protocol is one JSON object per line in each direction. Requests carry an "op" and an optional "id",
+        which is copied into the response so that a client can send several requests at the same time:
+        - {"op": "load", "map_id": ..., "path": ...} or {"op": "load", "map_id": ..., "text": ...} loads a map
+        - {"op": "solve", "map_id": ..., "method": ..., "start": [x, y], "goals": [[x, y], ...]} solves it,
+          the start and goals of the map file are used when they are not given
+        - {"op": "unload", "map_id": ...}, {"op": "maps"} and {"op": "ping"}
+        Responses have "ok": true with the result, or "ok": false with an "error".
+
+        Args:
+            workers: Number of worker processes, the number of cores by default
+        """
+        self.maps = {}
+        self.versions = count()
+        self.pool = ProcessPoolExecutor(max_workers=workers)
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """
+        Function that serves one connection, answering each request as soon as it is done
+
+        Args:
+            reader: Stream of the requests
+            writer: Stream of the responses
+        """
+        lock = asyncio.Lock()
+        tasks = set()
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError as error:
+                    # The line is longer than LINE_LIMIT and was dropped, its id is lost with it
+                    await self.send({"ok": False, "error": f"{type(error).__name__}: {error}"}, writer, lock)
+                    continue
+                if not line:
+                    break
+                task = asyncio.create_task(self.respond(line, writer, lock))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            await asyncio.gather(*tasks)
+        except (asyncio.CancelledError, ConnectionError):
+            # The service is shutting down or the client went away
+            pass
+        finally:
+            writer.close()
+
+    async def respond(self, line: bytes, writer: asyncio.StreamWriter, lock: asyncio.Lock):
+        """
+        Function that answers one request
+
+        Args:
+            line: The JSON request
+            writer: Stream of the responses
+            lock: Lock keeping responses of the same connection from interleaving
+        """
+        request = {}
+        try:
+            request = json.loads(line)
+            response = {"ok": True, **await self.dispatch(request)}
+        except (ValueError, KeyError, TypeError, OSError, MapFormatError, RecursionError) as error:
+            response = {"ok": False, "error": f"{type(error).__name__}: {error}"}
+        except Exception as error:
+            # Any other failure, such as a worker that died, still gets a response so the client is not left waiting
+            response = {"ok": False, "error": f"{type(error).__name__}: {error}"}
+        if isinstance(request, dict) and "id" in request:
+            response["id"] = request["id"]
+        await self.send(response, writer, lock)
+
+    async def send(self, response: dict, writer: asyncio.StreamWriter, lock: asyncio.Lock):
+        """
+        Function that writes one response
+
+        Args:
+            response: The response to encode as a JSON line
+            writer: Stream of the responses
+            lock: Lock keeping responses of the same connection from interleaving
+        """
+        async with lock:
+            writer.write(json.dumps(response).encode() + b"\n")
+            await writer.drain()
+
+    async def dispatch(self, request: dict) -> dict:
+        """
+        Function that runs the operation of a request
+
+        Args:
+            request: The decoded request
+        Return:
+            result: Fields added to the response
+        """
+        op = request.get("op")
+        if op == "ping":
+            return {}
+        if op == "maps":
+            return {"maps": sorted(self.maps)}
+        if op == "unload":
+            return {"unloaded": self.maps.pop(request["map_id"], None) is not None}
+        if op == "load":
+            return await self.load(request["map_id"], request.get("text"), request.get("path"))
+        if op == "solve":
+            return await self.solve(request)
+        raise ValueError(f"Unknown op {op!r}")
+
+    async def load(self, map_id: str, text: str = None, path: str = None) -> dict:
+        """
+        Function that loads a map under a name, replacing any map with the same name
+
+        Args:
+            map_id: Name of the map
+            text: Content of the map file
+            path: Path to the map file, read when no text is given
+        Return:
+            result: The size, start and goals of the map
+        """
+        loop = asyncio.get_running_loop()
+        if text is None:
+            text = await loop.run_in_executor(None, read_text, path)
+        map_key = (map_id, next(self.versions))
+        # The worker parsing the map also keeps it, ready for the first requests
+        rows, columns, start, goals = await loop.run_in_executor(self.pool, load_request, map_key, text)
+        self.maps[map_id] = (map_key, text, start, goals)
+        return {"rows": rows, "columns": columns, "start": list(start), "goals": sorted(list(goal) for goal in goals)}
+
+    async def solve(self, request: dict) -> dict:
+        """
+        Function that solves a request on the worker pool
+
+        Args:
+            request: The decoded request
+        Return:
+            result: The goal, nodes, path and wall time in seconds of the search
+        """
+        map_key, text, start, goals = self.maps[request["map_id"]]
+        method = request["method"]
+        if method not in METHODS:
+            raise ValueError(f"Unknown method {method}; choose one of {', '.join(METHODS)}")
+        # Bad points are rejected here, an exception raised in a worker would lose the id of the request
+        if "start" in request:
+            start = parse_point(request["start"], "start")
+        if "goals" in request:
+            if not isinstance(request["goals"], list):
+                raise ValueError(f"goals must be a list of points, got {request['goals']!r}")
+            goals = {parse_point(goal, "goal") for goal in request["goals"]}
+
+        # Only the key of the map goes to the worker, its text is sent again only to a worker that does not hold it
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(self.pool, solve_request, map_key, start, goals, method)
+        if result is None:
+            result = await loop.run_in_executor(self.pool, solve_request, map_key, start, goals, method, text)
+        return result
+
+    def close(self):
+        """
+        Function that stops the worker processes
+        """
+        self.pool.shutdown(cancel_futures=True)
+
+async def serve(service: SolverService, unix: str = None, host: str = "127.0.0.1", port: int = 8765, ready=None):
+    """
+    Function that runs the service until it is cancelled
+
+    Args:
+        service: The SolverService answering requests
+        unix: Path of a Unix socket to listen on instead of TCP
+        host: Host to listen on with TCP
+        port: Port to listen on with TCP, 0 for any free port
+        ready: Optional callback receiving the listening server once it accepts connections
+    """
+    if unix:
+        server = await asyncio.start_unix_server(service.handle, path=unix, limit=LINE_LIMIT)
+    else:
+        server = await asyncio.start_server(service.handle, host, port, limit=LINE_LIMIT)
+    if ready:
+        ready(server)
+    async with server:
+        await server.serve_forever()
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a resident map solving service")
+    parser.add_argument("--unix", help="path of a Unix socket to listen on instead of TCP")
+    parser.add_argument("--host", default="127.0.0.1", help="host to listen on with TCP")
+    parser.add_argument("--port", type=int, default=8765, help="port to listen on with TCP")
+    parser.add_argument("--workers", type=int, help="number of worker processes, the number of cores by default")
+    parser.add_argument("--map", action="append", default=[], metavar="ID=PATH", help="map to load at start up")
+    args = parser.parse_args()
+
+    service = SolverService(args.workers)
+    address = args.unix or f"{args.host}:{args.port}"
+
+    async def start():
+        for entry in args.map:
+            map_id, _, path = entry.partition("=")
+            await service.load(map_id, path=path)
+        await serve(service, args.unix, args.host, args.port, ready=lambda server: print(f"Serving on {address}", flush=True))
+
+    try:
+        asyncio.run(start())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from batchSolver import list_maps, run_batch
+from mapSolver import MapSolver
+from utils import parse_grid
+
+class TestBatchSolver(unittest.TestCase):
+
+    def test_listMaps_ReadDirectoryAndManifest(self):
+        # Test if maps are listed from a directory and from a manifest relative to its location
+        files = list_maps("Test")
+        self.assertIn(os.path.join("Test", "small_map.txt"), files)
+        self.assertIn(os.path.join("Test", "Performance", "maze_like.txt"), files)
+
+        with tempfile.NamedTemporaryFile("w", suffix=".list", dir="Test", delete=False) as manifest:
+            manifest.write("# maps\nsmall_map.txt\n\nPerformance/maze_like.txt\n")
+        try:
+            files = [os.path.relpath(file) for file in list_maps(manifest.name)]
+            self.assertEqual(files, [os.path.join("Test", "small_map.txt"), os.path.join("Test", "Performance", "maze_like.txt")])
+        finally:
+            os.remove(manifest.name)
+
+    def test_runBatch_WriteOneLinePerJob(self):
+        # Test if every (map, method) job writes a JSON line matching a direct search
+        output = io.StringIO()
+        count = run_batch("Test", ["BFS", "AS"], workers=2, output=output)
+        results = [json.loads(line) for line in output.getvalue().splitlines()]
+
+        self.assertEqual(count, len(list_maps("Test")) * 2)
+        self.assertEqual(len(results), count)
+        for result in results:
+            start, goals, map = parse_grid(result["file"])
+            solver = MapSolver(map, start, goals)
+            nodes, path = solver.breadth_first_search() if result["method"] == "BFS" else solver.astar()
+            self.assertEqual(result["nodes"], nodes)
+            self.assertEqual(result["path"], [direction for _, direction in path[:-1]] if path else None)
+            self.assertGreaterEqual(result["seconds"], 0)
+
+    def test_runBatch_RejectUnknownMethod(self):
+        # Test if an unknown method is rejected before any job starts
+        with self.assertRaises(ValueError):
+            run_batch("Test", ["BFS", "XX"], output=io.StringIO())
+
+if __name__ == "__main__":
+    unittest.main()
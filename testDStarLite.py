@@ -0,0 +1,75 @@
+import unittest
+from dstarLite import DStarLite
+from mapSolver import MapSolver
+from utils import parse_grid
+
+class TestDStarLite(unittest.TestCase):
+
+    def setUp(self):
+        self.large_map_start, self.large_goals, self.large_map = parse_grid("Test/large_map.txt")
+        self.extra_large_start, self.extra_large_goals, self.extra_large_map = parse_grid("Test/Performance/extra_large.txt")
+
+    def assertShortest(self, nodes_path, map, start, goals):
+        # The path should be as long as the one of a fresh Breadth First Search and never enter a wall
+        _, path = nodes_path
+        _, expected = MapSolver(map, start, goals).breadth_first_search()
+        self.assertEqual(None if path is None else len(path), None if expected is None else len(expected))
+        if path:
+            self.assertEqual(path[0][0], start)
+            self.assertIn(path[-1][0], goals)
+            for cell, _ in path[1:]:
+                self.assertNotEqual(map[cell[1]][cell[0]], 1)
+
+    def test_plan_MatchFreshSearch(self):
+        # Test if the first plan finds a shortest path
+        solver = DStarLite(self.large_map, self.large_map_start, self.large_goals)
+        self.assertShortest(solver.plan(), self.large_map, self.large_map_start, self.large_goals)
+
+    def test_setWall_RepairPath(self):
+        # Test if blocking the path is repaired with fewer expansions than the first plan
+        map = [row[:] for row in self.extra_large_map]
+        solver = DStarLite(map, self.extra_large_start, self.extra_large_goals)
+        first_nodes, path = solver.plan()
+
+        blocked = path[len(path) // 2][0]
+        solver.set_wall(blocked)
+        map[blocked[1]][blocked[0]] = 1
+        nodes, new_path = solver.plan()
+        self.assertShortest((nodes, new_path), map, self.extra_large_start, self.extra_large_goals)
+        self.assertNotIn(blocked, [cell for cell, _ in new_path])
+        self.assertLess(nodes, first_nodes)
+
+        solver.clear_wall(blocked)
+        map[blocked[1]][blocked[0]] = 0
+        self.assertEqual(len(solver.plan()[1]), len(path))
+
+    def test_moveStart_FollowPath(self):
+        # Test if moving along the path needs no new expansion
+        solver = DStarLite(self.large_map, self.large_map_start, self.large_goals)
+        _, path = solver.plan()
+        solver.move_start(path[1][0])
+        nodes, new_path = solver.plan()
+        self.assertEqual(nodes, 0)
+        self.assertEqual(new_path, path[1:])
+
+    def test_enclosedGoals_ReturnNone(self):
+        # Test if walling every goal in returns None, and clearing a wall finds a path again
+        map = [row[:] for row in self.large_map]
+        solver = DStarLite(map, self.large_map_start, self.large_goals)
+        solver.plan()
+        walled = []
+        for goal in self.large_goals:
+            for cell in [(goal[0], goal[1] - 1), (goal[0] - 1, goal[1]), (goal[0], goal[1] + 1), (goal[0] + 1, goal[1])]:
+                if 0 <= cell[0] < len(map[0]) and 0 <= cell[1] < len(map) and cell not in self.large_goals:
+                    solver.set_wall(cell)
+                    walled.append(cell)
+        self.assertIsNone(solver.plan()[1])
+
+        solver.clear_wall(walled[0])
+        map[walled[0][1]][walled[0][0]] = 0
+        for cell in walled[1:]:
+            map[cell[1]][cell[0]] = 1
+        self.assertShortest(solver.plan(), map, self.large_map_start, self.large_goals)
+
+if __name__ == "__main__":
+    unittest.main()
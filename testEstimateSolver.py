@@ -0,0 +1,40 @@
+import csv
+import os
+import tempfile
+import unittest
+from estimateSolver import FIELDS, compare, run_benchmarks, write_results
+
+class TestEstimateSolver(unittest.TestCase):
+
+    def test_runBenchmarks_MeasureEveryPair(self):
+        # Test if every (map, method) pair gets timings, counters and memory, and can be written as CSV
+        results = run_benchmarks(["Test/small_map.txt", "Test/large_map.txt"], ["BFS", "AS", "ALL"], warmup=1, repeat=3, output=None)
+
+        self.assertEqual([(result["map"], result["method"]) for result in results],
+                         [(map, method) for map in ["Test/small_map.txt", "Test/large_map.txt"] for method in ["BFS", "AS", "ALL"]])
+        for result in results:
+            self.assertLessEqual(result["min_ms"], result["median_ms"])
+            self.assertLessEqual(result["median_ms"], result["p95_ms"])
+            self.assertGreater(result["peak_memory_kib"], 0)
+        self.assertEqual(results[4]["path_length"], 31)
+        self.assertGreater(results[4]["peak_frontier"], 0)
+        self.assertGreater(results[5]["expansions"], results[4]["expansions"])
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "results.csv")
+            write_results(results, path)
+            with open(path, newline="") as file:
+                rows = list(csv.DictReader(file))
+        self.assertEqual(len(rows), len(results))
+        self.assertEqual(list(rows[0]), FIELDS)
+
+    def test_compare_FindRegressions(self):
+        # Test if only medians slower than the baseline by more than the threshold are reported
+        baseline = [{"map": "a", "method": "BFS", "median_ms": 1.0}, {"map": "a", "method": "AS", "median_ms": 1.0}]
+        results = [{"map": "a", "method": "BFS", "median_ms": 1.1}, {"map": "a", "method": "AS", "median_ms": 1.5},
+                   {"map": "b", "method": "AS", "median_ms": 9.0}]
+
+        self.assertEqual(compare(results, baseline, 0.2), [("a", "AS", 1.0, 1.5)])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+from hierarchicalSolver import HierarchicalSolver
+from mapSolver import MapSolver
+from utils import parse_grid
+
+class TestHierarchicalSolver(unittest.TestCase):
+
+    def setUp(self):
+        self.large_map_start, self.large_goals, self.large_map = parse_grid("Test/large_map.txt")
+        self.extra_large_start, self.extra_large_goals, self.extra_large_map = parse_grid("Test/Performance/extra_large.txt")
+
+    def test_search_ValidPathFromEveryCell(self):
+        # Test if every start reaches a goal exactly when Breadth First Search does, along a valid path
+        solver = MapSolver(self.extra_large_map, self.extra_large_start, self.extra_large_goals)
+        graph = solver.graph
+        hierarchy = HierarchicalSolver(graph, cluster_size=8)
+        goals = graph.cell_ids(self.extra_large_goals)
+
+        for cell in range(0, graph.size, 7):
+            solver.start = graph.cell(cell)
+            _, expected = solver.breadth_first_search()
+            _, moves = hierarchy.search(cell, goals)
+            self.assertEqual(moves is None, expected is None)
+            if moves is None:
+                continue
+
+            path = solver.make_path(cell, moves)
+            self.assertGreaterEqual(len(path), len(expected))
+            self.assertIn(path[-1][0], self.extra_large_goals)
+            for (x, y), _ in path[1:]:
+                self.assertNotEqual(self.extra_large_map[y][x], 1)
+
+    def test_hierarchicalSearch_ReuseAbstractGraph(self):
+        # Test if the HPA method builds the abstract graph once and matches the shortest path on the large map
+        solver = MapSolver(self.large_map, self.large_map_start, self.large_goals)
+        nodes, path = solver.hierarchical_search()
+        hierarchy = solver.hierarchy
+        self.assertEqual(len(path), len(solver.astar()[1]))
+
+        solver.start = (0, 0)
+        self.assertIsNotNone(solver.hierarchical_search()[1])
+        self.assertIs(solver.hierarchy, hierarchy)
+
+    def test_refine_CutCornersAtTransitions(self):
+        # Test if refining through the crossed clusters finds the shortest path where the transitions alone detour
+        solver = MapSolver(self.extra_large_map, self.extra_large_start, self.extra_large_goals)
+        _, path = solver.hierarchical_search()
+        self.assertEqual(len(path), len(solver.astar()[1]))
+
+    def test_report_DescribeAbstractGraph(self):
+        # Test if the report counts the clusters and the symmetric edges of the abstract graph
+        graph = MapSolver(self.extra_large_map, self.extra_large_start, self.extra_large_goals).graph
+        report = HierarchicalSolver(graph, cluster_size=10).report()
+        self.assertEqual(report["clusters"], 35)
+        self.assertEqual(report["edges"] % 2, 0)
+        self.assertGreater(report["memory_bytes"], 0)
+
+if __name__ == "__main__":
+    unittest.main()
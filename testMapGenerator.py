@@ -0,0 +1,56 @@
+import io
+import os
+import tempfile
+import unittest
+from mapGenerator import GENERATORS, format_map, generate_map, sweep_sizes, write_map
+from mapSolver import MapSolver
+from utils import parse_grid
+
+class TestMapGenerator(unittest.TestCase):
+
+    def test_generateMap_ReadBackByParseGrid(self):
+        # Test if every kind of map is read back by parse_grid with the same start, goals and walls, and is solvable
+        for kind in GENERATORS:
+            for rows, columns in [(1, 7), (9, 4), (31, 47)]:
+                with self.subTest(kind=kind, rows=rows, columns=columns):
+                    start, goals, walls = generate_map(kind, rows, columns, seed=5)
+                    parsed_start, parsed_goals, map = parse_grid(io.StringIO(format_map(rows, columns, start, goals, walls)))
+
+                    self.assertEqual((parsed_start, parsed_goals), (start, goals))
+                    self.assertEqual((len(map), len(map[0])), (rows, columns))
+                    self.assertEqual(sum(map[y][x] for x, y, width, height in walls), len(walls))
+                    if kind != "rectangles":
+                        _, path = MapSolver(map, start, goals).breadth_first_search()
+                        self.assertIsNotNone(path)
+
+    def test_generateMap_SameSeedSameMap(self):
+        # Test if a seed always gives the same map, and the density of rectangles is reached
+        for kind in GENERATORS:
+            self.assertEqual(generate_map(kind, 40, 60, seed=1), generate_map(kind, 40, 60, seed=1))
+        self.assertNotEqual(generate_map("maze", 40, 60, seed=1), generate_map("maze", 40, 60, seed=2))
+
+        _, _, map = parse_grid(io.StringIO(format_map(50, 50, *generate_map("rectangles", 50, 50, seed=3, density=0.3))))
+        self.assertAlmostEqual(sum(map, []).count(1) / 2500, 0.3, delta=0.02)
+
+    def test_randomRectangles_DenseMapEnds(self):
+        # Test if a density the map cannot reach still ends, with every cell but the start and goal covered
+        for density in (0.99, 1.0):
+            start, goals, walls = generate_map("rectangles", 10, 10, seed=0, density=density)
+            _, _, map = parse_grid(io.StringIO(format_map(10, 10, start, goals, walls)))
+            self.assertEqual(sum(map, []).count(1), 98)
+            self.assertEqual([map[y][x] for x, y in {start} | goals], [0, 0])
+
+    def test_writeMap_Gzip(self):
+        # Test if maps ending with .gz are compressed and still read by parse_grid
+        start, goals, walls = generate_map("rooms", 30, 30, seed=0)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "rooms.txt.gz")
+            write_map(path, 30, 30, start, goals, walls)
+            with open(path, "rb") as file:
+                self.assertEqual(file.read(2), b"\x1f\x8b")
+            self.assertEqual(parse_grid(path)[:2], (start, goals))
+
+        self.assertEqual(sweep_sizes(2, 4), [(10, 10), (32, 32), (100, 100)])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,10 @@
 import unittest
-from mapSolver import MapSolver
+from mapSolver import MapSolver, METHODS, HEURISTIC_FIELDS
+from searchStats import SearchStats
+from searchSteps import Expand
 from utils import parse_grid
+from frontier import PriorityFrontier
+from gridGraph import DIRECTIONS
 
 class TestMapSolver(unittest.TestCase):
 
@@ -91,21 +95,21 @@ class TestMapSolver(unittest.TestCase):
         gbfs_small_accurate_path = ['right', 'right', 'right', 'right', 'down', 'right']
         astar_small_accurate_path = ['right', 'right', 'right', 'right', 'down', 'right']
         cus1_small_accurate_path = ['right', 'right', 'right', 'right', 'down', 'right']
-        cus2_small_accurate_path = ['right', 'right', 'right', 'right', 'down', 'right']
+        cus2_small_accurate_path = ['right', 'right', 'right', 'right', 'right', 'down']
 
         dfs_accurate_medium_path = ['up', 'up', 'up', 'right', 'right', 'up', 'up', 'up', 'up', 'right', 'right', 'right', 'down', 'right', 'up', 'right', 'right', 'right', 'right', 'down', 'down']
         bfs_accurate_medium_path = ['up', 'right', 'right', 'right', 'right', 'right', 'up', 'right', 'right', 'down', 'down']
         gbfs_accurate_medium_path = ['up', 'right', 'right', 'down', 'right', 'right', 'right', 'up', 'up', 'right', 'right', 'down', 'down']
         astar_accurate_medium_path = ['up', 'right', 'right', 'right', 'right', 'right', 'up', 'right', 'right', 'down', 'down']
-        cus1_accurate_medium_path = ['up', 'right', 'right', 'down', 'right', 'up', 'right', 'down', 'right', 'up', 'up', 'right', 'right', 'down', 'down']
-        cus2_accurate_medium_path = ['up', 'right', 'right', 'down', 'right', 'up', 'right', 'down', 'right', 'up', 'up', 'right', 'right', 'down', 'down']
+        cus1_accurate_medium_path = ['up', 'right', 'right', 'right', 'right', 'right', 'up', 'right', 'right', 'down', 'down']
+        cus2_accurate_medium_path = ['up', 'right', 'right', 'right', 'right', 'right', 'up', 'right', 'right', 'down', 'down']
 
         dfs_accurate_large_path = ['up', 'up', 'up', 'up', 'up', 'up', 'up', 'up', 'up', 'right', 'right', 'right', 'down', 'down', 'down', 'down', 'down', 'down', 'down', 'down', 'down', 'down', 'down', 'down', 'left', 'left', 'up', 'up', 'left', 'down', 'down', 'down', 'down', 'down', 'down', 'down', 'down', 'down', 'right', 'up', 'right', 'up', 'up', 'right', 'down', 'down', 'down', 'right', 'right', 'right', 'up', 'up', 'up', 'up', 'up', 'up', 'up', 'up', 'right', 'up', 'up', 'right', 'down', 'down', 'right', 'down', 'down', 'down', 'down', 'right', 'right', 'down', 'right', 'up', 'up', 'up', 'right', 'up', 'up', 'up', 'up', 'up', 'up', 'up', 'left', 'left', 'up', 'up', 'up', 'up', 'up', 'up']
         bfs_accurate_large_path = ['down', 'down', 'down', 'right', 'right', 'right', 'up', 'right', 'right', 'right', 'right', 'right', 'right', 'down', 'down', 'down', 'down', 'right', 'right', 'right', 'right', 'right', 'right', 'right', 'right', 'down', 'down', 'down', 'down', 'right', 'right']
         gbfs_accurate_large_path = ['up', 'up', 'up', 'up', 'up', 'up', 'up', 'up', 'up', 'right', 'right', 'right', 'down', 'down', 'down', 'down', 'down', 'down', 'down', 'down', 'down', 'down', 'right', 'right', 'down', 'right', 'right', 'up', 'up', 'right', 'right', 'down', 'down', 'down', 'down', 'right', 'down', 'down', 'right', 'down', 'right', 'right', 'down', 'down', 'down', 'right', 'right', 'up', 'up', 'up', 'up', 'right', 'right', 'down', 'down', 'down', 'down', 'right', 'right']
         astar_accurate_large_path = ['right', 'down', 'down', 'down', 'right', 'right', 'up', 'right', 'right', 'right', 'right', 'right', 'right', 'down', 'down', 'right', 'down', 'down', 'right', 'right', 'right', 'right', 'right', 'right', 'right', 'down', 'down', 'down', 'down', 'right', 'right']
-        cus1_accurate_large_path = ['up', 'up', 'up', 'up', 'up', 'up', 'up', 'up', 'up', 'right', 'right', 'right', 'down', 'down', 'down', 'down', 'down', 'down', 'down', 'down', 'down', 'down', 'down', 'down', 'left', 'left', 'up', 'up', 'left', 'down', 'down', 'down', 'down', 'down', 'down', 'down', 'down', 'down', 'right', 'up', 'right', 'up', 'up', 'right', 'down', 'down', 'down', 'right', 'right', 'right', 'up', 'up', 'up', 'up', 'up', 'up', 'up', 'up', 'right', 'up', 'up', 'right', 'down', 'down', 'right', 'down', 'down', 'down', 'down', 'right', 'right', 'down', 'right', 'up', 'up', 'up', 'right', 'up', 'up', 'up', 'up', 'up', 'up', 'up', 'left', 'left', 'up', 'up', 'up', 'up', 'up', 'up']
-        cus2_accurate_large_path = ['up', 'up', 'up', 'up', 'up', 'up', 'up', 'up', 'up', 'right', 'right', 'right', 'down', 'down', 'down', 'down', 'down', 'down', 'down', 'down', 'down', 'down', 'down', 'down', 'right', 'up', 'up', 'right', 'down', 'down', 'right', 'up', 'right', 'up', 'up', 'right', 'down', 'down', 'right', 'down', 'down', 'down', 'down', 'right', 'right', 'down', 'right', 'up', 'right', 'right', 'right', 'right', 'right', 'down', 'down', 'down', 'down', 'right', 'right']
+        cus1_accurate_large_path = ['down', 'down', 'down', 'right', 'right', 'right', 'up', 'right', 'right', 'right', 'right', 'right', 'right', 'down', 'down', 'down', 'down', 'right', 'right', 'right', 'right', 'right', 'right', 'right', 'right', 'down', 'down', 'down', 'down', 'right', 'right']
+        cus2_accurate_large_path = ['right', 'down', 'down', 'down', 'right', 'right', 'up', 'right', 'right', 'right', 'right', 'right', 'right', 'down', 'down', 'right', 'down', 'down', 'right', 'right', 'right', 'right', 'right', 'right', 'right', 'down', 'down', 'down', 'right', 'right', 'down']
 
         # Perform test
         # Small map test
@@ -137,14 +141,14 @@ class TestMapSolver(unittest.TestCase):
         _, bfs_path = self.already_at_goal_solver.breadth_first_search()
         _, gbfs_path = self.already_at_goal_solver.greedy_best_first_search()
         _, astar_path = self.already_at_goal_solver.astar()
-        # _, cus1_path = self.already_at_goal_solver.iterative_deepening_search()
+        _, cus1_path = self.already_at_goal_solver.iterative_deepening_search()
         _, cus2_path = self.already_at_goal_solver.ida_star()
 
         self.assertEqual(len(dfs_path[:-1]), 0)
         self.assertEqual(len(bfs_path[:-1]), 0)
         self.assertEqual(len(gbfs_path[:-1]), 0)
         self.assertEqual(len(astar_path[:-1]), 0)
-        # self.assertEqual(len(cus1_path[:-1]), 0)
+        self.assertEqual(len(cus1_path[:-1]), 0)
         self.assertEqual(len(cus2_path[:-1]), 0)
 
     def test_UnreachableGoal_ReturnCorrectMessage(self):
@@ -203,22 +207,202 @@ class TestMapSolver(unittest.TestCase):
         self.assertEqual(bfs_small_nodes, 17)
         self.assertEqual(gbfs_small_nodes, 11)
         self.assertEqual(astar_small_nodes, 11)
-        self.assertEqual(cus1_small_nodes, 13)
-        self.assertEqual(cus2_small_nodes, 11)
+        self.assertEqual(cus1_small_nodes, 11)
+        self.assertEqual(cus2_small_nodes, 7)
 
         self.assertEqual(dfs_medium_nodes, 34)
         self.assertEqual(bfs_medium_nodes, 46)
         self.assertEqual(gbfs_medium_nodes, 21)
         self.assertEqual(astar_medium_nodes, 22)
-        self.assertEqual(cus1_medium_nodes, 47)
-        self.assertEqual(cus2_medium_nodes, 34)
+        self.assertEqual(cus1_medium_nodes, 37)
+        self.assertEqual(cus2_medium_nodes, 16)
 
         self.assertEqual(dfs_large_nodes, 138)
         self.assertEqual(bfs_large_nodes, 182)
         self.assertEqual(gbfs_large_nodes, 103)
         self.assertEqual(astar_large_nodes, 156)
-        self.assertEqual(cus1_large_nodes, 126)
-        self.assertEqual(cus2_large_nodes, 133)
+        self.assertEqual(cus1_large_nodes, 174)
+        self.assertEqual(cus2_large_nodes, 130)
+
+    def test_priorityFrontier_ReturnLowestCostFirstInserted(self):
+        # Test if ties are broken by insertion order and cost updates keep the original order
+        frontier = PriorityFrontier()
+        frontier[(0, 0)] = 5
+        frontier[(1, 0)] = 3
+        frontier[(2, 0)] = 4
+        frontier[(3, 0)] = 3
+        frontier[(2, 0)] = 3
+
+        self.assertEqual(len(frontier), 4)
+        self.assertEqual(frontier.pop(), ((1, 0), 3))
+        self.assertEqual(frontier.pop(), ((2, 0), 3))
+        self.assertEqual(frontier.pop(), ((3, 0), 3))
+        self.assertEqual(frontier.pop(), ((0, 0), 5))
+        self.assertFalse(frontier)
+
+    def test_gridGraph_MatchesNeighbors(self):
+        # Test if the precomputed neighbor table matches the neighbors of every cell
+        graph = self.large_solver.graph
+        for y in range(graph.height):
+            for x in range(graph.width):
+                cell = graph.cell_id((x, y))
+                self.assertEqual(graph.cell(cell), (x, y))
+                neighbors = [(graph.cell(graph.targets[k]), DIRECTIONS[graph.moves[k]]) for k in range(graph.offsets[cell], graph.offsets[cell + 1])]
+                self.assertEqual(neighbors, self.large_solver.get_neighbors((x, y)))
+
+    def test_heuristicField_MatchesHeuristicCost(self):
+        # Test if the precomputed heuristic field equals the Manhattan distance to the nearest goal
+        for solver in [self.small_solver, self.medium_solver, self.large_solver]:
+            for goals in [solver.goals, {(0, 0)}, {(-3, 2), (solver.graph.width + 1, 4)}]:
+                field = solver.heuristic_field(goals)
+                for cell in range(solver.graph.size):
+                    self.assertEqual(field[cell], solver.heuristic_cost(solver.graph.cell(cell), goals))
+
+        # A solver reused for many goal sets keeps only the most recently used fields
+        solver = self.large_solver
+        for x in range(HEURISTIC_FIELDS + 5):
+            solver.heuristic_field({(x, 0)})
+        self.assertEqual(len(solver.heuristic_fields), HEURISTIC_FIELDS)
+        self.assertIs(solver.heuristic_field({(HEURISTIC_FIELDS + 4, 0)}), solver.heuristic_field({(HEURISTIC_FIELDS + 4, 0)}))
+
+    def test_directionsOnly_ReturnDirectionCodes(self):
+        # Test if the direction codes match the directions of the full path
+        codes_solver = MapSolver(self.large_map, self.large_map_start, self.large_goals, directions_only=True)
+        for method in ["depth_first_search", "breadth_first_search", "greedy_best_first_search", "astar", "iterative_deepening_search", "ida_star"]:
+            nodes, path = getattr(self.large_solver, method)()
+            codes_nodes, codes = getattr(codes_solver, method)()
+            self.assertEqual(codes_nodes, nodes)
+            self.assertEqual([DIRECTIONS[code] for code in codes], [direction for _, direction in path[:-1]])
+
+        codes = MapSolver(self.find_all_goal_map, self.find_all_goal_start, self.find_all_goal_goals, directions_only=True).astar_multi_goals()
+        self.assertEqual([DIRECTIONS[code] for code in codes], [direction for _, direction in self.find_all_goal_solver.astar_multi_goals()[:-1]])
+
+    def test_bidirectionalSearch_ReturnShortestPath(self):
+        # Test if the bidirectional searches find a path as short as BFS
+        for solver in [self.small_solver, self.medium_solver, self.large_solver, self.find_all_goal_solver]:
+            _, bfs_path = solver.breadth_first_search()
+            _, bibfs_path = solver.bidirectional_breadth_first_search()
+            _, bias_path = solver.bidirectional_astar()
+
+            self.assertEqual(len(bibfs_path), len(bfs_path))
+            self.assertEqual(len(bias_path), len(bfs_path))
+            self.assertIn(bibfs_path[-1][0], solver.goals)
+            self.assertIn(bias_path[-1][0], solver.goals)
+
+        self.assertIsNone(self.blocked_solver.bidirectional_breadth_first_search()[1])
+        self.assertIsNone(self.blocked_solver.bidirectional_astar()[1])
+        self.assertEqual(len(self.already_at_goal_solver.bidirectional_breadth_first_search()[1][:-1]), 0)
+        self.assertEqual(len(self.already_at_goal_solver.bidirectional_astar()[1][:-1]), 0)
+
+    def test_jumpPointSearch_ReturnShortestPath(self):
+        # Test if Jump Point Search finds a path as short as A* while reaching fewer nodes
+        for solver in [self.small_solver, self.medium_solver, self.large_solver, self.find_all_goal_solver]:
+            astar_nodes, astar_path = solver.astar()
+            jps_nodes, jps_path = solver.jump_point_search()
+
+            self.assertEqual(len(jps_path), len(astar_path))
+            self.assertIn(jps_path[-1][0], solver.goals)
+            self.assertLess(jps_nodes, astar_nodes)
+
+        self.assertIsNone(self.blocked_solver.jump_point_search()[1])
+        self.assertEqual(len(self.already_at_goal_solver.jump_point_search()[1][:-1]), 0)
+
+    def test_heldKarpMultiGoals_ReturnShortestTour(self):
+        # Test if the tour visits every goal and is never longer than the greedy multi-goal A*
+        for solver in [self.small_solver, self.medium_solver, self.large_solver, self.find_all_goal_solver]:
+            nodes, path = solver.held_karp_multi_goals()
+            greedy_path = solver.astar_multi_goals()
+
+            self.assertGreater(nodes, 0)
+            self.assertTrue(solver.goals <= {cell for cell, _ in path})
+            self.assertLessEqual(len(path), len(greedy_path))
+
+        self.assertEqual(len(self.large_solver.held_karp_multi_goals()[1]), 95)
+        self.assertIsNone(self.not_all_goal_solver.held_karp_multi_goals()[1])
+
+    def test_solveMany_ReturnShortestPaths(self):
+        # Test if every starting point gets a path as short as BFS from that point
+        starts = [(0, 0), (5, 3), (19, 19), (0, 9), (25, 25)]
+        nodes, paths = self.large_solver.solve_many(starts)
+
+        self.assertGreater(nodes, 0)
+        self.assertEqual(len(paths), len(starts))
+        for start, path in zip(starts[:-1], paths[:-1]):
+            _, bfs_path = MapSolver(self.large_map, start, self.large_goals).breadth_first_search()
+            self.assertEqual(path[0][0], start)
+            self.assertEqual(len(path), len(bfs_path))
+        self.assertIsNone(paths[-1])
+        self.assertEqual(self.blocked_solver.solve_many([self.blocked_map_start])[1], [None])
+
+    def test_iterativeDeepening_HandleLongCorridor(self):
+        # Test if a corridor far deeper than the recursion limit is solved with one count per iteration
+        length = 20000
+        iterations = []
+        nodes, path = MapSolver([[0] * length], (0, 0), {(length - 1, 0)}).iterative_deepening_search(iterations=iterations)
+
+        self.assertEqual(len(path[:-1]), length - 1)
+        self.assertEqual(sum(iterations), nodes)
+        self.assertEqual(len(iterations), length - 1)
+        self.assertEqual(nodes, length)
+
+    def test_iterativeDeepening_ExpandEachCellOnce(self):
+        # Test if the kept depths stop every cell from being expanded again by a later iteration
+        for solver in [self.small_solver, self.medium_solver, self.large_solver, self.blocked_solver]:
+            expanded = [event.cell for event in solver.steps("iterative_deepening_search") if type(event) is Expand]
+            self.assertEqual(len(expanded), len(set(expanded)))
+            self.assertEqual(len(expanded), solver.iterative_deepening_search()[0])
+
+    def test_idaStar_ReturnShortestPathWithinTableLimit(self):
+        # Test if IDA* finds a path as short as A* with a full or a small transposition table
+        for solver in [self.small_solver, self.medium_solver, self.large_solver, self.find_all_goal_solver]:
+            _, astar_path = solver.astar()
+            iterations = []
+            nodes, path = solver.ida_star(iterations=iterations)
+
+            self.assertEqual(len(path), len(astar_path))
+            self.assertEqual(sum(iteration["nodes"] for iteration in iterations), nodes)
+            self.assertEqual([iteration["threshold"] for iteration in iterations], sorted({iteration["threshold"] for iteration in iterations}))
+            self.assertEqual(len(solver.ida_star(max_entries=8)[1]), len(astar_path))
+            self.assertEqual(solver.ida_star(max_entries=1)[0], nodes)
+
+        iterations = []
+        self.assertIsNone(self.blocked_solver.ida_star(iterations=iterations, max_entries=4)[1])
+        self.assertLessEqual(iterations[-1]["entries"], 4)
+
+        # Evicted cells keep being pruned, so an open area behind an unreachable goal is expanded once
+        open_map = [[0] * 12 for _ in range(10)] + [[1] * 12, [0] * 12]
+        self.assertEqual(MapSolver(open_map, (0, 0), {(0, 11)}).ida_star(max_entries=1), (120, None))
+
+    def test_searchStats_CountEverySearch(self):
+        # Test if every search fills in the same result with statistics, with counters matching its nodes
+        for name, method in METHODS.items():
+            stats = SearchStats()
+            nodes, path = getattr(self.large_solver, method)(stats=stats)
+
+            self.assertEqual((nodes, path), getattr(self.large_solver, method)(), name)
+            self.assertEqual(stats.expansions, stats.peak_closed + stats.re_expansions, name)
+            self.assertGreaterEqual(stats.pushes, stats.pops, name)
+            self.assertGreaterEqual(stats.generated, stats.expansions - 1, name)
+            self.assertEqual(list(stats.phase_seconds)[:2], ["setup", "search"], name)
+            self.assertEqual("path" in stats.phase_seconds, path is not None, name)
+
+        stats = SearchStats()
+        nodes, _ = self.large_solver.breadth_first_search(stats=stats)
+        self.assertEqual((stats.pushes, stats.pops, stats.re_expansions, stats.heuristic_evaluations), (nodes, stats.expansions, 0, 0))
+
+        stats = SearchStats()
+        iterations = []
+        nodes, _ = self.large_solver.iterative_deepening_search(iterations=iterations, stats=stats)
+        self.assertEqual((stats.expansions, stats.iterations, stats.re_expansions), (nodes, len(iterations), 0))
+
+        stats = SearchStats()
+        iterations = []
+        nodes, _ = self.large_solver.ida_star(iterations=iterations, stats=stats)
+        self.assertEqual((stats.expansions, stats.iterations, stats.re_expansions), (nodes, len(iterations), 0))
+
+        stats = SearchStats()
+        self.large_solver.astar(stats=stats)
+        self.assertGreater(stats.heuristic_evaluations, stats.expansions)
 
 if __name__ == "__main__":
-    unittest.main()
\ No newline at end of file
+    unittest.main()
@@ -0,0 +1,65 @@
+import json
+import os
+import tempfile
+import unittest
+from mapSolver import MapSolver, METHODS
+from portfolioSolver import portfolio_search, proven_optimal, SharedGridGraph, copy_graph, graph_bytes
+from utils import parse_grid
+
+class TestPortfolioSolver(unittest.TestCase):
+
+    def setUp(self):
+        self.solvers = []
+        for filename in ["Test/large_map.txt", "Test/none_goal.txt", "Test/already_at_goal.txt"]:
+            start, goals, map = parse_grid(filename)
+            self.solvers.append(MapSolver(map, start, goals))
+
+    def test_portfolio_FirstResult(self):
+        # Test if the portfolio keeps the result of one of its methods and logs the winner
+        with tempfile.TemporaryDirectory() as directory:
+            log = os.path.join(directory, "portfolio.jsonl")
+            for solver in self.solvers:
+                with self.subTest(map=solver.start):
+                    winner, nodes, path = portfolio_search(solver, ["DFS", "BFS", "AS"], log=log)
+                    self.assertIn(winner, ["DFS", "BFS", "AS"])
+                    self.assertEqual((nodes, path), getattr(solver, METHODS[winner])())
+
+            with open(log) as file:
+                records = [json.loads(line) for line in file]
+            self.assertEqual(len(records), len(self.solvers))
+            self.assertEqual(records[0]["methods"], ["DFS", "BFS", "AS"])
+            self.assertIn(records[0]["winner"], records[0]["finished"])
+
+    def test_sharedGraph_SameResults(self):
+        # Test if a graph read in place from a buffer holds the same walls and neighbors, and gives the same results
+        for solver in self.solvers:
+            graph = solver.graph
+            edges = len(graph.targets)
+            buffer = bytearray(graph_bytes(graph.size, edges))
+            copy_graph(graph, memoryview(buffer))
+            shared = SharedGridGraph(memoryview(buffer), graph.width, graph.height, edges)
+
+            self.assertEqual((list(shared.offsets), list(shared.targets)), (list(graph.offsets), list(graph.targets)))
+            self.assertEqual((bytes(shared.walls), bytes(shared.moves)), (bytes(graph.walls), bytes(graph.moves)))
+            shared_solver = MapSolver(None, solver.start, solver.goals, graph=shared)
+            for method in ["DFS", "BFS", "AS", "CUS1", "CUS2", "JPS", "HPA"]:
+                self.assertEqual(getattr(shared_solver, METHODS[method])(), getattr(solver, METHODS[method])(), method)
+            shared.release()
+
+    def test_portfolio_Optimal(self):
+        # Test if an optimal portfolio keeps a shortest path, or the shortest result when none can be proven
+        solver = self.solvers[0]
+        _, shortest = solver.breadth_first_search()
+        winner, _, path = portfolio_search(solver, ["DFS", "GBFS", "AS"], optimal=True)
+        self.assertEqual(len(path), len(shortest))
+        self.assertTrue(proven_optimal(solver, winner, path))
+
+        _, _, path = portfolio_search(solver, ["DFS", "GBFS"], optimal=True)
+        self.assertEqual(len(path), min(len(solver.depth_first_search()[1]), len(solver.greedy_best_first_search()[1])))
+
+        for methods in (["BFS", "FAST"], ["ALL"]):
+            with self.assertRaises(ValueError):
+                portfolio_search(solver, methods)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import unittest
+from mapSolver import MapSolver, STEPS
+from searchSteps import Expand, Enqueue, ThresholdRaise, PathFound, Finished, run_steps
+from utils import parse_grid
+
+class RecordingViz:
+    def __init__(self):
+        self.calls = []
+
+    def update_map(self, cell):
+        self.calls.append(("update_map", cell))
+
+    def show_path(self, path):
+        self.calls.append(("show_path", len(path)))
+
+    def reset_map(self):
+        self.calls.append(("reset_map", None))
+
+    def update_idletasks(self):
+        pass
+
+    def after(self, ms):
+        pass
+
+class TestSearchSteps(unittest.TestCase):
+
+    def setUp(self):
+        self.solvers = []
+        for filename in ["Test/small_map.txt", "Test/medium_map.txt", "Test/large_map.txt", "Test/none_goal.txt", "Test/already_at_goal.txt"]:
+            start, goals, map = parse_grid(filename)
+            self.solvers.append(MapSolver(map, start, goals))
+
+    def test_steps_SameResultAsSearch(self):
+        # Test if every step generator ends with the result of its search, with one Expand event per node expanded
+        for solver in self.solvers:
+            for method in STEPS:
+                with self.subTest(map=solver.start, method=method):
+                    events = list(solver.steps(method))
+                    nodes, path = getattr(solver, method)()
+
+                    self.assertEqual(events[-1], Finished(nodes, path))
+                    self.assertEqual(sum(type(event) is Finished for event in events), 1)
+                    self.assertEqual([event.path for event in events if type(event) is PathFound], [path] if path else [])
+                    if method in ("iterative_deepening_search", "ida_star"):
+                        self.assertEqual(sum(type(event) is Expand for event in events), nodes)
+
+    def test_steps_EventsOfIterations(self):
+        # Test if IDA* and IDS resume at every raised threshold, and only expanded cells were enqueued
+        solver = self.solvers[2]
+        iterations = []
+        solver.ida_star(iterations=iterations)
+        raises = [event for event in solver.steps("ida_star") if type(event) is ThresholdRaise]
+        self.assertEqual([event.threshold for event in raises], [iteration["threshold"] for iteration in iterations[1:]])
+        self.assertFalse(any(event.restart for event in raises))
+
+        iterations = []
+        solver.iterative_deepening_search(iterations=iterations)
+        raises = [event for event in solver.steps("iterative_deepening_search") if type(event) is ThresholdRaise]
+        self.assertEqual(len(raises), len(iterations))
+        self.assertFalse(any(event.restart for event in raises))
+
+        events = list(solver.steps("breadth_first_search"))
+        enqueued = {event.cell for event in events if type(event) is Enqueue}
+        self.assertLessEqual({event.cell for event in events if type(event) is Expand} - {solver.start}, enqueued)
+
+    def test_steps_RunAndVisualize(self):
+        # Test if searches without a step version still yield their result, and viz gets the events of the steps
+        solver = self.solvers[2]
+        handled = []
+        self.assertEqual(run_steps(solver.steps("held_karp_multi_goals"), handled.append), solver.held_karp_multi_goals())
+        self.assertEqual([type(event) for event in handled], [PathFound, Finished])
+
+        # run is the search without events or cache, for searches with and without a step generator
+        for method in ["astar", "ida_star", "held_karp_multi_goals"]:
+            self.assertEqual(solver.run(method), getattr(solver, method)())
+
+        viz = RecordingViz()
+        nodes, path = solver.astar(viz=viz)
+        self.assertEqual((nodes, path), solver.astar())
+        self.assertEqual(viz.calls[-1], ("show_path", len(path)))
+        self.assertEqual(len(viz.calls) - 1, sum(type(event) is Expand for event in solver.steps("astar")))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import os
+import struct
+import tempfile
+import unittest
+import zlib
+from mapSolver import MapSolver, STEPS
+from searchSteps import ThresholdRaise
+from searchTrace import read_trace, render_trace, write_png, put_varint, get_varint
+from solverCache import map_fingerprint
+from utils import parse_grid
+
+class TestSearchTrace(unittest.TestCase):
+
+    def setUp(self):
+        self.solvers = []
+        for filename in ["Test/small_map.txt", "Test/large_map.txt", "Test/none_goal.txt", "Test/already_at_goal.txt"]:
+            start, goals, map = parse_grid(filename)
+            self.solvers.append(MapSolver(map, start, goals))
+        self.directory = tempfile.TemporaryDirectory()
+        self.trace = os.path.join(self.directory.name, "search.trace")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_record_ReplaysSameEvents(self):
+        # Test if a recorded trace reads back as the events of the search, with the header of the map and method
+        for solver in self.solvers:
+            for method in list(STEPS) + ["held_karp_multi_goals"]:
+                with self.subTest(map=solver.start, method=method):
+                    self.assertEqual(solver.record(method, self.trace), getattr(solver, method)())
+                    header, events = read_trace(self.trace)
+                    self.assertEqual(header.fingerprint, map_fingerprint(solver.graph))
+                    self.assertEqual((header.method, header.start), (method, solver.start))
+                    self.assertEqual(list(events), list(solver.steps(method)))
+
+    def test_record_IterationsAndSize(self):
+        # Test if IDA* keeps its iteration boundaries, and neighboring cells take about one byte each
+        solver = self.solvers[1]
+        solver.record("ida_star", self.trace)
+        events = list(read_trace(self.trace)[1])
+        self.assertEqual([event for event in events if type(event) is ThresholdRaise],
+                         [event for event in solver.steps("ida_star") if type(event) is ThresholdRaise])
+        self.assertLess(os.path.getsize(self.trace), 2 * len(events) + 100)
+
+        for value in (0, 127, 128, 300, 2**31 - 1, 2**40):
+            buffer = bytearray()
+            put_varint(buffer, value)
+            self.assertEqual(get_varint(bytes(buffer), 0), (value, len(buffer)))
+
+        with open(self.trace, "wb") as file:
+            file.write(b"not a trace")
+        with self.assertRaises(ValueError):
+            read_trace(self.trace)
+
+    def test_render_WritesPng(self):
+        # Test if the rendered trace is a PNG of the map scaled by the given factor, with the heatmap counting expansions
+        solver = self.solvers[1]
+        solver.record("ida_star", self.trace)
+        header, events = read_trace(self.trace)
+        heatmap = render_trace(solver, events, heatmap=True)
+        self.assertEqual(len(heatmap), header.width * header.height * 3)
+        final = render_trace(solver, read_trace(self.trace)[1])
+        self.assertNotEqual(heatmap, final)
+
+        image = os.path.join(self.directory.name, "search.png")
+        write_png(image, final, header.width, header.height, scale=3)
+        with open(image, "rb") as file:
+            data = file.read()
+        self.assertEqual(data[:8], b"\x89PNG\r\n\x1a\n")
+        self.assertEqual(struct.unpack(">II", data[16:24]), (header.width * 3, header.height * 3))
+        length = struct.unpack(">I", data[33:37])[0]
+        rows = zlib.decompress(data[41:41 + length])
+        self.assertEqual(len(rows), header.height * 3 * (1 + header.width * 3 * 3))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import os
+import tempfile
+import unittest
+from mapSolver import MapSolver
+from searchStats import SearchStats
+from solverCache import SolverCache
+from utils import parse_grid
+
+class TestSolverCache(unittest.TestCase):
+
+    def setUp(self):
+        self.medium_map_start, self.medium_goals, self.medium_map = parse_grid("Test/medium_map.txt")
+        self.large_map_start, self.large_goals, self.large_map = parse_grid("Test/large_map.txt")
+
+    def test_repeatedSearch_ReturnCachedResult(self):
+        # Test if a repeated search is answered from the cache with an identical result
+        cache = SolverCache()
+        first = MapSolver(self.large_map, self.large_map_start, self.large_goals, cache=cache).astar()
+        second = MapSolver(self.large_map, self.large_map_start, self.large_goals, cache=cache).astar()
+
+        self.assertEqual(first, second)
+        self.assertIsNot(first[1], second[1])
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_differentSearch_MissCache(self):
+        # Test if the method, the start, the goals and the map are all part of the key
+        cache = SolverCache()
+        solver = MapSolver(self.large_map, self.large_map_start, self.large_goals, cache=cache)
+        solver.astar()
+        solver.breadth_first_search()
+        MapSolver(self.large_map, (0, 0), self.large_goals, cache=cache).astar()
+        MapSolver(self.large_map, self.large_map_start, {(19, 19)}, cache=cache).astar()
+        MapSolver(self.medium_map, (0, 0), self.large_goals, cache=cache).astar()
+
+        self.assertEqual((cache.hits, cache.misses), (0, 5))
+
+    def test_outputArguments_SkipCache(self):
+        # Test if iterations and stats bypass the cache whether passed by keyword or by position
+        cache = SolverCache()
+        solver = MapSolver(self.large_map, self.large_map_start, self.large_goals, cache=cache)
+        result = solver.ida_star()
+        iterations = []
+        self.assertEqual(solver.ida_star(None, iterations), result)
+        self.assertEqual(sum(iteration["nodes"] for iteration in iterations), result[0])
+
+        solver.breadth_first_search()
+        stats = SearchStats()
+        nodes, _ = solver.breadth_first_search(None, stats)
+        self.assertEqual(stats.pushes, nodes)
+        self.assertEqual((cache.hits, cache.misses), (0, 2))
+
+        # The same arguments hit the cache whether passed by keyword or by position
+        solver.ida_star(None, None, 8)
+        solver.ida_star(max_entries=8)
+        self.assertEqual((cache.hits, cache.misses), (1, 3))
+
+    def test_fullCache_EvictLeastRecentlyUsed(self):
+        # Test if the least recently used result is evicted first
+        cache = SolverCache(max_size=2)
+        solver = MapSolver(self.large_map, self.large_map_start, self.large_goals, cache=cache)
+        solver.astar()
+        solver.breadth_first_search()
+        solver.astar()
+        solver.depth_first_search()
+
+        self.assertEqual(len(cache.entries), 2)
+        solver.astar()
+        self.assertEqual(cache.hits, 2)
+        solver.breadth_first_search()
+        self.assertEqual(cache.hits, 2)
+
+    def test_diskCache_SurviveReopening(self):
+        # Test if results written to disk are found by a new cache
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "cache")
+            cache = SolverCache(path=path)
+            result = MapSolver(self.large_map, self.large_map_start, self.large_goals, cache=cache).ida_star()
+            cache.close()
+
+            cache = SolverCache(path=path)
+            self.assertEqual(MapSolver(self.large_map, self.large_map_start, self.large_goals, cache=cache).ida_star(), result)
+            self.assertEqual((cache.hits, cache.misses), (1, 0))
+            cache.close()
+
+if __name__ == "__main__":
+    unittest.main()
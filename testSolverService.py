@@ -0,0 +1,105 @@
+import asyncio
+import threading
+import unittest
+from loadGenerator import generate_load
+from mapGenerator import format_map, generate_map
+from mapSolver import MapSolver
+from solverClient import SolverClient
+from solverService import LINE_LIMIT, SolverService, serve, solve_request
+from utils import parse_grid
+
+class TestSolverService(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        # Run the service on a free port in a background event loop
+        cls.service = SolverService(workers=2)
+        cls.loop = asyncio.new_event_loop()
+        started = threading.Event()
+
+        def ready(server):
+            cls.port = server.sockets[0].getsockname()[1]
+            started.set()
+
+        cls.thread = threading.Thread(target=cls.loop.run_forever, daemon=True)
+        cls.thread.start()
+        asyncio.run_coroutine_threadsafe(serve(cls.service, port=0, ready=ready), cls.loop)
+        started.wait(10)
+
+    @classmethod
+    def tearDownClass(cls):
+        asyncio.run_coroutine_threadsafe(cls.stop_tasks(), cls.loop).result(10)
+        cls.loop.call_soon_threadsafe(cls.loop.stop)
+        cls.thread.join(10)
+        cls.loop.close()
+        cls.service.close()
+
+    @staticmethod
+    async def stop_tasks():
+        # Cancel the server and the connections still being served
+        tasks = asyncio.all_tasks() - {asyncio.current_task()}
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def setUp(self):
+        self.client = SolverClient(port=self.port)
+
+    def tearDown(self):
+        self.client.close()
+
+    def test_solve_MatchDirectSearch(self):
+        # Test if a loaded map is solved like a direct search, from its own start and from a given one
+        start, goals, map = parse_grid("Test/large_map.txt")
+        loaded = self.client.load("large", path="Test/large_map.txt")
+        self.assertEqual(loaded["start"], list(start))
+
+        nodes, path = MapSolver(map, start, goals).astar()
+        result = self.client.solve("large", "AS")
+        self.assertEqual((result["nodes"], result["path"]), (nodes, [direction for _, direction in path[:-1]]))
+
+        nodes, path = MapSolver(map, (0, 0), goals).breadth_first_search()
+        result = self.client.solve("large", "BFS", start=(0, 0))
+        self.assertEqual((result["nodes"], result["path"]), (nodes, [direction for _, direction in path[:-1]]))
+        self.assertEqual(result["goal"], list(path[-1][0]))
+
+    def test_badRequest_ReturnError(self):
+        # Test if bad requests are answered with an error and leave the connection usable
+        self.client.load("small", path="Test/small_map.txt")
+        with self.assertRaises(RuntimeError):
+            self.client.solve("missing", "AS")
+        with self.assertRaises(RuntimeError):
+            self.client.solve("small", "XX")
+        with self.assertRaises(RuntimeError):
+            self.client.solve("small", "AS", start=(-1, 0))
+        for request in ({"start": [1]}, {"start": [1, "2"]}, {"goals": [[1, 2, 3]]}, {"goals": 5}):
+            with self.subTest(request=request), self.assertRaises(RuntimeError):
+                self.client.request("solve", map_id="small", method="AS", **request)
+        self.assertIn("small", self.client.request("maps")["maps"])
+
+    def test_loadLargeText_SolveIt(self):
+        # Test if a map sent as text longer than asyncio's default line limit of 64 KiB is loaded and solved
+        text = format_map(800, 800, *generate_map("rectangles", 800, 800, seed=0))
+        self.assertGreater(len(text), 2**16)
+        loaded = self.client.load("text", text=text)
+        self.assertEqual((loaded["rows"], loaded["columns"]), (800, 800))
+        self.assertIsNotNone(self.client.solve("text", "AS")["path"])
+
+    def test_solveRequest_AskTextOnlyWhenMissing(self):
+        # Test if a worker without the map answers None until it is given the text, then reuses what it parsed
+        with open("Test/small_map.txt") as file:
+            text = file.read()
+        start, goals, _ = parse_grid("Test/small_map.txt")
+        map_key = ("small", -1)
+        self.assertIsNone(solve_request(map_key, start, goals, "AS"))
+        result = solve_request(map_key, start, goals, "AS", text)
+        self.assertEqual(solve_request(map_key, start, goals, "AS")["path"], result["path"])
+
+    def test_loadGenerator_AnswerEveryRequest(self):
+        # Test if concurrent requests over several connections are all answered
+        connect = lambda: asyncio.open_connection("127.0.0.1", self.port, limit=LINE_LIMIT)
+        report = asyncio.run(generate_load(connect, "Test/medium_map.txt", ["BFS", "AS"], clients=4, total=40, seed=1))
+        self.assertEqual((report["requests"], report["errors"]), (40, 0))
+
+if __name__ == "__main__":
+    unittest.main()
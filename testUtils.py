@@ -0,0 +1,48 @@
+import gzip
+import io
+import unittest
+from utils import parse_grid, parse_starts, MapFormatError
+
+class TestUtils(unittest.TestCase):
+
+    def test_parseGrid_ReadFileObjectsAndGzip(self):
+        # Test if a map is parsed the same from a path, a text stream and a gzip stream
+        expected = parse_grid("Test/large_map.txt")
+        with open("Test/large_map.txt", "rb") as file:
+            content = file.read()
+
+        self.assertEqual(parse_grid(io.StringIO(content.decode())), expected)
+        self.assertEqual(parse_grid(io.BytesIO(gzip.compress(content))), expected)
+
+    def test_parseGrid_FillWallRectangles(self):
+        # Test if walls are filled with their full width and height
+        start, goals, grid = parse_grid(io.StringIO("[3,4]\n(0,0)\n(3,2) | (0,2)\n(1,0,3,2)\n\n"))
+
+        self.assertEqual(start, (0, 0))
+        self.assertEqual(goals, {(3, 2), (0, 2)})
+        self.assertEqual(grid, [[0, 1, 1, 1], [0, 1, 1, 1], [0, 0, 0, 0]])
+
+    def test_parseGrid_RaiseOnBadInput(self):
+        # Test if bad input raises an error pointing at the line
+        bad_inputs = {
+            "[3,4]\n(0,0)\n": 3,
+            "[3]\n(0,0)\n(1,1)\n": 1,
+            "[3,4]\n(0,0,1)\n(1,1)\n": 2,
+            "[3,4]\n(0,0)\n(1,1) | (2)\n": 3,
+            "[3,4]\n(0,0)\n(1,1)\n(0,0,1)\n": 4,
+            "[3,4]\n(0,0)\n(1,1)\n(0,0,1,1)\n(3,2,2,1)\n": 5,
+        }
+        for content, line_number in bad_inputs.items():
+            with self.assertRaises(MapFormatError) as context:
+                parse_grid(io.StringIO(content))
+            self.assertEqual(context.exception.line_number, line_number)
+
+        with self.assertRaises(FileNotFoundError):
+            parse_grid("Test/missing_map.txt")
+
+    def test_parseStarts_ReturnAllPoints(self):
+        # Test if every starting point is read in order
+        self.assertEqual(parse_starts(io.StringIO("(0,1)\n\n(5, 3)\n")), [(0, 1), (5, 3)])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,44 +1,137 @@
-import ast
+import gzip
+import re
+import sys
+
+# Every number of a line, the brackets and separators around them are ignored
+NUMBER = re.compile(r"-?\d+")
+GZIP_MAGIC = b"\x1f\x8b"
+
+class MapFormatError(ValueError):
+    def __init__(self, message: str, line_number: int = None, line: str = None):
+        """
+        Initializes the error raised when a map file cannot be parsed.
+
+        Args:
+            message: Description of the problem
+            line_number: Number of the line where the problem was found, starting from 1
+            line: Content of that line
+        """
+        self.message = message
+        self.line_number = line_number
+        self.line = line
+        location = f"line {line_number}: " if line_number is not None else ""
+        super().__init__(f"{location}{message}" + (f" ({line.strip()!r})" if line is not None else ""))
+
+def read_text(source) -> str:
+    """
+    Function that reads the whole content of a map source
 
-def parse_grid(filename) -> tuple[tuple, set, dict]:
+    Args:
+        source: A path, "-" for stdin, or a binary or text file object; gzip compressed input is detected
+    Return:
+        text: The decoded content
+    """
+    if hasattr(source, "read"):
+        data = source.read()
+    elif source == "-":
+        data = sys.stdin.buffer.read()
+    else:
+        with open(source, "rb") as file:
+            data = file.read()
+
+    if isinstance(data, bytes):
+        if data[:2] == GZIP_MAGIC:
+            data = gzip.decompress(data)
+        data = data.decode("utf-8")
+    return data
+
+def read_numbers(line: str, line_number: int, expected: int, name: str) -> list:
+    """
+    Function that reads the numbers of a line and checks their count
+
+    Args:
+        line: Content of the line
+        line_number: Number of the line, starting from 1
+        expected: Number of values expected, or 0 for any non-empty even count
+        name: What the line describes, used in errors
+    Return:
+        numbers: A list of the integers of the line
+    """
+    numbers = [int(number) for number in NUMBER.findall(line)]
+    if (expected and len(numbers) != expected) or (not expected and (not numbers or len(numbers) % 2)):
+        raise MapFormatError(f"expected {name}", line_number, line)
+    return numbers
+
+def parse_grid(filename) -> tuple[tuple, set, list]:
     """
     Function that parses input data file into coordinate in a gird
 
     Args:
-        filename: Directory to input file
+        filename: Directory to input file, "-" for stdin, or a file object. The input may be gzip compressed
     Return:
         start: A list contains coordinate of starting point
         goals: A list contains coordinate of ALL goal points
         grid: A 2D array representing the actual map
+    Raise:
+        FileNotFoundError: If the input file does not exist
+        MapFormatError: If the input is not a valid map
     """
-    try:
+    lines = read_text(filename).splitlines()
+
+    if len(lines) < 3:
+        raise MapFormatError("a map needs a size, a start and goals", len(lines) + 1)
 
-        with open(filename, 'r') as file:
-            # Create map based on given coordinate
-            grid_size = ast.literal_eval(file.readline())
-            grid = [[0 for _ in range(grid_size[1])] for _ in range(grid_size[0])]
+    # Create map based on given coordinate
+    rows, columns = read_numbers(lines[0], 1, 2, "the map size [rows,columns]")
+    if rows <= 0 or columns <= 0:
+        raise MapFormatError("the map size must be positive", 1, lines[0])
+    grid = [[0] * columns for _ in range(rows)]
 
-            # Mark the position of starting point
-            start = tuple(ast.literal_eval(file.readline()))
+    # Mark the position of starting point
+    start = tuple(read_numbers(lines[1], 2, 2, "the start (x,y)"))
 
-            # Mark goal target
-            goals = set(tuple([tuple(map(int, goal.strip('()').split(','))) for goal in file.readline().strip().split(' | ')]))
+    # Mark goal target
+    numbers = read_numbers(lines[2], 3, 0, "goals (x1,y1) | (x2,y2)")
+    goals = set(zip(numbers[::2], numbers[1::2]))
 
-            # Mark walls
-            for line in file:
-                # print(line)
-                line = ast.literal_eval(line)
-                for i in range(line[2]):
-                    for j in range(line[3]):
-                        grid[line[1] + j][line[0] + i] = 1
+    # Mark walls, filling each row of a wall with one slice assignment
+    for line_number, line in enumerate(lines[3:], 4):
+        if not line.strip():
+            continue
+        x, y, width, height = read_numbers(line, line_number, 4, "a wall (x,y,width,height)")
+        if x < 0 or y < 0 or width < 0 or height < 0 or x + width > columns or y + height > rows:
+            raise MapFormatError("the wall is outside the map", line_number, line)
 
-            # map_grid = parse_adjacency_list(grid)
-            return start, goals, grid
-            # return start, goals, map_grid
+        wall = [1] * width
+        for row in grid[y:y + height]:
+            row[x:x + width] = wall
 
-    except FileNotFoundError:
-        print("File not found")
+    return start, goals, grid
 
+def parse_starts(filename) -> list:
+    """
+    Function that parses a file of starting points, one coordinate such as (0,1) per line
+
+    Args:
+        filename: Directory to input file, "-" for stdin, or a file object. The input may be gzip compressed
+    Return:
+        starts: A list contains coordinate of all starting points
+    """
+    lines = read_text(filename).splitlines()
+    return [tuple(read_numbers(line, line_number, 2, "a point (x,y)"))
+            for line_number, line in enumerate(lines, 1) if line.strip()]
+
+def percentile(values: list, fraction: float) -> float:
+    """
+    Function that finds a percentile of a list of values by the nearest rank
+
+    Args:
+        values: The sorted values
+        fraction: The percentile, between 0 and 1
+    Return:
+        value: The value at that percentile
+    """
+    return values[min(len(values) - 1, int(fraction * len(values)))]
 
 # def parse_adjacency_list(grid: list) -> dict:
 #     """
@@ -88,4 +181,4 @@ def parse_grid(filename) -> tuple[tuple, set, dict]:
 
 #                 adjacency_map[tuple((j, i))] = neighbor
 
-#     return adjacency_map
\ No newline at end of file
+#     return adjacency_map